@@ -1,5 +1,28 @@
-import json
-import re
+import asyncio
+import contextvars
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Awaitable, Callable, Dict, List, Sequence, Tuple
+
+from app.agents.utils import (
+    PackedChunk,
+    pack_sentences,
+    prompt_token_budget,
+    sentence_tokens,
+    word_indexed_sentence_tokens,
+)
+from app.llm.chat import CHAT_MODEL
+from app.llm.json_stream import ItemSink, item_sink_scope, parse_json_text
+from app.observability.metrics import current_run_metrics
+from app.observability.stream import emit_issue, issue_streaming_enabled
+
+logger = logging.getLogger(__name__)
+
+
+def _record_chunks(count: int) -> None:
+    metrics = current_run_metrics()
+    if metrics is not None:
+        metrics.record_chunks(count)
 
 
 class BaseAgent:
@@ -8,30 +31,467 @@ class BaseAgent:
 
     - LLM 호출 결과(JSON)를 안전하게 파싱하기 위한
       공통 유틸리티를 제공
+    - 문장 청크 단위 병렬 분석(동기/비동기) 공통 로직을 제공
+    - 문서 전체를 보는 에이전트를 위한 오버랩 윈도우 map-reduce 로직을 제공
     """
 
+    # 문서 전체 에이전트(tone/causality/cliche/tension/persona)의 윈도우 최대 크기 (문장 수)
+    window_size = 120
+    # 윈도우 앞뒤로 함께 보여줄 문맥 문장 수 (이 구간의 이슈는 인접 윈도우가 담당)
+    window_overlap = 5
+    # 청크 에이전트(trauma/hate_bias/spelling)의 청크 최대 크기와 문맥 문장 수
+    chunk_size = 50
+    chunk_overlap = 0
+    # 윈도우/청크의 문장 부분 토큰 예산 (None이면 모델별 설정값)
+    token_budget: int | None = None
+    # 윈도우 결과를 순서대로 이어붙일 리스트 필드 (예: tension curve)
+    window_list_keys: Tuple[str, ...] = ()
+    # 스트리밍 분석에서 issue_found 이벤트의 agent 값 (최종 결과 키와 동일, None이면 이벤트 없음)
+    issue_key: str | None = None
+
     def _safe_json_load(self, text: str) -> dict:
         """
         LLM 출력에서 JSON 블록만 추출하여 dict로 변환
 
         - LLM이 설명/문장/개행을 섞어 출력하는 경우에도 대응
+        - 출력이 잘렸으면 완결된 항목까지만 살린다 (app.llm.json_stream)
         - JSON이 없거나 파싱 실패 시 안전하게 빈 결과 반환
+        - 새 호출 경로는 chat_json()/achat_json()을 사용한다 (JSON 모드 + 이어받기)
         """
-        match = re.search(r"\{.*\}", text, re.DOTALL)
-        if not match:
+        value, complete, _ = parse_json_text(text)
+        if isinstance(value, dict):
+            if not complete:
+                value["_truncated"] = True
+            return value
+        if "{" not in (text or ""):
             return {
                 "issues": [],
                 "note": "LLM output did not contain JSON block",
-                "_raw": text[:300],
+                "_raw": (text or "")[:300],
             }
+        return {
+            "issues": [],
+            "note": "JSON decode failed, degraded safely",
+            "_raw": text[:300],
+        }
 
-        json_str = match.group()
-        try:
-            return json.loads(json_str)
-        except json.JSONDecodeError as e:
-            return {
-                "issues": [],
-                "note": "JSON decode failed, degraded safely",
-                "error": str(e),
-                "_raw": json_str[:300],
-            }
+    # --------------------------------------------------
+    # 청크 단위 병렬 분석
+    # --------------------------------------------------
+    def _token_budget(self) -> int:
+        return self.token_budget or prompt_token_budget(CHAT_MODEL)
+
+    def _chunk_sentences(self, sentences: Sequence[str]) -> List[PackedChunk]:
+        """
+        문장 목록을 토큰 예산 기준 청크 (chunk, window_start, core_start, core_end) 목록으로 분할
+
+        - 청크 크기는 최대 chunk_size 문장, 어절 인덱스 형식의 토큰 추정치가 예산을 넘지 않도록 줄어든다
+        - chunk_overlap 문장은 문맥으로만 보여주고 그 구간의 이슈는 인접 청크가 담당
+        """
+        return pack_sentences(
+            sentences,
+            self._token_budget(),
+            overlap=self.chunk_overlap,
+            max_sentences=self.chunk_size,
+            cost=word_indexed_sentence_tokens,
+        )
+
+    def _chunk_failed(self, error: BaseException) -> None:
+        # 실패한 청크는 결과에서 빠지므로 "이슈 없음"과 구분되도록 로그와 메트릭에 남긴다
+        logger.warning("[%s] Chunk failed: %r", self.__class__.__name__, error)
+        metrics = current_run_metrics()
+        if metrics is not None:
+            metrics.record_chunk_failure()
+
+    def _run_chunks(
+        self,
+        chunks: List[Tuple[List[str], int]],
+        analyze: Callable[[List[str], int], dict],
+        max_workers: int = 5,
+    ) -> List[dict]:
+        _record_chunks(len(chunks))
+        results: List[dict] = []
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # 워커 스레드에도 LLM 우선순위/tenant 컨텍스트가 전달되도록 컨텍스트를 복사해 실행
+            futures = [
+                executor.submit(contextvars.copy_context().run, analyze, chunk, idx)
+                for chunk, idx in chunks
+            ]
+            for future in as_completed(futures):
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    self._chunk_failed(e)
+        return results
+
+    async def _arun_chunks(
+        self,
+        chunks: List[Tuple[List[str], int]],
+        analyze: Callable[[List[str], int], Awaitable[dict]],
+    ) -> List[dict]:
+        # 동시성/속도 제한은 LLM 계층(전역 스케줄러)이 담당한다.
+        _record_chunks(len(chunks))
+        outcomes = await asyncio.gather(
+            *(analyze(chunk, idx) for chunk, idx in chunks),
+            return_exceptions=True,
+        )
+        results: List[dict] = []
+        for outcome in outcomes:
+            if isinstance(outcome, BaseException):
+                self._chunk_failed(outcome)
+                continue
+            results.append(outcome)
+        return results
+
+    def _keep_core_issues(self, result: dict, chunk: PackedChunk) -> dict:
+        """
+        전역 sentence_index로 변환된 청크 결과에서 core 밖(문맥 문장) 이슈 제거
+        """
+        _, _, core_start, core_end = chunk
+        issues = result.get("issues") if isinstance(result, dict) else None
+        if isinstance(issues, list):
+            result["issues"] = [
+                issue for issue in issues
+                if not isinstance(issue, dict)
+                or not isinstance(issue.get("sentence_index"), int)
+                or core_start <= issue["sentence_index"] < core_end
+            ]
+        return result
+
+    def _map_chunks(
+        self,
+        chunks: List[PackedChunk],
+        analyze: Callable[[List[str], int], dict],
+        max_workers: int = 5,
+    ) -> List[dict]:
+        # core 구간은 겹치지 않으므로 core_start로 청크를 찾는다 (window_start는 긴 문장 때문에 겹칠 수 있음)
+        by_core = {chunk[2]: chunk for chunk in chunks}
+
+        def _analyze(sentences: List[str], core_start: int) -> dict:
+            chunk = by_core[core_start]
+            with item_sink_scope(self._chunk_issue_sink(chunk)):
+                return self._keep_core_issues(analyze(sentences, chunk[1]), chunk)
+
+        return self._run_chunks([(chunk[0], chunk[2]) for chunk in chunks], _analyze, max_workers=max_workers)
+
+    async def _amap_chunks(
+        self,
+        chunks: List[PackedChunk],
+        analyze: Callable[[List[str], int], Awaitable[dict]],
+    ) -> List[dict]:
+        by_core = {chunk[2]: chunk for chunk in chunks}
+
+        async def _analyze(sentences: List[str], core_start: int) -> dict:
+            chunk = by_core[core_start]
+            with item_sink_scope(self._chunk_issue_sink(chunk)):
+                return self._keep_core_issues(await analyze(sentences, chunk[1]), chunk)
+
+        return await self._arun_chunks([(chunk[0], chunk[2]) for chunk in chunks], _analyze)
+
+    # --------------------------------------------------
+    # 이슈 스트리밍 (issue_found 이벤트)
+    # --------------------------------------------------
+    def _issue_stream_key(self, path: List[str]) -> str | None:
+        """
+        완결된 배열 항목의 JSON 경로 -> 이벤트 agent 키 (이슈 배열이 아니면 None)
+        """
+        return self.issue_key if path == ["issues"] else None
+
+    def _issue_sink(self, resolve: Callable[[dict], dict]) -> ItemSink | None:
+        """
+        LLM 응답에서 이슈 객체가 완결될 때마다 전역 위치로 변환해 issue_found 이벤트로 전송
+
+        - resolve: {"issues": [이슈]} -> 청크/윈도우 결과 후처리와 같은 변환 (core 밖 이슈는 제거됨)
+        - 스트리밍 분석이 아니면 None (chat_json이 기존처럼 한 번에 응답을 받음)
+        """
+        if not issue_streaming_enabled():
+            return None
+
+        def _sink(path: List[str], item: Any) -> None:
+            key = self._issue_stream_key(path)
+            if key is None or not isinstance(item, dict):
+                return
+            for issue in resolve({"issues": [dict(item)]}).get("issues") or []:
+                emit_issue(key, issue)
+
+        return _sink
+
+    def _chunk_issue_sink(self, chunk: PackedChunk) -> ItemSink | None:
+        sentences, start, _, _ = chunk
+        return self._issue_sink(
+            lambda result: self._keep_core_issues(self._resolve_word_offsets(result, sentences, start), chunk)
+        )
+
+    def _window_issue_sink(self, window: PackedChunk) -> ItemSink | None:
+        return self._issue_sink(lambda result: self._shift_window_result(result, window))
+
+    def _reuse_clean_chunks(
+        self,
+        chunks: List[PackedChunk],
+        incremental: dict | None,
+    ) -> Tuple[List[PackedChunk], List[dict]]:
+        """
+        증분 분석: core 문장이 모두 이전 분석과 동일한 청크는 이전 이슈를 재사용
+
+        - incremental: {"sentence_map": [이전 문장 인덱스 | None, ...], "result": 이전 에이전트 결과}
+        - 반환: (다시 분석할 청크 목록, 재사용된 청크 결과 목록)
+        """
+        if not incremental:
+            return chunks, []
+
+        sentence_map = incremental.get("sentence_map") or []
+        previous = incremental.get("result") or {}
+        previous_issues = previous.get("issues")
+        if not isinstance(previous_issues, list) or previous.get("error"):
+            return chunks, []
+
+        issues_by_sentence: dict = {}
+        for issue in previous_issues:
+            if isinstance(issue, dict) and isinstance(issue.get("sentence_index"), int):
+                issues_by_sentence.setdefault(issue["sentence_index"], []).append(issue)
+
+        previous_score = previous.get("score")
+        pending: List[PackedChunk] = []
+        reused: List[dict] = []
+        for chunk in chunks:
+            _, _, core_start, core_end = chunk
+            old_indices = sentence_map[core_start:core_end]
+            if len(old_indices) != core_end - core_start or any(idx is None for idx in old_indices):
+                pending.append(chunk)
+                continue
+
+            issues = []
+            for offset, old_index in enumerate(old_indices):
+                for issue in issues_by_sentence.get(old_index, []):
+                    # 문장 기준 char offset은 그대로, 문장 인덱스만 새 위치로 이동
+                    issues.append({**issue, "sentence_index": core_start + offset})
+
+            result = {"issues": issues}
+            if isinstance(previous_score, (int, float)):
+                result["score"] = previous_score
+            reused.append(result)
+
+        return pending, reused
+
+    def _merge_chunk_results(
+        self,
+        results: List[dict],
+        sentence_count: int,
+        chunk_count: int,
+        reused_chunks: int = 0,
+    ) -> dict:
+        all_issues = []
+        scores = []
+        for res in results:
+            if not res:
+                continue
+            if "issues" in res:
+                all_issues.extend(res["issues"])
+            if "score" in res and isinstance(res["score"], (int, float)):
+                scores.append(res["score"])
+
+        # 정렬: 문장 인덱스 순
+        all_issues.sort(key=lambda x: x.get("sentence_index", -1))
+
+        # 전체 점수 계산 (평균) - 문제가 없을수록 높음
+        final_score = 100
+        if scores:
+            final_score = int(sum(scores) / len(scores))
+
+        note = f"Analyzed {sentence_count} sentences in {chunk_count} chunks (Parallel)"
+        if reused_chunks:
+            note += f", reused {reused_chunks} unchanged chunks"
+
+        return {
+            "score": final_score,
+            "issues": all_issues,
+            "note": note,
+        }
+
+    def _resolve_word_offsets(self, result: dict, chunk: List[str], start_index: int) -> dict:
+        """
+        어절 인덱스(ref_id/start_word_id/end_word_id)를 문장 인덱스와 char offset으로 변환
+        """
+        if "issues" in result and isinstance(result["issues"], list):
+            for issue in result["issues"]:
+                # 1. 문장 인덱스 복원
+                ref_id = issue.pop("ref_id", None)
+                if ref_id is not None and isinstance(ref_id, int):
+                    issue["sentence_index"] = start_index + ref_id
+
+                    # 2. 어절 인덱스로 char_start/end 계산
+                    s_id = issue.get("start_word_id")
+                    e_id = issue.get("end_word_id")
+
+                    # 호환성: word_id만 있는 경우 처리
+                    if s_id is None and "word_id" in issue:
+                        s_id = issue["word_id"]
+                        e_id = s_id
+
+                    if isinstance(s_id, int) and isinstance(e_id, int) and 0 <= ref_id < len(chunk):
+                        origin_sent = chunk[ref_id]
+                        words = origin_sent.split()
+
+                        if 0 <= s_id < len(words) and 0 <= e_id < len(words) and s_id <= e_id:
+                            start_pos = -1
+                            end_pos = -1
+                            current_pos = 0
+
+                            for w_idx, w in enumerate(words):
+                                found_idx = origin_sent.find(w, current_pos)
+                                if found_idx != -1:
+                                    if w_idx == s_id:
+                                        start_pos = found_idx
+                                    if w_idx == e_id:
+                                        end_pos = found_idx + len(w)
+                                        # 종료 지점까지 찾았으면 중단
+                                        break
+                                    current_pos = found_idx + len(w)
+
+                            if start_pos != -1 and end_pos != -1:
+                                issue["char_start"] = start_pos
+                                issue["char_end"] = end_pos
+                                # quote 갱신 (정확한 원본 텍스트로)
+                                issue["quote"] = origin_sent[start_pos:end_pos]
+
+                elif "sentence_index" in issue and isinstance(issue["sentence_index"], int):
+                    issue["sentence_index"] = start_index + issue["sentence_index"]
+
+        return result
+
+    # --------------------------------------------------
+    # 오버랩 윈도우 map-reduce (문서 전체 에이전트)
+    # --------------------------------------------------
+    def _window_sentences(self, sentences: Sequence[str]) -> List[PackedChunk]:
+        """
+        문장 목록을 (window, window_start, core_start, core_end) 목록으로 분할
+
+        - core: 이 윈도우가 이슈를 책임지는 구간 (윈도우끼리 겹치지 않음)
+        - window: core 앞뒤로 window_overlap 문장을 문맥으로 덧붙인 구간
+        - 윈도우 크기는 최대 window_size 문장, 토큰 추정치가 예산을 넘지 않도록 줄어든다
+        """
+        size = max(1, self.window_size)
+        overlap = max(0, min(self.window_overlap, size - 1))
+        if not sentences:
+            return [([], 0, 0, 0)]
+        return pack_sentences(
+            sentences,
+            self._token_budget(),
+            overlap=overlap,
+            max_sentences=size,
+            cost=sentence_tokens,
+        )
+
+    def _shift_window_result(self, result: dict, window: PackedChunk) -> dict:
+        """
+        윈도우 로컬 sentence_index를 전역 인덱스로 변환하고 core 밖 이슈는 제거
+        """
+        _, window_start, core_start, core_end = window
+        if not isinstance(result, dict):
+            return {}
+
+        issues = result.get("issues")
+        if isinstance(issues, list):
+            kept = []
+            for issue in issues:
+                if not isinstance(issue, dict):
+                    continue
+                local_index = issue.get("sentence_index")
+                if isinstance(local_index, str) and local_index.strip().isdigit():
+                    local_index = int(local_index.strip())
+                if isinstance(local_index, int) and not isinstance(local_index, bool):
+                    global_index = window_start + local_index
+                    if not core_start <= global_index < core_end:
+                        continue
+                    issue["sentence_index"] = global_index
+                kept.append(issue)
+            result["issues"] = kept
+
+        result["_core"] = [core_start, core_end]
+        return result
+
+    def _map_windows(
+        self,
+        windows: List[PackedChunk],
+        analyze: Callable[[List[str]], dict],
+        max_workers: int = 5,
+    ) -> List[dict]:
+        # core 구간은 겹치지 않으므로 core_start로 윈도우를 찾는다 (window_start는 긴 문장 때문에 겹칠 수 있음)
+        by_core = {window[2]: window for window in windows}
+
+        def _analyze(chunk: List[str], core_start: int) -> dict:
+            window = by_core[core_start]
+            with item_sink_scope(self._window_issue_sink(window)):
+                return self._shift_window_result(analyze(chunk), window)
+
+        return self._run_chunks([(window[0], window[2]) for window in windows], _analyze, max_workers=max_workers)
+
+    async def _amap_windows(
+        self,
+        windows: List[PackedChunk],
+        analyze: Callable[[List[str]], Awaitable[dict]],
+    ) -> List[dict]:
+        by_core = {window[2]: window for window in windows}
+
+        async def _analyze(chunk: List[str], core_start: int) -> dict:
+            window = by_core[core_start]
+            with item_sink_scope(self._window_issue_sink(window)):
+                return self._shift_window_result(await analyze(chunk), window)
+
+        return await self._arun_chunks([(window[0], window[2]) for window in windows], _analyze)
+
+    def _reduce_window_results(self, results: List[dict], sentence_count: int, window_count: int) -> Dict[str, Any]:
+        """
+        윈도우별 결과 병합
+
+        - issues: 전역 sentence_index 기준 정렬, 중복 제거
+        - score: core 문장 수 가중 평균
+        - window_list_keys: 윈도우 순서대로 이어붙임
+        """
+        if not results:
+            raise RuntimeError("All windows failed")
+
+        results = sorted(results, key=lambda r: (r.get("_core") or [0])[0])
+        if window_count == 1 and len(results) == 1:
+            result = dict(results[0])
+            result.pop("_core", None)
+            return result
+
+        merged: Dict[str, Any] = {}
+        issues: List[dict] = []
+        seen = set()
+        weighted_score = 0.0
+        score_weight = 0
+        notes: List[str] = []
+
+        for res in results:
+            core_start, core_end = res.get("_core") or [0, 0]
+            for issue in res.get("issues") or []:
+                key = (issue.get("sentence_index"), issue.get("issue_type"), issue.get("quote"))
+                if key in seen:
+                    continue
+                seen.add(key)
+                issues.append(issue)
+
+            score = res.get("score")
+            if isinstance(score, (int, float)) and not isinstance(score, bool):
+                weight = max(1, core_end - core_start)
+                weighted_score += score * weight
+                score_weight += weight
+
+            for key in self.window_list_keys:
+                if isinstance(res.get(key), list):
+                    merged.setdefault(key, []).extend(res[key])
+
+            note = res.get("note")
+            if isinstance(note, str) and note and note not in notes:
+                notes.append(note)
+
+        issues.sort(key=lambda x: x.get("sentence_index") if isinstance(x.get("sentence_index"), int) else -1)
+        merged["score"] = int(weighted_score / score_weight) if score_weight else 0
+        merged["issues"] = issues
+        # 윈도우가 많을 때 note가 과도하게 길어지지 않도록 앞쪽 일부만 유지
+        merged["note"] = " / ".join(
+            notes[:3] + [f"Analyzed {sentence_count} sentences in {window_count} windows (Parallel)"]
+        )
+        return merged
@@ -0,0 +1,96 @@
+"""
+공유 프리픽스 프롬프트 레이아웃 (프로바이더 prompt caching 용)
+
+같은 원고를 보는 평가 에이전트들이 앞부분이 글자 단위로 같은 요청을 보내도록
+모든 프롬프트를 아래 순서로 조립한다.
+
+    system: SHARED_SYSTEM (에이전트 공통)
+    user:   [원고] 문장 목록          ┐
+            [전체 맥락 요약]          ├ 공유 프리픽스 (같은 윈도우/청크면 에이전트와 무관하게 동일)
+            [독자 페르소나]           ┘
+            [작업 지시] 에이전트별 역할/규칙/출력 형식  <- 접미부
+
+에이전트별 system 프롬프트나 지시문을 원고 앞에 두면 프리픽스가 첫 글자부터 달라져
+캐시가 맞지 않으므로, 에이전트 코드는 build_prompt()로만 프롬프트를 만든다.
+"""
+from typing import Any, Tuple
+
+SHARED_SYSTEM = """너는 원고 분석 파이프라인의 JSON 출력 전용 엔진이다.
+반드시 유효한 JSON만 출력하라. 설명, 마크다운, 주석 등 JSON 이외의 문자열은 절대 출력하지 마라.
+사용자 메시지의 앞부분은 분석할 원고 자료이고, 마지막 [작업 지시] 블록이 이번 요청의 역할과 출력 형식이다."""
+
+TASK_HEADER = "[작업 지시]"
+
+_NO_SUMMARY = "제공되지 않음"
+
+# reader_persona 스키마(render_persona)의 필드 -> 표시 이름
+_PERSONA_FIELDS = (
+    ("name", "이름"),
+    ("role", "직업/역할"),
+    ("age_group", "연령대"),
+    ("personality", "성격"),
+    ("reading_taste", "독서 취향"),
+    ("background_knowledge", "배경지식"),
+    ("feedback_style", "피드백 스타일"),
+    ("goals", "기대하는 점"),
+    ("concerns", "우려하는 점"),
+)
+
+
+def format_persona(persona: Any) -> str:
+    """
+    독자 페르소나 -> 고정 형식 텍스트 ({"persona": {...}} / 내부 dict 모두 허용)
+
+    같은 페르소나면 어느 에이전트에서 호출해도 같은 문자열이 나와야 프리픽스가 공유된다.
+    """
+    if isinstance(persona, dict) and isinstance(persona.get("persona"), dict):
+        persona = persona["persona"]
+    if not isinstance(persona, dict) or not persona:
+        return ""
+
+    lines = []
+    for key, label in _PERSONA_FIELDS:
+        value = persona.get(key)
+        if isinstance(value, list):
+            value = ", ".join(str(v) for v in value if v)
+        if value:
+            lines.append(f"- {label}: {value}")
+    if not lines:
+        return ""
+    return "\n".join(lines)
+
+
+def shared_prefix(
+    manuscript: str,
+    global_summary: str | None = None,
+    persona: Any = None,
+    with_context: bool = True,
+) -> str:
+    """
+    에이전트 공통 프리픽스
+
+    - manuscript: format_split_payload / format_word_indexed_chunk 결과
+    - with_context=False면 원고만 (문맥이 필요 없는 청크 에이전트끼리 프리픽스 공유)
+    """
+    parts = ["[원고]", manuscript]
+    if with_context:
+        parts += ["", "[전체 맥락 요약 (참조용)]", global_summary or _NO_SUMMARY]
+        persona_text = format_persona(persona)
+        if persona_text:
+            parts += ["", "[독자 페르소나]", persona_text]
+    return "\n".join(parts)
+
+
+def build_prompt(
+    manuscript: str,
+    task: str,
+    *,
+    global_summary: str | None = None,
+    persona: Any = None,
+    with_context: bool = True,
+) -> Tuple[str, str]:
+    """
+    (system, prompt) = (SHARED_SYSTEM, 공유 프리픽스 + [작업 지시] + task)
+    """
+    prefix = shared_prefix(manuscript, global_summary, persona, with_context=with_context)
+    return SHARED_SYSTEM, f"{prefix}\n\n{TASK_HEADER}\n{task.strip()}\n"
@@ -1,8 +1,8 @@
-from typing import Dict
+from typing import Dict, List
 from app.agents.base import BaseAgent
-from app.llm.chat import chat
-from app.agents.utils import format_split_payload
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from app.llm.chat import chat_json, achat_json
+from app.agents.prompt_layout import build_prompt
+from app.agents.utils import extract_split_payload, format_word_indexed_payload
 
 
 class HateBiasAgent(BaseAgent):
@@ -11,82 +11,50 @@ class HateBiasAgent(BaseAgent):
     """
 
     name = "hate-bias-tools"
+    issue_key = "hate_bias"
+    chunk_size = 50  # 청크 최대 문장 수 (토큰 예산이 먼저 차면 더 작게)
+    chunk_overlap = 2  # 앞뒤 문맥 문장 (문장을 넘나드는 묘사/발언 판단용)
+    max_workers = 5
 
-    def run(self, split_payload: object) -> Dict:
-        from app.agents.utils import extract_split_payload
+    def run(self, split_payload: object, incremental: dict | None = None) -> Dict:
         _, sentences = extract_split_payload(split_payload)
-        
-        all_issues = []
-        scores = []
-        chunk_size = 50
-        
-        chunks = []
-        for i in range(0, len(sentences), chunk_size):
-            chunks.append((sentences[i:i + chunk_size], i))
-            
-        with ThreadPoolExecutor(max_workers=5) as executor:
-            futures = [
-                executor.submit(self._analyze_chunk, chunk, idx)
-                for chunk, idx in chunks
-            ]
-            
-            for future in as_completed(futures):
-                try:
-                    res = future.result()
-                    if res:
-                        if "issues" in res:
-                            all_issues.extend(res["issues"])
-                        if "score" in res and isinstance(res["score"], (int, float)):
-                            scores.append(res["score"])
-                except Exception as e:
-                    print(f"[HateBiasAgent] Chunk failed: {e}")
+        chunks = self._chunk_sentences(sentences)
+        # 증분 분석: 변경되지 않은 청크는 이전 결과 재사용
+        pending, reused = self._reuse_clean_chunks(chunks, incremental)
+        results = self._map_chunks(pending, self._analyze_chunk, max_workers=self.max_workers)
+        return self._merge_chunk_results(reused + results, len(sentences), len(chunks), len(reused))
 
-        # 정렬: 문장 인덱스 순
-        all_issues.sort(key=lambda x: x.get("sentence_index", -1))
-        
-        # 전체 점수 계산 (평균) - 편향이 없을수록 높음
-        final_score = 100
-        if scores:
-            final_score = int(sum(scores) / len(scores))
-            
-        return {
-            "score": final_score,
-            "issues": all_issues,
-            "note": f"Analyzed {len(sentences)} sentences in {len(chunks)} chunks (Parallel)"
-        }
+    async def arun(self, split_payload: object, incremental: dict | None = None) -> Dict:
+        _, sentences = extract_split_payload(split_payload)
+        chunks = self._chunk_sentences(sentences)
+        pending, reused = self._reuse_clean_chunks(chunks, incremental)
+        results = await self._amap_chunks(pending, self._aanalyze_chunk)
+        return self._merge_chunk_results(reused + results, len(sentences), len(chunks), len(reused))
 
     def _analyze_chunk(self, chunk: list[str], start_index: int) -> dict:
-        system = """
-You are a strict JSON generator. You MUST output valid JSON only.
-"""
-        import json
-        
-        # Word Indexing Preprocessing
-        prepared_chunk = []
-        for i, sent in enumerate(chunk):
-            words = sent.split()
-            annotated_sent = " ".join([f"({w_idx}){word}" for w_idx, word in enumerate(words)])
-            prepared_chunk.append({
-                "id": i, 
-                "text": annotated_sent
-            })
+        system, prompt = self._build_prompt(chunk)
+        result = chat_json(prompt, system=system)
+        return self._resolve_word_offsets(result, chunk, start_index)
 
-        split_context = json.dumps(prepared_chunk, ensure_ascii=False)
+    async def _aanalyze_chunk(self, chunk: list[str], start_index: int) -> dict:
+        system, prompt = self._build_prompt(chunk)
+        result = await achat_json(prompt, system=system)
+        return self._resolve_word_offsets(result, chunk, start_index)
 
-        prompt = f"""
+    def _build_prompt(self, chunk: List[str]) -> tuple[str, str]:
+        task = """
 너는 '혐오 및 편견 표현 탐지기'이다.
-입력은 원고의 문장 배열(JSON)이다.
-각 문장의 "text"는 어절마다 `(번호)단어` 형태로 인덱싱되어 있다.
+[원고]의 문장 배열을 분석하라.
 
 핵심 원칙:
 - 반드시 '집단적 속성'과 연결된 경우만 issue로 판단할 것
 - 모든 설명(reason, target, bias_type)은 반드시 한국어로 작성하라.
 
 출력 JSON 형식:
-{{
+{
   "score": <int 0-100, 혐오/편견 없는 청정 윤리 점수>,
   "issues": [
-    {{
+    {
       "issue_type": "bias | hate | stereotype",
       "severity": "low | medium | high",
       "ref_id": <int: 입력 객체의 "id" (문장 번호)>,
@@ -97,55 +65,8 @@ You are a strict JSON generator. You MUST output valid JSON only.
       "target": "집단/대상 (한국어로 작성)",
       "bias_type": "혐오 | 편견 | 비하 | 고정관념",
       "confidence": 0.0
-    }}
+    }
   ]
-}}
-
-문장 배열:
-{split_context}
+}
 """
-        response = chat(prompt, system=system)
-        result = self._safe_json_load(response)
-
-        # Post-processing: Word ID -> Char Offset
-        if "issues" in result and isinstance(result["issues"], list):
-            for issue in result["issues"]:
-                ref_id = issue.pop("ref_id", None)
-                if ref_id is not None and isinstance(ref_id, int):
-                    issue["sentence_index"] = start_index + ref_id
-                    
-                    s_id = issue.get("start_word_id")
-                    e_id = issue.get("end_word_id")
-                    
-                    if s_id is None and "word_id" in issue:
-                        s_id = issue["word_id"]
-                        e_id = s_id
-
-                    if isinstance(s_id, int) and isinstance(e_id, int) and 0 <= ref_id < len(chunk):
-                        origin_sent = chunk[ref_id]
-                        words = origin_sent.split()
-                        
-                        if 0 <= s_id < len(words) and 0 <= e_id < len(words) and s_id <= e_id:
-                            start_pos = -1
-                            end_pos = -1
-                            current_pos = 0
-                            
-                            for w_idx, w in enumerate(words):
-                                found_idx = origin_sent.find(w, current_pos)
-                                if found_idx != -1:
-                                    if w_idx == s_id:
-                                        start_pos = found_idx
-                                    if w_idx == e_id:
-                                        end_pos = found_idx + len(w)
-                                        break
-                                    current_pos = found_idx + len(w)
-                            
-                            if start_pos != -1 and end_pos != -1:
-                                issue["char_start"] = start_pos
-                                issue["char_end"] = end_pos
-                                issue["quote"] = origin_sent[start_pos:end_pos]
-
-                elif "sentence_index" in issue and isinstance(issue["sentence_index"], int):
-                    issue["sentence_index"] = start_index + issue["sentence_index"]
-        
-        return result
+        return build_prompt(format_word_indexed_payload(chunk), task, with_context=False)
@@ -0,0 +1,188 @@
+from typing import Dict, List, Tuple
+from app.agents.base import BaseAgent
+from app.agents.prompt_layout import build_prompt
+from app.agents.utils import PackedChunk, extract_split_payload, format_word_indexed_payload
+from app.llm.chat import chat_json, achat_json
+
+
+class SurfaceScanAgent(BaseAgent):
+    """
+    트라우마 / 혐오·편견 / 맞춤법 통합 탐지 에이전트 (fused 모드)
+
+    - 세 청크 에이전트(Trauma/HateBias/Spelling)가 같은 문장을 따로 세 번 보내던 것을
+      청크당 한 번의 호출로 묶고, 응답의 세 이슈 목록을 에이전트별 결과로 다시 나눈다.
+    - 결과 형식은 각 에이전트의 run() 반환값과 같아 후속 노드는 그대로 사용한다.
+    """
+
+    name = "surface-scan"
+    # 출력이 가장 긴 맞춤법 에이전트 기준 (세 목록을 한 응답에 담으므로)
+    chunk_size = 30
+    chunk_overlap = 2
+    token_budget = 2000
+    max_workers = 8
+
+    tasks: Tuple[str, ...] = ("trauma", "hate_bias", "spelling")
+
+    def run(self, split_payload: object, incremental: Dict[str, dict | None] | None = None) -> Dict[str, dict]:
+        _, sentences = extract_split_payload(split_payload)
+        chunks = self._chunk_sentences(sentences)
+        pending, reused = self._reuse_clean_chunks_all(chunks, incremental or {})
+        results = self._map_chunks(pending, self._analyze_chunk, max_workers=self.max_workers)
+        return self._split_results(reused, results, len(sentences), len(chunks))
+
+    async def arun(self, split_payload: object, incremental: Dict[str, dict | None] | None = None) -> Dict[str, dict]:
+        _, sentences = extract_split_payload(split_payload)
+        chunks = self._chunk_sentences(sentences)
+        pending, reused = self._reuse_clean_chunks_all(chunks, incremental or {})
+        results = await self._amap_chunks(pending, self._aanalyze_chunk)
+        return self._split_results(reused, results, len(sentences), len(chunks))
+
+    def _issue_stream_key(self, path: List[str]) -> str | None:
+        # 통합 응답은 {"trauma": {"issues": [...]}, ...} 형태이므로 경로 첫 키가 결과 키
+        if len(path) == 2 and path[0] in self.tasks and path[1] == "issues":
+            return path[0]
+        return None
+
+    def _reuse_clean_chunks_all(
+        self,
+        chunks: List[PackedChunk],
+        incremental: Dict[str, dict | None],
+    ) -> Tuple[List[PackedChunk], Dict[str, List[dict]]]:
+        """
+        증분 분석: 세 작업 모두 재사용할 수 있는 청크만 건너뛴다
+
+        작업마다 재사용 가능한 청크가 다르면(이전 결과가 일부 없거나 실패) 전체를 다시 분석한다.
+        """
+        per_task = {task: self._reuse_clean_chunks(chunks, incremental.get(task)) for task in self.tasks}
+        pending_sets = {tuple(chunk[2] for chunk in pending) for pending, _ in per_task.values()}
+        if len(pending_sets) != 1:
+            return chunks, {task: [] for task in self.tasks}
+        pending = per_task[self.tasks[0]][0]
+        return pending, {task: reused for task, (_, reused) in per_task.items()}
+
+    def _analyze_chunk(self, chunk: list[str], start_index: int) -> dict:
+        system, prompt = self._build_prompt(chunk)
+        result = chat_json(prompt, system=system)
+        return self._resolve_task_offsets(result, chunk, start_index)
+
+    async def _aanalyze_chunk(self, chunk: list[str], start_index: int) -> dict:
+        system, prompt = self._build_prompt(chunk)
+        result = await achat_json(prompt, system=system)
+        return self._resolve_task_offsets(result, chunk, start_index)
+
+    def _resolve_task_offsets(self, result: dict, chunk: List[str], start_index: int) -> dict:
+        """
+        작업별 이슈의 어절 인덱스를 전역 sentence_index/char offset으로 변환
+
+        _keep_core_issues가 최상위 issues만 보므로 세 목록을 합쳐 두고 _task로 구분한다.
+        """
+        issues = []
+        scores = {}
+        for task in self.tasks:
+            section = result.get(task) if isinstance(result, dict) else None
+            if not isinstance(section, dict):
+                continue
+            resolved = self._resolve_word_offsets({"issues": section.get("issues") or []}, chunk, start_index)
+            for issue in resolved["issues"]:
+                if isinstance(issue, dict):
+                    issues.append({**issue, "_task": task})
+            if isinstance(section.get("score"), (int, float)):
+                scores[task] = section["score"]
+        return {"issues": issues, "_scores": scores}
+
+    def _split_results(
+        self,
+        reused: Dict[str, List[dict]],
+        results: List[dict],
+        sentence_count: int,
+        chunk_count: int,
+    ) -> Dict[str, dict]:
+        split: Dict[str, dict] = {}
+        for task in self.tasks:
+            task_results = []
+            for res in results:
+                task_result = {
+                    "issues": [
+                        {k: v for k, v in issue.items() if k != "_task"}
+                        for issue in res.get("issues") or []
+                        if issue.get("_task") == task
+                    ]
+                }
+                score = (res.get("_scores") or {}).get(task)
+                if score is not None:
+                    task_result["score"] = score
+                task_results.append(task_result)
+            task_reused = reused.get(task) or []
+            split[task] = self._merge_chunk_results(
+                task_reused + task_results, sentence_count, chunk_count, len(task_reused)
+            )
+            split[task]["note"] += " (fused surface scan)"
+        return split
+
+    def _build_prompt(self, chunk: List[str]) -> tuple[str, str]:
+        task = """
+너는 '원고 표면 검사기'이다. [원고]의 문장 배열을 한 번에 세 가지 관점으로 검사하라.
+
+1. trauma: 독자에게 심리적 충격, 불안, 트라우마를 유발할 가능성이 있는 표현(재난, 폭력, 위험행동 등)
+2. hate_bias: 혐오 및 편견 표현 (반드시 '집단적 속성'과 연결된 경우만 issue로 판단)
+3. spelling: 오타, 문맥상 틀린 조사, 심각한 띄어쓰기 오류
+   - 무시 대상: 대화문, 사투리, 시적 허용, 인터넷 용어
+   - 명백한 실수만 지적
+
+모든 설명(reason, trigger_type, target, bias_type)은 반드시 한국어로 작성하라.
+해당 관점에서 문제가 없으면 issues는 빈 배열로 둔다.
+
+출력 JSON 형식:
+{
+  "trauma": {
+    "score": <int 0-100>,
+    "issues": [
+      {
+        "issue_type": "trauma_trigger",
+        "severity": "low | medium | high",
+        "ref_id": <int: 입력 객체의 "id" (문장 번호)>,
+        "start_word_id": <int: 문제 구간 시작 어절 번호>,
+        "end_word_id": <int: 문제 구간 끝 어절 번호>,
+        "quote": "문제 구간 단어들",
+        "reason": "사유 (한국어로 작성)",
+        "trigger_type": "사고 | 위험행동 | 재난 | 생명위협 | 공포묘사",
+        "confidence": 0.0
+      }
+    ]
+  },
+  "hate_bias": {
+    "score": <int 0-100, 혐오/편견 없는 청정 윤리 점수>,
+    "issues": [
+      {
+        "issue_type": "bias | hate | stereotype",
+        "severity": "low | medium | high",
+        "ref_id": <int>,
+        "start_word_id": <int>,
+        "end_word_id": <int>,
+        "quote": "문제 구간 단어들",
+        "reason": "사유 (한국어로 작성)",
+        "target": "집단/대상 (한국어로 작성)",
+        "bias_type": "혐오 | 편견 | 비하 | 고정관념",
+        "confidence": 0.0
+      }
+    ]
+  },
+  "spelling": {
+    "score": <int 0-100>,
+    "issues": [
+      {
+        "issue_type": "spelling | spacing | particle",
+        "severity": "low | medium | high",
+        "ref_id": <int>,
+        "start_word_id": <int>,
+        "end_word_id": <int: 단어 하나면 start_word_id와 동일>,
+        "quote": "문제 구간 단어들 (참고용)",
+        "reason": "오류 이유",
+        "suggestion": "수정 제안",
+        "confidence": 0.8
+      }
+    ]
+  }
+}
+"""
+        return build_prompt(format_word_indexed_payload(chunk), task, with_context=False)
@@ -1,7 +1,8 @@
 from typing import Dict
 from app.agents.base import BaseAgent
-from app.llm.chat import chat
-from app.agents.utils import format_split_payload
+from app.llm.chat import chat_json, achat_json
+from app.agents.prompt_layout import build_prompt
+from app.agents.utils import extract_split_payload, format_split_payload
 
 
 class TensionCurveAgent(BaseAgent):
@@ -20,93 +21,38 @@ class TensionCurveAgent(BaseAgent):
     """
 
     name = "tension-curve-tools"
+    # 윈도우별 곡선/이상 구간은 원고 순서대로 이어붙인다
+    window_list_keys = ("curve", "anomalies")
 
-    def run(self, split_payload: object, persona: dict | None = None) -> Dict:
+    def run(self, split_payload: object, persona: dict | None = None, global_summary: str | None = None) -> Dict:
         try:
-            system = """
-You are a strict JSON generator.
-You MUST output valid JSON only.
-Do NOT include explanations or markdown.
-"""
-
-            split_context = format_split_payload(split_payload)
-
-            persona_text = ""
-            if persona:
-                persona_text = f"""
-                [독자 페르소나]
-                - 나이/직업: {persona.get('age', '미상')} / {persona.get('job', '미상')}
-                - 성향: {persona.get('trait', '정보 없음')}
-                - 독서 취향: {persona.get('preference', '정보 없음')}
-                
-                위 독자가 이 글을 읽는다고 가정하고 평가하라.
-                """
-
-            prompt = f"""
-            다음은 원고의 문장 목록이다.
-
-            너의 역할은 '서사 긴장도 분석가'이다.
-            사건 흐름을 따라 독자가 느끼는 긴장도의 변화를 분석하라.
-            
-            {persona_text}
-
-            분석 기준:
-            - 긴장도는 독자의 심리적 몰입 관점에서 판단
-            - 다음 세 가지 상태 중 하나로만 분류
-              * increase
-              * maintain
-              * decrease
-
-            지시사항:
-            1. 독자 관점에서 긴장감(몰입감)이 떨어지거나 구조적으로 이상한 구간을 식별하라.
-            2. 글 전체의 긴장감 조절 및 몰입도를 0~100점 사이의 점수('score')로 평가하라.
-            3. 모든 설명(reason, stage, issue, description)은 반드시 한국어로 작성하라.
-            4. 수정 제안 금지
-
-            출력 JSON 형식:
-            {{
-              "score": <int 0-100, 독자가 느끼는 긴장감 및 몰입도 점수>,
-              "curve": [
-                {{
-                  "stage": "사건 흐름 단계 또는 섹션 (한국어로 작성)",
-                  "tension": "increase | maintain | decrease",
-                  "reason": "독자 관점에서 그렇게 판단한 간단한 이유 (한국어로 작성)"
-                }}
-              ],
-              "issues": [
-                {{
-                  "issue_type": "tension_drop | climax_missing | tension_overload | stagnation",
-                  "severity": "low | medium | high",
-                  "sentence_index": 0,
-                  "char_start": 0,
-                  "char_end": 0,
-                  "quote": "문제 구간 원문 인용",
-                  "reason": "서사 구조 관점에서의 문제 설명 (한국어로 작성)",
-                  "confidence": 0.0
-                }}
-              ],
-              "anomalies": [
-                {{
-                  "location": "문제 구간",
-                  "issue": "긴장 급락 | 클라이맥스 부재 | 긴장 과도 | 반복 정체",
-                  "description": "서사 구조 관점에서의 문제 설명 (한국어로 작성)"
-                }}
-              ]
-            }}
-
-            특별한 이상이 없다면 issues/anomalies는 빈 배열로 반환하라.
-
-            규칙:
-            - sentence_index는 문장 목록 JSON 배열의 인덱스다.
-            - char_start/end는 해당 문장 내 0-based 위치다.
-            - quote는 반드시 해당 문장에 존재하는 원문 그대로 사용한다.
-
-            문장 목록:
-            {split_context}
-            """
+            # 긴 원고는 오버랩 윈도우로 나눠 병렬 분석 후 병합 (map-reduce)
+            _, sentences = extract_split_payload(split_payload)
+            windows = self._window_sentences(sentences)
+            results = self._map_windows(
+                windows,
+                lambda window: self._analyze_window(window, persona, global_summary),
+            )
+            return self._reduce_window_results(results, len(sentences), len(windows))
+        except Exception as e:
+            return {
+                "issues": [],
+                "note": "Tension curve analysis failed",
+                "error": str(e),
+                "score": 0,
+                "curve": [],
+                "anomalies": []
+            }
 
-            response = chat(prompt, system=system)
-            return self._safe_json_load(response)
+    async def arun(self, split_payload: object, persona: dict | None = None, global_summary: str | None = None) -> Dict:
+        try:
+            _, sentences = extract_split_payload(split_payload)
+            windows = self._window_sentences(sentences)
+            results = await self._amap_windows(
+                windows,
+                lambda window: self._aanalyze_window(window, persona, global_summary),
+            )
+            return self._reduce_window_results(results, len(sentences), len(windows))
         except Exception as e:
             return {
                 "issues": [],
@@ -116,3 +62,80 @@ Do NOT include explanations or markdown.
                 "curve": [],
                 "anomalies": []
             }
+
+    def _analyze_window(self, window: list[str], persona: dict | None, global_summary: str | None) -> Dict:
+        system, prompt = self._build_prompt(window, persona, global_summary)
+        return chat_json(prompt, system=system)
+
+    async def _aanalyze_window(self, window: list[str], persona: dict | None, global_summary: str | None) -> Dict:
+        system, prompt = self._build_prompt(window, persona, global_summary)
+        return await achat_json(prompt, system=system)
+
+    def _build_prompt(
+        self,
+        split_payload: object,
+        persona: dict | None = None,
+        global_summary: str | None = None,
+    ) -> tuple[str, str]:
+        task = """
+너의 역할은 '서사 긴장도 분석가'이다.
+사건 흐름을 따라 독자가 느끼는 긴장도의 변화를 분석하라.
+[독자 페르소나]가 있으면 그 독자가 이 글을 읽는다고 가정하고 평가하라.
+
+분석 기준:
+- 긴장도는 독자의 심리적 몰입 관점에서 판단
+- 다음 세 가지 상태 중 하나로만 분류
+  * increase
+  * maintain
+  * decrease
+
+지시사항:
+1. 독자 관점에서 긴장감(몰입감)이 떨어지거나 구조적으로 이상한 구간을 식별하라.
+2. 글 전체의 긴장감 조절 및 몰입도를 0~100점 사이의 점수('score')로 평가하라.
+3. 모든 설명(reason, stage, issue, description)은 반드시 한국어로 작성하라.
+4. 수정 제안 금지
+
+출력 JSON 형식:
+{
+  "score": <int 0-100, 독자가 느끼는 긴장감 및 몰입도 점수>,
+  "curve": [
+    {
+      "stage": "사건 흐름 단계 또는 섹션 (한국어로 작성)",
+      "tension": "increase | maintain | decrease",
+      "reason": "독자 관점에서 그렇게 판단한 간단한 이유 (한국어로 작성)"
+    }
+  ],
+  "issues": [
+    {
+      "issue_type": "tension_drop | climax_missing | tension_overload | stagnation",
+      "severity": "low | medium | high",
+      "sentence_index": 0,
+      "char_start": 0,
+      "char_end": 0,
+      "quote": "문제 구간 원문 인용",
+      "reason": "서사 구조 관점에서의 문제 설명 (한국어로 작성)",
+      "confidence": 0.0
+    }
+  ],
+  "anomalies": [
+    {
+      "location": "문제 구간",
+      "issue": "긴장 급락 | 클라이맥스 부재 | 긴장 과도 | 반복 정체",
+      "description": "서사 구조 관점에서의 문제 설명 (한국어로 작성)"
+    }
+  ]
+}
+
+특별한 이상이 없다면 issues/anomalies는 빈 배열로 반환하라.
+
+규칙:
+- sentence_index는 문장 목록 JSON 배열의 인덱스다.
+- char_start/end는 해당 문장 내 0-based 위치다.
+- quote는 반드시 해당 문장에 존재하는 원문 그대로 사용한다.
+"""
+        return build_prompt(
+            format_split_payload(split_payload),
+            task,
+            global_summary=global_summary,
+            persona=persona,
+        )
@@ -1,6 +1,7 @@
 from app.agents.base import BaseAgent
-from app.llm.chat import chat
-from app.agents.utils import format_split_payload
+from app.llm.chat import chat_json, achat_json
+from app.agents.prompt_layout import build_prompt
+from app.agents.utils import extract_split_payload, format_split_payload
 
 
 class CausalityEvaluatorAgent(BaseAgent):
@@ -17,45 +18,56 @@ class CausalityEvaluatorAgent(BaseAgent):
     """
 
     name = "causality_agent"
+    issue_key = "logic"
 
     def run(self, split_payload: object, global_summary: str | None = None, persona: dict | None = None) -> dict:
         try:
-            persona_text = ""
-            knowledge_level = "중급" # Default fallback
-            
-            if persona:
-                # 페르소나 정보를 기반으로 독자 수준 추론 (단순 매핑)
-                age = str(persona.get('age', ''))
-                job = persona.get('job', '')
-                # 예시 로직: 10대 이하면 초급, 전문직이면 고급 등 (여기선 단순 텍스트로 전달)
-                
-                persona_text = f"""
-                [독자 페르소나]
-                - 나이/직업: {age} / {job}
-                - 성향: {persona.get('trait', '정보 없음')}
-                - 독서 취향: {persona.get('preference', '정보 없음')}
-                
-                위 독자가 이 글을 읽는다고 가정하고 평가하라.
-                """
+            # 긴 원고는 오버랩 윈도우로 나눠 병렬 분석 후 병합 (map-reduce)
+            _, sentences = extract_split_payload(split_payload)
+            windows = self._window_sentences(sentences)
+            results = self._map_windows(
+                windows,
+                lambda window: self._analyze_window(window, global_summary, persona),
+            )
+            return self._reduce_window_results(results, len(sentences), len(windows))
+        except Exception as e:
+            return {
+                "issues": [],
+                "note": "Causality analysis failed",
+                "error": str(e),
+                "score": 0
+            }
 
-            system = """
-You are a strict JSON generator.
-You MUST output valid JSON only.
-Do NOT include explanations or markdown.
-"""
+    async def arun(self, split_payload: object, global_summary: str | None = None, persona: dict | None = None) -> dict:
+        try:
+            _, sentences = extract_split_payload(split_payload)
+            windows = self._window_sentences(sentences)
+            results = await self._amap_windows(
+                windows,
+                lambda window: self._aanalyze_window(window, global_summary, persona),
+            )
+            return self._reduce_window_results(results, len(sentences), len(windows))
+        except Exception as e:
+            return {
+                "issues": [],
+                "note": "Causality analysis failed",
+                "error": str(e),
+                "score": 0
+            }
 
-            split_context = format_split_payload(split_payload)
+    def _analyze_window(self, window: list[str], global_summary: str | None, persona: dict | None) -> dict:
+        system, prompt = self._build_prompt(window, global_summary, persona)
+        return chat_json(prompt, system=system)
 
-            prompt = f"""
-다음은 원고의 문장 목록이다.
+    async def _aanalyze_window(self, window: list[str], global_summary: str | None, persona: dict | None) -> dict:
+        system, prompt = self._build_prompt(window, global_summary, persona)
+        return await achat_json(prompt, system=system)
 
+    def _build_prompt(self, split_payload: object, global_summary: str | None = None, persona: dict | None = None) -> tuple[str, str]:
+        task = """
 너의 역할은 '인과관계 분석가'이다.
 오직 사건 간 인과 연결만 보고, 인과가 끊기는 지점을 식별하라.
-
-[전체 맥락 요약 (참조용)]
-{global_summary or "제공되지 않음"}
-
-{persona_text}
+[독자 페르소나]가 있으면 그 독자가 이 글을 읽는다고 가정하고 평가하라.
 
 지시사항:
 1. 사건 간 인과 연결이 끊기거나 비약이 심한 지점(이슈)을 식별하라.
@@ -66,10 +78,10 @@ Do NOT include explanations or markdown.
 6. [전체 맥락 요약]을 참고하여, 앞부분의 설정이 뒷부분에서 어긋나는지(개연성) 확인하라.
 
 출력 형식(JSON):
-{{
+{
   "score": <int 0-100, 독자가 느끼는 논리적 완결성 점수>,
   "issues": [
-    {{
+    {
       "issue_type": "missing_motivation | causality_gap | forced_resolution | illogical_transition",
       "severity": "low | medium | high",
       "sentence_index": 0,
@@ -80,9 +92,9 @@ Do NOT include explanations or markdown.
       "from_event": "사건 A(요약) - 한국어로 작성",
       "to_event": "사건 B(요약) - 한국어로 작성",
       "confidence": 0.0
-    }}
+    }
   ]
-}}
+}
 
 문제가 없다면 issues는 빈 배열로 반환하라.
 
@@ -90,17 +102,10 @@ Do NOT include explanations or markdown.
 - sentence_index는 문장 목록 JSON 배열의 인덱스다.
 - char_start/end는 해당 문장 내 0-based 위치다.
 - quote는 반드시 해당 문장에 존재하는 원문 그대로 사용한다.
-
-문장 목록:
-{split_context}
 """
-
-            response = chat(prompt, system=system)
-            return self._safe_json_load(response)
-        except Exception as e:
-            return {
-                "issues": [],
-                "note": "Causality analysis failed",
-                "error": str(e),
-                "score": 0
-            }
+        return build_prompt(
+            format_split_payload(split_payload),
+            task,
+            global_summary=global_summary,
+            persona=persona,
+        )
@@ -1,6 +1,7 @@
 from app.agents.base import BaseAgent
-from app.llm.chat import chat
-from app.agents.utils import format_split_payload
+from app.llm.chat import chat_json, achat_json
+from app.agents.prompt_layout import build_prompt
+from app.agents.utils import extract_split_payload, format_split_payload
 
 
 class PersonaFeedbackAgent(BaseAgent):
@@ -13,18 +14,66 @@ class PersonaFeedbackAgent(BaseAgent):
 
     name = "persona-feedback"
 
-    def run(self, persona: dict, split_payload: object) -> dict:
-        system = """
-너는 JSON 출력 전용 엔진이다.
-반드시 유효한 JSON만 출력하라.
-JSON 외 텍스트 출력 금지.
-"""
+    feedback_keys = ("confusions", "missing_context", "questions_to_author")
+
+    def run(self, persona: dict, split_payload: object, global_summary: str | None = None) -> dict:
+        # 긴 원고는 오버랩 윈도우로 나눠 병렬로 읽힌 뒤 피드백을 병합 (map-reduce)
+        _, sentences = extract_split_payload(split_payload)
+        windows = self._window_sentences(sentences)
+        results = self._map_windows(
+            windows,
+            lambda window: self._analyze_window(persona, window, global_summary),
+        )
+        return self._reduce_feedback(results)
+
+    async def arun(self, persona: dict, split_payload: object, global_summary: str | None = None) -> dict:
+        _, sentences = extract_split_payload(split_payload)
+        windows = self._window_sentences(sentences)
+        results = await self._amap_windows(
+            windows,
+            lambda window: self._aanalyze_window(persona, window, global_summary),
+        )
+        return self._reduce_feedback(results)
+
+    def _analyze_window(self, persona: dict, window: list[str], global_summary: str | None) -> dict:
+        system, prompt = self._build_prompt(persona, window, global_summary)
+        return chat_json(prompt, system=system)
+
+    async def _aanalyze_window(self, persona: dict, window: list[str], global_summary: str | None) -> dict:
+        system, prompt = self._build_prompt(persona, window, global_summary)
+        return await achat_json(prompt, system=system)
+
+    def _reduce_feedback(self, results: list[dict]) -> dict:
+        """
+        윈도우별 피드백을 원고 순서대로 병합 (항목 중복 제거)
+        """
+        if not results:
+            raise RuntimeError("All windows failed")
 
-        split_context = format_split_payload(split_payload)
+        results = sorted(results, key=lambda r: (r.get("_core") or [0])[0])
+        if len(results) == 1:
+            result = dict(results[0])
+            result.pop("_core", None)
+            return result
 
-        prompt = f"""
-다음은 독자 페르소나와 원고 문장 목록이다.
-페르소나 관점에서 글을 읽었다고 가정하고 피드백을 생성하라.
+        merged: dict = {key: [] for key in self.feedback_keys}
+        for res in results:
+            feedback = res.get("persona_feedback")
+            if not isinstance(feedback, dict):
+                continue
+            if feedback.get("persona_name") and "persona_name" not in merged:
+                merged["persona_name"] = feedback["persona_name"]
+            for key in self.feedback_keys:
+                for item in feedback.get(key) or []:
+                    if item not in merged[key]:
+                        merged[key].append(item)
+
+        return {"persona_feedback": merged}
+
+    def _build_prompt(self, persona: dict, split_payload: object, global_summary: str | None = None) -> tuple[str, str]:
+        persona_name = (persona or {}).get("name") or "가명"
+        task = f"""
+[독자 페르소나] 관점에서 [원고]를 읽었다고 가정하고 피드백을 생성하라.
 
 규칙:
 - 점수/등급/총평 금지
@@ -38,22 +87,19 @@ JSON 외 텍스트 출력 금지.
 - missing_context: 이해에 필요한 배경 정보가 부족한 지점
 - questions_to_author: 독자가 자연스럽게 떠올리는 확인 질문
 
-페르소나:
-{persona}
-
-문장 목록:
-{split_context}
-
 출력 JSON 형식:
 {{
   "persona_feedback": {{
-    "persona_name": "{persona.get('persona', {}).get('name', '가명')}",
+    "persona_name": "{persona_name}",
     "confusions": [string],
     "missing_context": [string],
     "questions_to_author": [string]
   }}
 }}
 """
-
-        response = chat(prompt, system=system)
-        return self._safe_json_load(response)
+        return build_prompt(
+            format_split_payload(split_payload),
+            task,
+            global_summary=global_summary,
+            persona=persona,
+        )
@@ -1,5 +1,5 @@
 from app.agents.base import BaseAgent
-from app.llm.chat import chat
+from app.llm.chat import chat_json, achat_json
 
 class ReaderPersonaAgent(BaseAgent):
     """
@@ -11,6 +11,14 @@ class ReaderPersonaAgent(BaseAgent):
     name = "reader-persona"
 
     def run(self, context: dict) -> dict:
+        system, prompt = self._build_prompt(context)
+        return chat_json(prompt, system=system)
+
+    async def arun(self, context: dict) -> dict:
+        system, prompt = self._build_prompt(context)
+        return await achat_json(prompt, system=system)
+
+    def _build_prompt(self, context: dict) -> tuple[str, str]:
         user_persona = context.get("user_persona")
         text_preview = context.get("text_preview", "")
         meta = context.get("meta", {})
@@ -62,5 +70,4 @@ class ReaderPersonaAgent(BaseAgent):
   }}
 }}
 """
-        response = chat(prompt, system=system)
-        return self._safe_json_load(response)
\ No newline at end of file
+        return system, prompt
@@ -1,7 +1,7 @@
 import json
-from typing import Dict, List
+from typing import Dict, List, Sequence
 from app.agents.base import BaseAgent
-from app.llm.chat import chat
+from app.llm.chat import chat, achat
 
 
 class ComprehensiveReportAgent(BaseAgent):
@@ -34,11 +34,55 @@ class ComprehensiveReportAgent(BaseAgent):
         cliche_issues: List[dict],
         persona_feedback: dict | None = None,
     ) -> Dict:
+        system, prompt = self._build_prompt(
+            split_text=split_text,
+            tone_issues=tone_issues,
+            logic_issues=logic_issues,
+            trauma_issues=trauma_issues,
+            hate_issues=hate_issues,
+            cliche_issues=cliche_issues,
+            persona_feedback=persona_feedback,
+        )
+        response = chat(prompt, system=system)
+        return self._to_report(response)
+
+    async def arun(
+        self,
+        split_text: dict,
+        tone_issues: List[dict],
+        logic_issues: List[dict],
+        trauma_issues: List[dict],
+        hate_issues: List[dict],
+        cliche_issues: List[dict],
+        persona_feedback: dict | None = None,
+    ) -> Dict:
+        system, prompt = self._build_prompt(
+            split_text=split_text,
+            tone_issues=tone_issues,
+            logic_issues=logic_issues,
+            trauma_issues=trauma_issues,
+            hate_issues=hate_issues,
+            cliche_issues=cliche_issues,
+            persona_feedback=persona_feedback,
+        )
+        response = await achat(prompt, system=system)
+        return self._to_report(response)
+
+    def _build_prompt(
+        self,
+        split_text: dict,
+        tone_issues: List[dict],
+        logic_issues: List[dict],
+        trauma_issues: List[dict],
+        hate_issues: List[dict],
+        cliche_issues: List[dict],
+        persona_feedback: dict | None = None,
+    ) -> tuple[str, str]:
         # 원고의 전반적인 분위기를 알 수 있도록 앞부분 문장들을 추출
         text_preview = ""
         if isinstance(split_text, dict):
             raw_sentences = split_text.get("sentences") or split_text.get("split_sentences")
-            if isinstance(raw_sentences, list) and raw_sentences:
+            if isinstance(raw_sentences, Sequence) and not isinstance(raw_sentences, str) and raw_sentences:
                 # 앞부분 15문장 정도를 보여주어 맥락 파악 도움
                 text_preview = "\n".join(raw_sentences[:15])
 
@@ -103,8 +147,9 @@ class ComprehensiveReportAgent(BaseAgent):
         - **수정 방향 제안**: 작가가 바로 실행할 수 있는 구체적인 가이드라인.
         """
 
-        response = chat(prompt, system=system)
+        return system, prompt
 
+    def _to_report(self, response: str) -> Dict:
         # JSON 파싱 없이 마크다운 텍스트를 그대로 반환
         return {
             "report_title": "종합 분석 리포트",
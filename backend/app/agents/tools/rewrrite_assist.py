@@ -1,5 +1,5 @@
 from app.agents.base import BaseAgent
-from app.llm.chat import chat
+from app.llm.chat import chat_json, achat_json
 
 
 class RewriteAssistAgent(BaseAgent):
@@ -27,6 +27,56 @@ class RewriteAssistAgent(BaseAgent):
         cliche_issues: list | None = None,
         spelling_issues: list | None = None,   # ✅ 추가
     ) -> dict:
+        system, prompt = self._build_prompt(
+            original_text=original_text,
+            split_text=split_text,
+            decision_context=decision_context,
+            tone_issues=tone_issues,
+            logic_issues=logic_issues,
+            trauma_issues=trauma_issues,
+            hate_issues=hate_issues,
+            cliche_issues=cliche_issues,
+            spelling_issues=spelling_issues,
+        )
+        return self._to_guidelines(chat_json(prompt, system=system))
+
+    async def arun(
+        self,
+        original_text: str,
+        split_text: str,
+        decision_context: dict,
+        tone_issues: list,
+        logic_issues: list,
+        trauma_issues: list | None = None,
+        hate_issues: list | None = None,
+        cliche_issues: list | None = None,
+        spelling_issues: list | None = None,
+    ) -> dict:
+        system, prompt = self._build_prompt(
+            original_text=original_text,
+            split_text=split_text,
+            decision_context=decision_context,
+            tone_issues=tone_issues,
+            logic_issues=logic_issues,
+            trauma_issues=trauma_issues,
+            hate_issues=hate_issues,
+            cliche_issues=cliche_issues,
+            spelling_issues=spelling_issues,
+        )
+        return self._to_guidelines(await achat_json(prompt, system=system))
+
+    def _build_prompt(
+        self,
+        original_text: str,
+        split_text: str,
+        decision_context: dict,
+        tone_issues: list,
+        logic_issues: list,
+        trauma_issues: list | None = None,
+        hate_issues: list | None = None,
+        cliche_issues: list | None = None,
+        spelling_issues: list | None = None,
+    ) -> tuple[str, str]:
 
         trauma_issues = trauma_issues or []
         hate_issues = hate_issues or []
@@ -147,11 +197,12 @@ JSON 외 텍스트 출력 금지.
 }}
 """
 
-        response = chat(prompt, system=system)
-        result = self._safe_json_load(response)
+        return system, prompt
 
+    def _to_guidelines(self, result: dict) -> dict:
         # 방어 로직
         if "guidelines" not in result:
             result["guidelines"] = []
 
         return result
+
@@ -1,5 +1,5 @@
 from app.agents.base import BaseAgent
-from app.services.split_map import build_split_payload
+from app.services.split_map import SplitPayload, build_split_payload
 import logging
 
 logger = logging.getLogger(__name__)
@@ -38,7 +38,7 @@ logger = logging.getLogger(__name__)
 class Splitter(BaseAgent):
     name = "split"
 
-    def run(self, input_data: str) -> dict:
+    def run(self, input_data: str) -> SplitPayload:
         logger.info(f"[DEBUG] Splitter.run: Input len={len(input_data)}")
         
         # REMOVED: embed_text call causing 400 Bad Request on large texts
@@ -1,6 +1,6 @@
 from app.agents.base import BaseAgent
 from app.llm.embedding import embed_text
-from app.services.split_map import build_split_payload
+from app.services.split_map import SplitPayload, build_split_payload
 import logging
 
 logger = logging.getLogger(__name__)
@@ -42,7 +42,7 @@ logger = logging.getLogger(__name__)
 class SplitAgent(BaseAgent):
     name = "split-tools"
 
-    def run(self, input_data: str) -> dict:
+    def run(self, input_data: str) -> SplitPayload:
         logger.info(f"[DEBUG] SplitAgent.run: Input len={len(input_data)}")
         
         # REMOVED: embed_text call causing 400 Bad Request on large texts
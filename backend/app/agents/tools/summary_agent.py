@@ -1,32 +1,221 @@
+import asyncio
+import contextvars
+import hashlib
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, List
+
 from app.agents.base import BaseAgent
-from app.llm.chat import chat
+from app.llm.chat import chat, achat
 import logging
 
 logger = logging.getLogger(__name__)
 
+_SENTENCE_END = re.compile(r"(?<=[.!?。])\s+")
+
+
 class SummaryAgent(BaseAgent):
     """
     원고 전체의 핵심 맥락을 요약하는 에이전트
+
+    - 짧은 원고: 한 번의 호출로 요약
+    - 긴 원고: 계층형 map-reduce
+      1) 원고를 문단 경계 기준 청크로 나눠 병렬 요약 (청크 요약은 LLM 응답 캐시로 재사용)
+      2) 청크 요약들을 다시 묶어 요약 (한 번에 들어갈 때까지 반복)
+      3) 최종 요약 생성
     """
     name = "summary-agent"
 
+    chunk_chars = 10000  # 한 번에 요약할 최대 글자 수
+    min_chunk_chars = 4000  # 이 길이를 넘으면 내용 기반 경계에서 청크를 끊을 수 있음
+    boundary_divisor = 4  # 문단 해시 % divisor == 0 인 위치를 청크 경계 후보로 사용
+    max_workers = 8
+
     def run(self, text: str) -> str:
         logger.info(f"[DEBUG] SummaryAgent: Summarizing text (len={len(text)})")
-        
+        if len(text) <= self.chunk_chars:
+            system, prompt = self._build_prompt(text)
+            return chat(prompt, system=system)
+
+        parts = self._split_chunks(text)
+        summaries = self._map_summaries(self._summarize_chunk, parts)
+
+        while len(summaries) > 1 and sum(len(s) for s in summaries) > self.chunk_chars:
+            groups = self._group_summaries(summaries)
+            summaries = self._map_summaries(self._summarize_group, groups)
+
+        system, prompt = self._build_prompt(self._join_summaries(summaries), from_summaries=True)
+        return chat(prompt, system=system)
+
+    async def arun(self, text: str) -> str:
+        logger.info(f"[DEBUG] SummaryAgent: Summarizing text (len={len(text)})")
+        if len(text) <= self.chunk_chars:
+            system, prompt = self._build_prompt(text)
+            return await achat(prompt, system=system)
+
+        parts = self._split_chunks(text)
+        summaries = await self._amap_summaries(self._asummarize_chunk, parts)
+
+        while len(summaries) > 1 and sum(len(s) for s in summaries) > self.chunk_chars:
+            groups = self._group_summaries(summaries)
+            summaries = await self._amap_summaries(self._asummarize_group, groups)
+
+        system, prompt = self._build_prompt(self._join_summaries(summaries), from_summaries=True)
+        return await achat(prompt, system=system)
+
+    def _in_context(self, func):
+        # 워커 스레드에도 LLM 우선순위/tenant 컨텍스트 전달
+        def _run(arg):
+            return contextvars.copy_context().run(func, arg)
+        return _run
+
+    def _map_summaries(self, summarize: Callable, items: list) -> List[str]:
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [executor.submit(self._in_context(summarize), item) for item in items]
+            outcomes = []
+            for future in futures:
+                try:
+                    outcomes.append(future.result())
+                except Exception as e:
+                    outcomes.append(e)
+        return self._keep_summaries(outcomes)
+
+    async def _amap_summaries(self, summarize: Callable[..., Awaitable[str]], items: list) -> List[str]:
+        outcomes = await asyncio.gather(*(summarize(item) for item in items), return_exceptions=True)
+        return self._keep_summaries(outcomes)
+
+    def _keep_summaries(self, outcomes: list) -> List[str]:
+        # 실패한 구간은 건너뛰고(로그/메트릭에 남김) 나머지 요약으로 진행, 모두 실패하면 에러
+        summaries = []
+        for outcome in outcomes:
+            if isinstance(outcome, BaseException):
+                self._chunk_failed(outcome)
+                continue
+            summaries.append(outcome)
+        if not summaries and outcomes:
+            raise outcomes[0]
+        return summaries
+
+    # --------------------------------------------------
+    # Chunking
+    # --------------------------------------------------
+    def _split_chunks(self, text: str) -> List[str]:
+        """
+        문단(줄) 단위로 청크 구성
+
+        경계는 글자 수만이 아니라 문단 내용 해시로도 정해지므로,
+        앞부분을 수정해도 뒤쪽 청크 경계가 밀리지 않아 캐시가 그대로 재사용된다.
+        """
+        units: List[str] = []
+        for line in text.splitlines(keepends=True):
+            if len(line) <= self.chunk_chars:
+                units.append(line)
+                continue
+            # 문단 하나가 너무 길면 문장 경계로 다시 나눈다
+            buffer = ""
+            for sentence in _SENTENCE_END.split(line):
+                if buffer and len(buffer) + len(sentence) > self.chunk_chars:
+                    units.append(buffer)
+                    buffer = ""
+                buffer += sentence + " "
+            if buffer:
+                units.append(buffer)
+
+        chunks: List[str] = []
+        current = ""
+        for unit in units:
+            if current and len(current) + len(unit) > self.chunk_chars:
+                chunks.append(current)
+                current = ""
+            current += unit
+            if len(current) >= self.min_chunk_chars and self._is_boundary(unit):
+                chunks.append(current)
+                current = ""
+        if current.strip():
+            chunks.append(current)
+        return [chunk for chunk in chunks if chunk.strip()]
+
+    def _is_boundary(self, unit: str) -> bool:
+        if not unit.strip():
+            return False
+        digest = hashlib.sha256(unit.encode("utf-8")).digest()
+        return digest[0] % self.boundary_divisor == 0
+
+    def _group_summaries(self, summaries: List[str]) -> List[List[str]]:
+        groups: List[List[str]] = []
+        current: List[str] = []
+        size = 0
+        for summary in summaries:
+            if current and size + len(summary) > self.chunk_chars:
+                groups.append(current)
+                current, size = [], 0
+            current.append(summary)
+            size += len(summary)
+        if current:
+            groups.append(current)
+        # 더 이상 줄지 않는 경우(요약 하나가 너무 긴 경우)에도 한 단계씩은 합쳐지도록 보장
+        if len(groups) == len(summaries) and len(groups) > 1:
+            groups = [summaries[i:i + 2] for i in range(0, len(summaries), 2)]
+        return groups
+
+    def _join_summaries(self, summaries: List[str]) -> str:
+        return "\n\n".join(f"[구간 {i + 1}]\n{summary}" for i, summary in enumerate(summaries))
+
+    # --------------------------------------------------
+    # Map (chunk summaries, cached by the LLM response cache)
+    # --------------------------------------------------
+    def _summarize_chunk(self, text: str) -> str:
+        system, prompt = self._build_chunk_prompt(text)
+        return chat(prompt, system=system)
+
+    async def _asummarize_chunk(self, text: str) -> str:
+        system, prompt = self._build_chunk_prompt(text)
+        return await achat(prompt, system=system)
+
+    def _summarize_group(self, summaries: List[str]) -> str:
+        if len(summaries) == 1:
+            return summaries[0]
+        return self._summarize_chunk(self._join_summaries(summaries))
+
+    async def _asummarize_group(self, summaries: List[str]) -> str:
+        if len(summaries) == 1:
+            return summaries[0]
+        return await self._asummarize_chunk(self._join_summaries(summaries))
+
+    # --------------------------------------------------
+    # Prompts
+    # --------------------------------------------------
+    def _build_chunk_prompt(self, text: str) -> tuple[str, str]:
+        system = "너는 소설 및 원고 분석을 돕는 전문 요약가이다. 긴 원고의 일부 구간을 이후 전체 요약에 합칠 수 있도록 사실 위주로 압축하라."
+
+        prompt = f"""
+        다음은 긴 원고의 한 구간(또는 여러 구간의 요약)이다. 이후 전체 요약에 합쳐질 수 있도록 간결하게 요약해줘.
+
+        요약 지침:
+        - 이 구간에서 일어난 주요 사건 (순서대로)
+        - 등장인물과 관계의 변화
+        - 새로 드러난 설정이나 복선
+        - 구간 밖의 내용은 추측하지 말 것
+
+        구간 내용:
+        {text}
+        """
+        return system, prompt
+
+    def _build_prompt(self, text: str, from_summaries: bool = False) -> tuple[str, str]:
         system = "너는 소설 및 원고 분석을 돕는 전문 요약가이다. 제공된 텍스트의 핵심 줄거리, 등장인물 관계, 주요 설정, 복선을 작가와 분석관들이 참고하기 좋게 요약하라."
-        
+
+        source_label = "원고 구간별 요약 (원고 순서)" if from_summaries else "원고 내용"
         prompt = f"""
         다음 원고를 읽고, 이후 분석 단계에서 '전체 맥락'으로 참고할 수 있도록 요약해줘.
-        
+
         요약 지침:
         - 주요 사건 흐름 (줄거리)
         - 핵심 등장인물의 성격과 목표
         - 중요한 세계관 설정이나 복선
         - 현재 진행 중인 갈등 상황
-        
-        원고 내용:
-        {text[:10000]}  # 너무 길면 앞부분 위주로 요약하되, 모델 한계까지 최대한 활용
+
+        {source_label}:
+        {text}
         """
-        
-        response = chat(prompt, system=system)
-        return response
+        return system, prompt
@@ -1,12 +1,31 @@
 import json
-from typing import Any, List, Tuple
+from itertools import accumulate
+from typing import Any, Callable, List, Sequence, Tuple
 
+from app.core.settings import get_settings
+from app.services.split_map import SplitPayload
 
-def extract_split_payload(split_payload: Any) -> Tuple[str, List[str]]:
+# (window 문장들, window_start, core_start, core_end) - 인덱스는 모두 원고 전체 기준
+PackedChunk = Tuple[List[str], int, int, int]
+
+# 토큰 추정 (토크나이저 없이): 영문/숫자/기호는 약 4글자당 1토큰, 한글 등 비ASCII는 글자당 약 0.75토큰
+_ASCII_CHARS_PER_TOKEN = 4
+_NON_ASCII_TOKENS_PER_CHAR = 0.75
+# JSON 문자열 배열 항목의 따옴표/쉼표
+_JSON_ITEM_TOKENS = 2
+# format_word_indexed_chunk 항목의 {"id": n, "text": ...} 와 어절마다 붙는 `(번호)`
+_WORD_INDEXED_ITEM_TOKENS = 8
+_WORD_INDEX_TOKENS = 2
+
+
+def extract_split_payload(split_payload: Any) -> Tuple[str, Sequence[str]]:
     summary = ""
-    sentences: List[str] = []
+    sentences: Sequence[str] = []
 
-    if isinstance(split_payload, dict):
+    if isinstance(split_payload, SplitPayload):
+        # 복사하지 않고 원문 슬라이스 뷰를 그대로 넘긴다 (슬라이스는 list)
+        sentences = split_payload.sentences
+    elif isinstance(split_payload, dict):
         summary = str(split_payload.get("split_text") or "")
         raw_sentences = split_payload.get("split_sentences")
         if isinstance(raw_sentences, list):
@@ -19,10 +38,109 @@ def extract_split_payload(split_payload: Any) -> Tuple[str, List[str]]:
     return summary, sentences
 
 
+def estimate_text_tokens(text: str) -> int:
+    # 한글/CJK/전각 부호는 UTF-8 3바이트이므로 바이트 차이로 비ASCII 글자 수를 빠르게 근사
+    non_ascii = (len(text.encode("utf-8")) - len(text)) // 2
+    ascii_chars = max(0, len(text) - non_ascii)
+    return int(ascii_chars / _ASCII_CHARS_PER_TOKEN + non_ascii * _NON_ASCII_TOKENS_PER_CHAR) + 1
+
+
+def sentence_tokens(sentence: str) -> int:
+    """
+    format_split_payload(JSON 문자열 배열)에서 문장 하나가 차지하는 토큰 수 추정
+    """
+    return estimate_text_tokens(sentence) + _JSON_ITEM_TOKENS
+
+
+def word_indexed_sentence_tokens(sentence: str) -> int:
+    """
+    format_word_indexed_chunk에서 문장 하나가 차지하는 토큰 수 추정
+    """
+    return estimate_text_tokens(sentence) + _WORD_INDEXED_ITEM_TOKENS + _WORD_INDEX_TOKENS * len(sentence.split())
+
+
+def prompt_token_budget(model: str | None = None) -> int:
+    """
+    프롬프트의 문장 부분에 쓸 토큰 예산 (모델별 설정 우선)
+    """
+    settings = get_settings()
+    if model and model in settings.prompt_token_budgets:
+        return settings.prompt_token_budgets[model]
+    return settings.prompt_token_budget
+
+
+def pack_sentences(
+    sentences: Sequence[str],
+    token_budget: int,
+    overlap: int = 0,
+    max_sentences: int | None = None,
+    cost: Callable[[str], int] = sentence_tokens,
+) -> List[PackedChunk]:
+    """
+    문장 목록을 토큰 예산에 맞춰 (window, window_start, core_start, core_end) 목록으로 분할
+
+    - core: 이 청크가 이슈를 책임지는 구간 (청크끼리 겹치지 않고 순서대로 이어짐)
+    - window: core 앞뒤로 overlap 문장을 문맥으로 덧붙인 구간 (예산에 포함)
+    - 인덱스는 원고 전체 기준이므로 청크 결과를 그대로 전역 sentence_index로 옮길 수 있다
+    - 문장 하나가 예산보다 길면 그 문장만 담은 청크를 만든다
+    """
+    total = len(sentences)
+    if not total:
+        return []
+    overlap = max(0, overlap)
+    limit = max(1, max_sentences) if max_sentences else total
+    prefix = [0, *accumulate(cost(sentence) for sentence in sentences)]
+
+    chunks: List[PackedChunk] = []
+    core_start = 0
+    while core_start < total:
+        window_start = max(0, core_start - overlap)
+        # 긴 문장 때문에 예산을 넘으면 문맥 문장부터 덜어낸다
+        while window_start < core_start and prefix[core_start + 1] - prefix[window_start] > token_budget:
+            window_start += 1
+        core_end = core_start + 1
+        while core_end < total and core_end - core_start < limit:
+            window_end = min(total, core_end + 1 + overlap)
+            if prefix[window_end] - prefix[window_start] > token_budget:
+                break
+            core_end += 1
+        window_end = min(total, core_end + overlap)
+        while window_end > core_end and prefix[window_end] - prefix[window_start] > token_budget:
+            window_end -= 1
+        chunks.append((list(sentences[window_start:window_end]), window_start, core_start, core_end))
+        core_start = core_end
+    return chunks
+
+
 def format_split_payload(split_payload: Any) -> str:
     _, sentences = extract_split_payload(split_payload)
     parts: List[str] = []
     if sentences:
         parts.append("[문장 목록 JSON 배열 (index가 sentence_index)]")
-        parts.append(json.dumps(sentences, ensure_ascii=False))
+        parts.append(json.dumps(list(sentences), ensure_ascii=False))
     return "\n".join(parts)
+
+
+def format_word_indexed_chunk(chunk: List[str]) -> str:
+    """
+    청크 문장들을 어절마다 `(번호)단어` 형태로 인덱싱한 JSON 배열로 변환
+    """
+    prepared_chunk = []
+    for i, sent in enumerate(chunk):
+        words = sent.split()
+        annotated_sent = " ".join([f"({w_idx}){word}" for w_idx, word in enumerate(words)])
+        prepared_chunk.append({
+            "id": i,
+            "text": annotated_sent
+        })
+    return json.dumps(prepared_chunk, ensure_ascii=False)
+
+
+def format_word_indexed_payload(chunk: List[str]) -> str:
+    """
+    청크 에이전트용 문장 배열 (설명 헤더 + format_word_indexed_chunk)
+    """
+    return "\n".join([
+        '[문장 배열 JSON ("id"가 문장 번호, "text"는 어절마다 `(번호)단어` 형태로 인덱싱)]',
+        format_word_indexed_chunk(chunk),
+    ])
@@ -1,7 +1,7 @@
 import os
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
-from sqlalchemy import String, Text, DateTime, ForeignKey, func
+from sqlalchemy import String, Text, DateTime, ForeignKey, Index, Integer, LargeBinary, func
 from app.core.settings import get_settings
 
 engine = None
@@ -23,6 +23,8 @@ class User(Base):
 
 class Document(Base):
     __tablename__ = "documents"
+    # 목록 조회 (user_id 필터 + created_at DESC, id 키셋 페이지네이션)
+    __table_args__ = (Index("ix_documents_user_id_created_at", "user_id", "created_at", "id"),)
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True)
     user_id: Mapped[str | None] = mapped_column(ForeignKey("users.id"), index=True)
@@ -44,6 +46,8 @@ class Document(Base):
 
 class Analysis(Base):
     __tablename__ = "analyses"
+    # 문서별 분석 이력 조회 (document_id 필터 + created_at DESC, id 키셋 페이지네이션)
+    __table_args__ = (Index("ix_analyses_document_id_created_at", "document_id", "created_at", "id"),)
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True)
     document_id: Mapped[str] = mapped_column(ForeignKey("documents.id"), index=True)
@@ -51,10 +55,68 @@ class Analysis(Base):
     decision: Mapped[str | None] = mapped_column(String(20), nullable=True)
     has_issues: Mapped[bool | None] = mapped_column(nullable=True)
     issue_counts_json: Mapped[str] = mapped_column(Text, default="{}")
-    result_json: Mapped[str] = mapped_column(Text)
+    # "json": result_json에 전체 결과 (예전 행), "sections": analysis_sections에 섹션별 압축 저장
+    result_format: Mapped[str] = mapped_column(String(20), default="json")
+    result_json: Mapped[str] = mapped_column(Text, default="")
+    # 실행 메트릭 (RunMetrics.snapshot: 노드별 시간/대기/토큰/비용/재시도/청크 수)
+    metrics_json: Mapped[str] = mapped_column(Text, default="{}")
     created_at: Mapped[str] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
     document: Mapped["Document"] = relationship(back_populates="analyses")
+    sections: Mapped[list["AnalysisSection"]] = relationship(back_populates="analysis", cascade="all, delete-orphan")
+
+
+class AnalysisSection(Base):
+    """
+    분석 결과 섹션 (issues, report, split, tension_curve, core, aliases) - app/services/result_storage.py
+    """
+    __tablename__ = "analysis_sections"
+
+    analysis_id: Mapped[str] = mapped_column(ForeignKey("analyses.id", ondelete="CASCADE"), primary_key=True)
+    name: Mapped[str] = mapped_column(String(40), primary_key=True)
+    codec: Mapped[str] = mapped_column(String(10), default="none")  # none | zstd
+    data: Mapped[bytes] = mapped_column(LargeBinary)
+    raw_bytes: Mapped[int] = mapped_column(Integer, default=0)  # 압축 전 JSON 크기
+
+    analysis: Mapped["Analysis"] = relationship(back_populates="sections")
+
+
+class AnalysisJob(Base):
+    """
+    백그라운드 분석 작업 (요청과 분리되어 워커 풀에서 실행)
+
+    status: queued -> running -> done | failed
+    """
+    __tablename__ = "analysis_jobs"
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    document_id: Mapped[str] = mapped_column(ForeignKey("documents.id"), index=True)
+    user_id: Mapped[str | None] = mapped_column(String(36), nullable=True)
+    status: Mapped[str] = mapped_column(String(20), default="queued", index=True)
+    mode: Mapped[str] = mapped_column(String(40), default="full")
+    options_json: Mapped[str] = mapped_column(Text, default="{}")
+    incremental: Mapped[bool] = mapped_column(default=True)
+    analysis_id: Mapped[str | None] = mapped_column(String(36), nullable=True)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    worker_id: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    heartbeat_at: Mapped[str | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    created_at: Mapped[str] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    started_at: Mapped[str | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    finished_at: Mapped[str | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+
+class AnalysisJobEvent(Base):
+    """
+    작업 진행 이벤트 (NDJSON 스트림 재접속 시 seq 이후부터 다시 전송)
+    """
+    __tablename__ = "analysis_job_events"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    job_id: Mapped[str] = mapped_column(ForeignKey("analysis_jobs.id", ondelete="CASCADE"), index=True)
+    seq: Mapped[int] = mapped_column(Integer)
+    event_json: Mapped[str] = mapped_column(Text)
+    created_at: Mapped[str] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
 
 class EvalRun(Base):
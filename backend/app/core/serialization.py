@@ -0,0 +1,53 @@
+"""
+JSON 직렬화 공통 경로 (DB 저장용 *_json 컬럼, NDJSON 스트림)
+
+- orjson 사용 (pyproject 필수 의존성: 표준 json과는 출력 형식/속도가 달라 폴백하지 않는다)
+- 기본 타입이 아닌 값(pydantic 모델, set 등)은 jsonable_encoder로 변환
+- raw_json(): 이미 직렬화된 JSON을 다시 파싱하지 않고 dumps() 결과에 그대로 끼워 넣는다
+  (예: 저장된 분석 결과를 final_result 이벤트/분석 조회 응답에 재사용)
+"""
+from typing import Any, Iterator
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+# 큰 NDJSON 줄은 이 크기로 나눠 보낸다 (한 번의 write로 루프를 오래 잡지 않도록)
+STREAM_CHUNK_BYTES = 64 * 1024
+
+
+def _default(value: Any) -> Any:
+    return jsonable_encoder(value)
+
+
+def dumps(value: Any) -> bytes:
+    return orjson.dumps(value, default=_default, option=_ORJSON_OPTIONS)
+
+
+def dumps_text(value: Any) -> str:
+    """
+    Text 컬럼 저장용 (dumps()와 같은 출력의 str)
+    """
+    return dumps(value).decode("utf-8")
+
+
+def loads(data: str | bytes) -> Any:
+    return orjson.loads(data)
+
+
+def raw_json(data: str | bytes) -> orjson.Fragment:
+    return orjson.Fragment(data)
+
+
+def ndjson_chunks(event: Any, chunk_size: int = STREAM_CHUNK_BYTES) -> Iterator[bytes]:
+    """
+    이벤트 1개 -> NDJSON 한 줄, chunk_size 바이트 단위 조각
+    """
+    line = dumps(event) + b"\n"
+    if len(line) <= chunk_size:
+        yield line
+        return
+    view = memoryview(line)
+    for start in range(0, len(line), chunk_size):
+        yield bytes(view[start : start + chunk_size])
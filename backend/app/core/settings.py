@@ -1,4 +1,6 @@
 import os
+from typing import Dict
+
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -17,6 +19,58 @@ class Settings(BaseSettings):
     upstage_base_url: str = "https://api.upstage.ai/v1"
     upstage_document_parse_endpoint: str = "/document-ai/document-parse"
 
+    # LLM client (process-wide connection pool)
+    llm_max_connections: int = 32
+    llm_max_keepalive_connections: int = 16
+    llm_keepalive_expiry: float = 30.0
+    llm_timeout_seconds: float = 120.0
+    llm_max_concurrency: int = 16
+    # 프로세스 전역 속도 제한 (0 = 제한 없음)
+    llm_requests_per_second: float = 8.0
+    llm_tokens_per_minute: int = 0
+    # 재시도 / 데드라인 / 헤지 요청
+    llm_max_retries: int = 4
+    llm_retry_base_delay: float = 0.5
+    llm_retry_max_delay: float = 20.0
+    llm_call_deadline_seconds: float = 300.0  # 재시도를 포함한 호출 1건의 최대 시간
+    llm_hedge_after_seconds: float = 0.0  # 0 = 헤지 요청 사용 안 함 (비동기 경로 전용)
+    # JSON 응답 에이전트: response_format(JSON 모드) 사용,
+    # 이어받기 최대 횟수 (잘린 배열 꼬리 + 중첩 객체면 배열 뒤의 나머지 키)
+    llm_json_mode: bool = True
+    llm_json_max_continuations: int = 2
+    # 스트리밍 분석(/analysis/run-stream)에서 JSON 응답을 스트리밍으로 받아 issue_found 이벤트 전송
+    llm_stream_issues: bool = True
+
+    # 청크/윈도우 프롬프트의 문장 부분 토큰 예산 (app.agents.utils.pack_sentences)
+    prompt_token_budget: int = 4000
+    prompt_token_budgets: Dict[str, int] = {"solar-pro2": 4000, "solar-mini": 2500}  # 모델별 덮어쓰기
+
+    # 비용 추정용 모델별 100만 토큰당 단가 (USD, RunMetrics.cost_usd)
+    llm_pricing: Dict[str, Dict[str, float]] = {
+        "solar-pro2": {"input": 0.15, "cached_input": 0.15, "output": 0.6},
+        "solar-mini": {"input": 0.15, "cached_input": 0.15, "output": 0.15},
+    }
+
+    # LLM response cache (key: model/system/prompt/temperature 해시)
+    llm_cache_enabled: bool = True
+    llm_cache_path: str = "./data/llm_cache.db"
+    llm_cache_ttl_seconds: int = 60 * 60 * 24 * 7  # 1 week, 0 = no expiry
+    llm_cache_max_entries: int = 20000  # LRU, 0 = unbounded
+
+    # LangGraph: 노드를 코루틴으로 실행 (False면 동기 노드 + 스레드 풀)
+    graph_async_nodes: bool = True
+    # trauma/hate_bias/spelling을 청크당 한 번의 호출로 통합 (호출 수 감소, 기본은 개별 에이전트)
+    fused_surface_scan: bool = False
+    # LangGraph 체크포인트: 실패/중단된 분석을 마지막으로 끝난 노드부터 재개
+    graph_checkpoint_enabled: bool = True
+    graph_checkpoint_path: str = "./data/graph_checkpoints.db"
+
+    # 백그라운드 분석 작업 큐 (0 = API 프로세스에서는 워커를 띄우지 않음, scripts/run_job_worker.py 사용)
+    analysis_job_workers: int = 2
+    analysis_job_poll_interval: float = 1.0
+    analysis_job_stale_seconds: float = 120.0  # heartbeat가 이 시간 이상 끊기면 재실행
+    analysis_job_max_attempts: int = 2
+
     # LangSmith (Observability / Eval)
     langsmith_api_key: str | None = None
     langsmith_project: str | None = None
@@ -32,6 +86,7 @@ class Settings(BaseSettings):
     # Analysis feature flags (default enabled)
     enable_split_map: bool = True
     enable_normalized_issues: bool = True
+    enable_incremental_analysis: bool = True
 
 _settings: Settings | None = None
 
@@ -0,0 +1,89 @@
+"""
+LangGraph 체크포인트 (SQLite, team.db 옆 파일)
+
+분석 1회(run id = 작업 id 등)를 thread_id로 사용해 슈퍼스텝마다 상태를 저장한다.
+같은 run id로 다시 실행하면 마지막 체크포인트부터 이어서 실행하므로,
+report/rewrite 단계에서 실패해도 이미 끝난 평가 노드 결과를 다시 계산하지 않는다.
+
+aiosqlite 연결은 이벤트 루프에 묶이므로 루프별로 saver / 컴파일된 그래프를 유지한다.
+"""
+import asyncio
+import logging
+import os
+import weakref
+from typing import Any, Dict, Tuple
+
+from app.core.settings import get_settings
+
+try:
+    import aiosqlite
+    from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+    from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+except Exception:  # pragma: no cover - optional dependency/runtime
+    aiosqlite = None
+    JsonPlusSerializer = None
+    AsyncSqliteSaver = None
+
+logger = logging.getLogger(__name__)
+
+# 상태에 들어가는 사용자 정의 타입 (역직렬화 허용 목록)
+_STATE_TYPES = [("app.services.split_map", "SplitPayload")]
+
+_apps: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Tuple[Any, Any]]" = weakref.WeakKeyDictionary()
+
+
+def checkpointing_enabled() -> bool:
+    return get_settings().graph_checkpoint_enabled and AsyncSqliteSaver is not None
+
+
+def run_config(run_id: str) -> Dict[str, Any]:
+    return {"configurable": {"thread_id": run_id}}
+
+
+async def get_checkpointed_app():
+    """
+    체크포인터를 붙여 컴파일한 그래프 (현재 이벤트 루프 기준). 사용할 수 없으면 None
+    """
+    if not checkpointing_enabled():
+        return None
+    loop = asyncio.get_running_loop()
+    cached = _apps.get(loop)
+    if cached is not None:
+        return cached[1]
+
+    from app.graph.graph import graph
+
+    path = get_settings().graph_checkpoint_path
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    conn = await aiosqlite.connect(path)
+    await conn.execute("PRAGMA journal_mode=WAL")
+    saver = AsyncSqliteSaver(conn, serde=JsonPlusSerializer(allowed_msgpack_modules=_STATE_TYPES))
+    await saver.setup()
+
+    cached = _apps.get(loop)
+    if cached is not None:
+        # 다른 코루틴이 먼저 만든 경우
+        await conn.close()
+        return cached[1]
+    app = graph.compile(checkpointer=saver)
+    _apps[loop] = (saver, app)
+    return app
+
+
+async def delete_checkpoints(run_id: str) -> None:
+    """
+    정상 완료된 분석의 체크포인트 정리 (실패한 분석만 재개용으로 남긴다)
+    """
+    cached = _apps.get(asyncio.get_running_loop())
+    if cached is None:
+        return
+    try:
+        await cached[0].adelete_thread(run_id)
+    except Exception as e:
+        logger.warning(f"[CHECKPOINT] Failed to delete checkpoints for {run_id}: {e}")
+
+
+async def close_checkpointer() -> None:
+    cached = _apps.pop(asyncio.get_running_loop(), None)
+    if cached is not None:
+        await cached[0].conn.close()
@@ -1,81 +1,75 @@
 from langgraph.graph import StateGraph, END
+from app.core.settings import get_settings
 from app.graph.state import AgentState
 
 # entry / context
-from app.graph.nodes.reader_persona_node import reader_persona_node
-from app.graph.nodes.split_node import split_node
-from app.graph.nodes.summary_node import summary_node
-from app.graph.nodes.persona_feedback_node import persona_feedback_node
+from app.graph.nodes.reader_persona_node import reader_persona_node, reader_persona_node_async
+from app.graph.nodes.split_node import split_node, split_node_async
+from app.graph.nodes.summary_node import summary_node, summary_node_async
+from app.graph.nodes.persona_feedback_node import persona_feedback_node, persona_feedback_node_async
 
 # evaluators
-from app.graph.nodes.tone_node import tone_node
+from app.graph.nodes.tone_node import tone_node, tone_node_async
 from app.graph.nodes.causality_node import causality_node as logic_node
-from app.graph.nodes.trauma_node import trauma_node
-from app.graph.nodes.hate_bias_node import hate_bias_node
-from app.graph.nodes.genre_cliche_node import genre_cliche_node
-from app.graph.nodes.spelling_node import spelling_node
-from app.graph.nodes.tension_curve_node import tension_curve_node
-from app.graph.nodes.qa_scores_node import qa_scores_node
+from app.graph.nodes.causality_node import causality_node_async as logic_node_async
+from app.graph.nodes.trauma_node import trauma_node, trauma_node_async
+from app.graph.nodes.hate_bias_node import hate_bias_node, hate_bias_node_async
+from app.graph.nodes.genre_cliche_node import genre_cliche_node, genre_cliche_node_async
+from app.graph.nodes.spelling_node import spelling_node, spelling_node_async
+from app.graph.nodes.tension_curve_node import tension_curve_node, tension_curve_node_async
+from app.graph.nodes.qa_scores_node import qa_scores_node, qa_scores_node_async
+from app.graph.nodes.surface_scan_node import surface_scan_node, surface_scan_node_async
 
 # core decision / output
-from app.graph.nodes.aggregate_node import aggregate_node
-from app.graph.nodes.rewrite_node import rewrite_node
-from app.graph.nodes.report_node import report_node
-
-
-# --------------------------------------------------
-# Graph definition
-# --------------------------------------------------
-graph = StateGraph(AgentState)
-
-# --------------------------------------------------
-# Nodes
-# --------------------------------------------------
-
-# entry / context
-graph.add_node("reader_persona", reader_persona_node)
-graph.add_node("split", split_node)
-graph.add_node("summary", summary_node)
-graph.add_node("persona_feedback", persona_feedback_node)
-
-# evaluators (parallel)
-graph.add_node("tone", tone_node)
-graph.add_node("logic", logic_node)
-graph.add_node("trauma", trauma_node)
-graph.add_node("hate_bias", hate_bias_node)
-graph.add_node("genre_cliche", genre_cliche_node)
-graph.add_node("spelling", spelling_node)
-graph.add_node("tension_curve", tension_curve_node)
-
-# decision / output
-graph.add_node("aggregate", aggregate_node)
-graph.add_node("rewrite", rewrite_node)
-graph.add_node("report", report_node)
-graph.add_node("qa_scores", qa_scores_node)
-
-# --------------------------------------------------
-# Entry point
-# --------------------------------------------------
-# reader_persona는 context만 필요하므로 entry로 둔다
-graph.set_entry_point("reader_persona")
-
-# --------------------------------------------------
-# Context / preprocessing flow
-# --------------------------------------------------
-
-# context → split
-graph.add_edge("reader_persona", "split")
-
-# split → summary
-graph.add_edge("split", "summary")
-
-# persona_feedback는 summary 이후에 실행 (요약본 참고 가능하도록)
-graph.add_edge("summary", "persona_feedback")
-
-# --------------------------------------------------
-# Evaluators (parallel fan-out)
-# --------------------------------------------------
-for node in [
+from app.graph.nodes.aggregate_node import aggregate_node, aggregate_node_async
+from app.graph.nodes.rewrite_node import rewrite_node, rewrite_node_async
+from app.graph.nodes.report_node import report_node, report_node_async
+
+
+# --------------------------------------------------
+# Node tables (sync / async)
+# --------------------------------------------------
+# async 노드는 이벤트 루프에서 코루틴으로 실행되어, 병렬 평가 단계가
+# 스레드 풀(노드당 OS 스레드)을 점유하지 않는다.
+SYNC_NODES = {
+    "reader_persona": reader_persona_node,
+    "split": split_node,
+    "summary": summary_node,
+    "persona_feedback": persona_feedback_node,
+    "tone": tone_node,
+    "logic": logic_node,
+    "trauma": trauma_node,
+    "hate_bias": hate_bias_node,
+    "genre_cliche": genre_cliche_node,
+    "spelling": spelling_node,
+    "tension_curve": tension_curve_node,
+    "surface_scan": surface_scan_node,
+    "aggregate": aggregate_node,
+    "rewrite": rewrite_node,
+    "report": report_node,
+    "qa_scores": qa_scores_node,
+}
+
+ASYNC_NODES = {
+    "reader_persona": reader_persona_node_async,
+    "split": split_node_async,
+    "summary": summary_node_async,
+    "persona_feedback": persona_feedback_node_async,
+    "tone": tone_node_async,
+    "logic": logic_node_async,
+    "trauma": trauma_node_async,
+    "hate_bias": hate_bias_node_async,
+    "genre_cliche": genre_cliche_node_async,
+    "spelling": spelling_node_async,
+    "tension_curve": tension_curve_node_async,
+    "surface_scan": surface_scan_node_async,
+    "aggregate": aggregate_node_async,
+    "rewrite": rewrite_node_async,
+    "report": report_node_async,
+    "qa_scores": qa_scores_node_async,
+}
+
+EVALUATOR_NODES = [
     "tone",
     "logic",
     "trauma",
@@ -83,12 +77,18 @@ for node in [
     "genre_cliche",
     "spelling",
     "tension_curve",
-]:
-    graph.add_edge("summary", node)
-    graph.add_edge(node, "aggregate")
+]
+
+# fused 모드: 청크 단위 표면 검사 세 노드를 한 번의 호출로 묶은 surface_scan 노드로 대체
+SURFACE_SCAN_NODES = ["trauma", "hate_bias", "spelling"]
+
+
+def evaluator_nodes(fused_surface_scan: bool = False) -> list:
+    if not fused_surface_scan:
+        return list(EVALUATOR_NODES)
+    nodes = [node for node in EVALUATOR_NODES if node not in SURFACE_SCAN_NODES]
+    return nodes + ["surface_scan"]
 
-# persona feedback도 aggregate로
-graph.add_edge("persona_feedback", "aggregate")
 
 # --------------------------------------------------
 # Decision routing
@@ -98,23 +98,82 @@ def route_after_aggregate(state: AgentState):
     return "rewrite" if decision == "rewrite" else "report"
 
 
-graph.add_conditional_edges(
-    "aggregate",
-    route_after_aggregate,
-    {
-        "rewrite": "rewrite",
-        "report": "report",
-    },
-)
+def build_graph(async_nodes: bool = True, fused_surface_scan: bool = False) -> StateGraph:
+    """
+    분석 그래프 정의
+
+    - async_nodes=True: 모든 노드를 코루틴으로 등록 (ainvoke/astream 전용)
+    - async_nodes=False: 기존 동기 노드로 등록 (invoke/stream 및 스레드 풀 실행)
+    - fused_surface_scan=True: trauma/hate_bias/spelling 대신 surface_scan 노드 하나로 실행
+    """
+    nodes = ASYNC_NODES if async_nodes else SYNC_NODES
+    evaluators = evaluator_nodes(fused_surface_scan)
+    unused = set(SURFACE_SCAN_NODES) if fused_surface_scan else {"surface_scan"}
+    graph = StateGraph(AgentState)
+
+    # --------------------------------------------------
+    # Nodes
+    # --------------------------------------------------
+    for name, node in nodes.items():
+        if name not in unused:
+            graph.add_node(name, node)
+
+    # --------------------------------------------------
+    # Entry point
+    # --------------------------------------------------
+    # reader_persona는 context만 필요하므로 entry로 둔다
+    graph.set_entry_point("reader_persona")
+
+    # --------------------------------------------------
+    # Context / preprocessing flow
+    # --------------------------------------------------
+
+    # context → split
+    graph.add_edge("reader_persona", "split")
+
+    # split → summary
+    graph.add_edge("split", "summary")
+
+    # persona_feedback는 summary 이후에 실행 (요약본 참고 가능하도록)
+    graph.add_edge("summary", "persona_feedback")
+
+    # --------------------------------------------------
+    # Evaluators (parallel fan-out)
+    # --------------------------------------------------
+    for node in evaluators:
+        graph.add_edge("summary", node)
+        graph.add_edge(node, "aggregate")
+
+    # persona feedback도 aggregate로
+    graph.add_edge("persona_feedback", "aggregate")
+
+    # --------------------------------------------------
+    # Decision routing
+    # --------------------------------------------------
+    graph.add_conditional_edges(
+        "aggregate",
+        route_after_aggregate,
+        {
+            "rewrite": "rewrite",
+            "report": "report",
+        },
+    )
+
+    # --------------------------------------------------
+    # Finalization
+    # --------------------------------------------------
+    graph.add_edge("rewrite", "report")
+    graph.add_edge("report", "qa_scores")
+    graph.add_edge("qa_scores", END)
+
+    return graph
 
-# --------------------------------------------------
-# Finalization
-# --------------------------------------------------
-graph.add_edge("rewrite", "report")
-graph.add_edge("report", "qa_scores")
-graph.add_edge("qa_scores", END)
 
 # --------------------------------------------------
 # Compile
 # --------------------------------------------------
+graph = build_graph(
+    async_nodes=get_settings().graph_async_nodes,
+    fused_surface_scan=get_settings().fused_surface_scan,
+)
 agent_app = graph.compile()
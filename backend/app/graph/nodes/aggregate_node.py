@@ -8,8 +8,7 @@ logger = logging.getLogger(__name__)
 
 aggregator_agent = IssueBasedAggregatorAgent()
 
-@traceable_timed(name="aggregate")
-def aggregate_node(state: AgentState) -> AgentState:
+def _aggregate(state: AgentState) -> AgentState:
     logger.info("분석 취합: [START]")
     
     def extract_issues(result: dict | None):
@@ -41,4 +40,15 @@ def aggregate_node(state: AgentState) -> AgentState:
 
     return {
         "aggregated_result": aggregate_result.model_dump(),
-    }
\ No newline at end of file
+    }
+
+
+@traceable_timed(name="aggregate")
+def aggregate_node(state: AgentState) -> AgentState:
+    return _aggregate(state)
+
+
+@traceable_timed(name="aggregate")
+async def aggregate_node_async(state: AgentState) -> AgentState:
+    # LLM 호출 없는 결정론적 단계: 스레드 풀을 거치지 않고 이벤트 루프에서 바로 실행
+    return _aggregate(state)
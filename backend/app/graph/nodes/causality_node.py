@@ -9,17 +9,7 @@ logger = logging.getLogger(__name__)
 
 causality_agent = CausalityEvaluatorAgent()
 
-@traceable_timed(name="logic")
-def causality_node(state: AgentState) -> AgentState:
-    logger.info("개연성 분석: [START]")
-    logs = add_log("서사 분석가", "이야기의 흐름을 따라가 보며, 독자들이 고개를 갸우뚱할 만한 부분은 없는지 개연성을 살펴볼게요. 긴장되는 순간이네요!")
-    
-    result = causality_agent.run(
-        state.get("split_text"),
-        global_summary=state.get("global_summary"),
-        persona=state.get("reader_persona")
-    )
-    
+def _finish_causality(result: dict, logs: list) -> AgentState:
     issue_count = len(result.get("issues", []))
     if issue_count > 0:
         logs += add_log("서사 분석가", f"이야기 중에 살짝 보완이 필요한 지점을 {issue_count}군데 발견했어요. 이 부분을 조금만 더 다듬으면 독자들이 훨씬 더 몰입할 수 있을 것 같아요!")
@@ -32,3 +22,28 @@ def causality_node(state: AgentState) -> AgentState:
         "logs": logs
     }
 
+
+@traceable_timed(name="logic")
+def causality_node(state: AgentState) -> AgentState:
+    logger.info("개연성 분석: [START]")
+    logs = add_log("서사 분석가", "이야기의 흐름을 따라가 보며, 독자들이 고개를 갸우뚱할 만한 부분은 없는지 개연성을 살펴볼게요. 긴장되는 순간이네요!")
+
+    result = causality_agent.run(
+        state.get("split_text"),
+        global_summary=state.get("global_summary"),
+        persona=state.get("reader_persona")
+    )
+    return _finish_causality(result, logs)
+
+
+@traceable_timed(name="logic")
+async def causality_node_async(state: AgentState) -> AgentState:
+    logger.info("개연성 분석: [START]")
+    logs = add_log("서사 분석가", "이야기의 흐름을 따라가 보며, 독자들이 고개를 갸우뚱할 만한 부분은 없는지 개연성을 살펴볼게요. 긴장되는 순간이네요!")
+
+    result = await causality_agent.arun(
+        state.get("split_text"),
+        global_summary=state.get("global_summary"),
+        persona=state.get("reader_persona")
+    )
+    return _finish_causality(result, logs)
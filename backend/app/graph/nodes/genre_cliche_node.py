@@ -8,17 +8,7 @@ logger = logging.getLogger(__name__)
 
 genre_cliche_agent = GenreClicheAgent()
 
-@traceable_timed(name="genre_cliche")
-def genre_cliche_node(state: AgentState) -> AgentState:
-    logger.info("클리셰 분석: [START]")
-    logs = add_log("장르 전문가", "이 장르의 매력을 얼마나 잘 살렸는지, 혹시 너무 뻔한 클리셰는 없는지 제가 매의 눈으로 찾아볼게요!")
-    
-    result = genre_cliche_agent.run(
-        state.get("split_text"),
-        global_summary=state.get("global_summary"),
-        persona=state.get("reader_persona")
-    )
-    
+def _finish_genre_cliche(result: dict, logs: list) -> AgentState:
     issue_count = len(result.get("issues", []))
     if issue_count > 0:
         logs += add_log("장르 전문가", f"장르적 재미를 더하기 위해 {issue_count}가지 정도 제안하고 싶은 게 있어요. 클리셰를 비틀면 더 멋진 글이 될 거예요!")
@@ -30,3 +20,29 @@ def genre_cliche_node(state: AgentState) -> AgentState:
         "genre_cliche_result": result,
         "logs": logs
     }
+
+
+@traceable_timed(name="genre_cliche")
+def genre_cliche_node(state: AgentState) -> AgentState:
+    logger.info("클리셰 분석: [START]")
+    logs = add_log("장르 전문가", "이 장르의 매력을 얼마나 잘 살렸는지, 혹시 너무 뻔한 클리셰는 없는지 제가 매의 눈으로 찾아볼게요!")
+
+    result = genre_cliche_agent.run(
+        state.get("split_text"),
+        global_summary=state.get("global_summary"),
+        persona=state.get("reader_persona")
+    )
+    return _finish_genre_cliche(result, logs)
+
+
+@traceable_timed(name="genre_cliche")
+async def genre_cliche_node_async(state: AgentState) -> AgentState:
+    logger.info("클리셰 분석: [START]")
+    logs = add_log("장르 전문가", "이 장르의 매력을 얼마나 잘 살렸는지, 혹시 너무 뻔한 클리셰는 없는지 제가 매의 눈으로 찾아볼게요!")
+
+    result = await genre_cliche_agent.arun(
+        state.get("split_text"),
+        global_summary=state.get("global_summary"),
+        persona=state.get("reader_persona")
+    )
+    return _finish_genre_cliche(result, logs)
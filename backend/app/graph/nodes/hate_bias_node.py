@@ -2,21 +2,14 @@ from app.agents import HateBiasAgent
 from app.graph.state import AgentState
 from app.graph.nodes.utils import add_log
 from app.observability.langsmith import traceable_timed
+from app.services.incremental_analysis import incremental_input
 import logging
 
 logger = logging.getLogger(__name__)
 
 hate_bias_agent = HateBiasAgent()
 
-@traceable_timed(name="hate_bias")
-def hate_bias_node(state: AgentState) -> AgentState:
-    logger.info("혐오/편향 분석: [START]")
-    logs = add_log("윤리 감시자", "사회적 편견이나 혐오 표현이 숨어있지는 않은지 꼼꼼히 점검해 보겠습니다. 모두가 존중받는 이야기를 위해!")
-    
-    result = hate_bias_agent.run(
-        state.get("split_text")
-    )
-    
+def _finish_hate_bias(result: dict, logs: list) -> AgentState:
     issue_count = len(result.get("issues", []))
     if issue_count > 0:
         logs += add_log("윤리 감시자", f"더 따뜻한 시선으로 다듬어지면 좋을 부분이 {issue_count}군데 있어요. 작가님의 진심이 오해 없이 전달되도록 도와드릴게요.")
@@ -28,3 +21,27 @@ def hate_bias_node(state: AgentState) -> AgentState:
         "hate_bias_result": result,
         "logs": logs
     }
+
+
+@traceable_timed(name="hate_bias")
+def hate_bias_node(state: AgentState) -> AgentState:
+    logger.info("혐오/편향 분석: [START]")
+    logs = add_log("윤리 감시자", "사회적 편견이나 혐오 표현이 숨어있지는 않은지 꼼꼼히 점검해 보겠습니다. 모두가 존중받는 이야기를 위해!")
+
+    result = hate_bias_agent.run(
+        state.get("split_text"),
+        incremental=incremental_input(state.get("incremental"), "hate_bias"),
+    )
+    return _finish_hate_bias(result, logs)
+
+
+@traceable_timed(name="hate_bias")
+async def hate_bias_node_async(state: AgentState) -> AgentState:
+    logger.info("혐오/편향 분석: [START]")
+    logs = add_log("윤리 감시자", "사회적 편견이나 혐오 표현이 숨어있지는 않은지 꼼꼼히 점검해 보겠습니다. 모두가 존중받는 이야기를 위해!")
+
+    result = await hate_bias_agent.arun(
+        state.get("split_text"),
+        incremental=incremental_input(state.get("incremental"), "hate_bias"),
+    )
+    return _finish_hate_bias(result, logs)
@@ -8,19 +8,37 @@ logger = logging.getLogger(__name__)
 
 persona_feedback_agent = PersonaFeedbackAgent()
 
+def _reader_persona(state: AgentState) -> dict | None:
+    if state.get("reader_persona"):
+        return state["reader_persona"].get("persona")
+    return None
+
+
 @traceable_timed(name="persona_feedback")
 def persona_feedback_node(state: AgentState) -> AgentState:
     logger.info("독자 피드백: [START]")
-    persona = None
-    if state.get("reader_persona"):
-        persona = state["reader_persona"].get("persona")
-
     result = persona_feedback_agent.run(
-        persona=persona,
-        split_payload=state.get("split_text")
+        persona=_reader_persona(state),
+        split_payload=state.get("split_text"),
+        global_summary=state.get("global_summary"),
+    )
+    logger.info("독자 피드백: [END]")
+
+    return {
+        "persona_feedback": result.get("persona_feedback")
+    }
+
+
+@traceable_timed(name="persona_feedback")
+async def persona_feedback_node_async(state: AgentState) -> AgentState:
+    logger.info("독자 피드백: [START]")
+    result = await persona_feedback_agent.arun(
+        persona=_reader_persona(state),
+        split_payload=state.get("split_text"),
+        global_summary=state.get("global_summary"),
     )
     logger.info("독자 피드백: [END]")
 
     return {
         "persona_feedback": result.get("persona_feedback")
-    }
\ No newline at end of file
+    }
@@ -8,8 +8,7 @@ logger = logging.getLogger(__name__)
 # Note: FinalEvaluatorAgent might still be useful for overall metrics, keeping it optional if needed.
 # For now, we focus on aggregating direct scores from analysis agents.
 
-@traceable_timed(name="qa_scores")
-def qa_scores_node(state: AgentState) -> AgentState:
+def _qa_scores(state: AgentState) -> AgentState:
     logger.info("점수 집계: [START]")
     
     def get_score(result_key):
@@ -39,4 +38,15 @@ def qa_scores_node(state: AgentState) -> AgentState:
     return {
         "qa_scores": qa_scores,
         # "final_metric": final_metric, # If needed later
-    }
\ No newline at end of file
+    }
+
+
+@traceable_timed(name="qa_scores")
+def qa_scores_node(state: AgentState) -> AgentState:
+    return _qa_scores(state)
+
+
+@traceable_timed(name="qa_scores")
+async def qa_scores_node_async(state: AgentState) -> AgentState:
+    # LLM 호출 없는 결정론적 단계: 스레드 풀을 거치지 않고 이벤트 루프에서 바로 실행
+    return _qa_scores(state)
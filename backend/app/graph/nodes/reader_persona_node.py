@@ -8,10 +8,7 @@ logger = logging.getLogger(__name__)
 
 reader_persona_agent = ReaderPersonaAgent()
 
-@traceable_timed(name="reader_persona")
-def reader_persona_node(state: AgentState) -> AgentState:
-    logger.info("페르소나 설정: [START]")
-    
+def _build_agent_input(state: AgentState) -> dict:
     # Context 정제 및 본문 프리뷰 추가
     raw_context = state.get("context")
     clean_context = {}
@@ -48,8 +45,24 @@ def reader_persona_node(state: AgentState) -> AgentState:
         "user_persona": user_persona
     }
 
-    result = reader_persona_agent.run(agent_input)
+    return agent_input
+
+
+@traceable_timed(name="reader_persona")
+def reader_persona_node(state: AgentState) -> AgentState:
+    logger.info("페르소나 설정: [START]")
+    result = reader_persona_agent.run(_build_agent_input(state))
+    logger.info("페르소나 설정: [END]")
+    return {
+        "reader_persona": result
+    }
+
+
+@traceable_timed(name="reader_persona")
+async def reader_persona_node_async(state: AgentState) -> AgentState:
+    logger.info("페르소나 설정: [START]")
+    result = await reader_persona_agent.arun(_build_agent_input(state))
     logger.info("페르소나 설정: [END]")
     return {
         "reader_persona": result
-    }
\ No newline at end of file
+    }
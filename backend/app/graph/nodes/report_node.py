@@ -15,29 +15,47 @@ def extract_issues(result: dict | None):
         return []
     return result.get("issues", [])
 
-@traceable_timed(name="report")
-def report_node(state: AgentState) -> AgentState:
-    logger.info("리포트 생성: [START]")
-    logs = add_log("수석 편집자", "모든 전문가들의 의견이 도착했네요! 제가 작가님께 도움이 될 만한 핵심 내용들만 쏙쏙 뽑아서 리포트로 정리해 드릴게요.")
-    
+def _start_logs() -> list:
+    return add_log("수석 편집자", "모든 전문가들의 의견이 도착했네요! 제가 작가님께 도움이 될 만한 핵심 내용들만 쏙쏙 뽑아서 리포트로 정리해 드릴게요.")
+
+
+def _report_inputs(state: AgentState) -> dict:
     split_summary, split_sentences = extract_split_payload(state.get("split_text"))
-    report = report_agent.run(
-        split_text={
+    return {
+        "split_text": {
             "summary": split_summary,
             "sentences": split_sentences,
         },
-        tone_issues=extract_issues(state.get("tone_result")),
-        logic_issues=extract_issues(state.get("logic_result")),
-        trauma_issues=extract_issues(state.get("trauma_result")),
-        hate_issues=extract_issues(state.get("hate_bias_result")),
-        cliche_issues=extract_issues(state.get("genre_cliche_result")),
-        persona_feedback=state.get("persona_feedback"),
-    )
-    
+        "tone_issues": extract_issues(state.get("tone_result")),
+        "logic_issues": extract_issues(state.get("logic_result")),
+        "trauma_issues": extract_issues(state.get("trauma_result")),
+        "hate_issues": extract_issues(state.get("hate_bias_result")),
+        "cliche_issues": extract_issues(state.get("genre_cliche_result")),
+        "persona_feedback": state.get("persona_feedback"),
+    }
+
+
+def _finish_report(report: dict, logs: list) -> AgentState:
     logs += add_log("수석 편집자", "드디어 작가님만을 위한 맞춤 리포트가 완성되었습니다! 오른쪽 패널에서 바로 확인해 보실 수 있어요. 작가님의 멋진 집필 활동을 항상 응원합니다! ✨")
-    
+
     logger.info("리포트 생성: [END]")
     return {
         "final_report": report,
         "logs": logs
     }
+
+
+@traceable_timed(name="report")
+def report_node(state: AgentState) -> AgentState:
+    logger.info("리포트 생성: [START]")
+    logs = _start_logs()
+    report = report_agent.run(**_report_inputs(state))
+    return _finish_report(report, logs)
+
+
+@traceable_timed(name="report")
+async def report_node_async(state: AgentState) -> AgentState:
+    logger.info("리포트 생성: [START]")
+    logs = _start_logs()
+    report = await report_agent.arun(**_report_inputs(state))
+    return _finish_report(report, logs)
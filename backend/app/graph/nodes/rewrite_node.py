@@ -14,25 +14,40 @@ def extract_issues(result: dict | None):
         return []
     return result.get("issues", [])
 
-@traceable_timed(name="rewrite")
-def rewrite_node(state: AgentState) -> AgentState:
-    logger.info("수정 제안: [START]")
+def _rewrite_inputs(state: AgentState) -> dict:
     split_summary, split_sentences = extract_split_payload(state.get("split_text"))
     if not split_summary and split_sentences:
         split_summary = "\n".join(split_sentences[:5])
-    result = rewrite_agent.run(
-        original_text=state["original_text"],
-        split_text=split_summary,
-        decision_context=state["aggregated_result"],
-        tone_issues=extract_issues(state.get("tone_result")),
-        logic_issues=extract_issues(state.get("logic_result")),
-        trauma_issues=extract_issues(state.get("trauma_result")),
-        hate_issues=extract_issues(state.get("hate_bias_result")),
-        cliche_issues=extract_issues(state.get("genre_cliche_result")),
-        spelling_issues=extract_issues(state.get("spelling_result")),
-    )
+    return {
+        "original_text": state["original_text"],
+        "split_text": split_summary,
+        "decision_context": state["aggregated_result"],
+        "tone_issues": extract_issues(state.get("tone_result")),
+        "logic_issues": extract_issues(state.get("logic_result")),
+        "trauma_issues": extract_issues(state.get("trauma_result")),
+        "hate_issues": extract_issues(state.get("hate_bias_result")),
+        "cliche_issues": extract_issues(state.get("genre_cliche_result")),
+        "spelling_issues": extract_issues(state.get("spelling_result")),
+    }
+
+
+@traceable_timed(name="rewrite")
+def rewrite_node(state: AgentState) -> AgentState:
+    logger.info("수정 제안: [START]")
+    result = rewrite_agent.run(**_rewrite_inputs(state))
+    logger.info("수정 제안: [END]")
+
+    return {
+        "rewrite_guidelines": result
+    }
+
+
+@traceable_timed(name="rewrite")
+async def rewrite_node_async(state: AgentState) -> AgentState:
+    logger.info("수정 제안: [START]")
+    result = await rewrite_agent.arun(**_rewrite_inputs(state))
     logger.info("수정 제안: [END]")
 
     return {
         "rewrite_guidelines": result
-    }
\ No newline at end of file
+    }
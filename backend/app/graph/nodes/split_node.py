@@ -1,20 +1,49 @@
 # app/graph/nodes/split_node.py
+import asyncio
+
 from app.agents.tools.split import Splitter
 from app.graph.state import AgentState
 from app.observability.langsmith import traceable_timed
+from app.services.incremental_analysis import build_incremental_state
+from app.services.split_map import SplitPayload
 import logging
 
 logger = logging.getLogger(__name__)
 splitter = Splitter()
 
+def _to_update(result: SplitPayload, state: AgentState) -> AgentState:
+    # 문장/맵은 split_text(SplitPayload)에서 필요할 때 만든다 (상태에 사본을 두지 않음)
+    update: AgentState = {"split_text": result}
+
+    # 직전 분석 기준이 있으면 문장 해시 diff로 증분 분석 입력 생성
+    base = state.get("incremental_base")
+    if base is None:
+        return update
+    # 이후 체크포인트에 기준(이전 문장 해시)이 계속 실리지 않도록 비운다
+    update["incremental_base"] = None
+    incremental = build_incremental_state(base, result.get("split_sentences"))
+    if incremental:
+        logger.info(
+            f"텍스트 분할: 증분 분석 (unchanged {incremental['reused_sentences']}/{incremental['total_sentences']} sentences)"
+        )
+        update["incremental"] = incremental
+    return update
+
+
 @traceable_timed(name="split")
 def split_node(state: AgentState) -> AgentState:
     logger.info("텍스트 분할: [START]")
     result = splitter.run(state["original_text"])
     logger.info("텍스트 분할: [END]")
 
-    return {
-        "split_text": result,
-        "split_sentences": result.get("split_sentences"),
-        "split_map": result.get("split_map"),
-    }
+    return _to_update(result, state)
+
+
+@traceable_timed(name="split")
+async def split_node_async(state: AgentState) -> AgentState:
+    logger.info("텍스트 분할: [START]")
+    # CPU 작업이므로 긴 원고에서 이벤트 루프를 막지 않도록 워커 스레드에서 실행
+    result = await asyncio.to_thread(splitter.run, state["original_text"])
+    logger.info("텍스트 분할: [END]")
+
+    return _to_update(result, state)
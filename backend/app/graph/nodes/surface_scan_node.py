@@ -0,0 +1,55 @@
+from app.agents import SurfaceScanAgent
+from app.graph.state import AgentState
+from app.graph.nodes.utils import add_log
+from app.graph.nodes.trauma_node import _finish_trauma
+from app.graph.nodes.hate_bias_node import _finish_hate_bias
+from app.graph.nodes.spelling_node import _finish_spelling
+from app.observability.langsmith import traceable_timed
+from app.services.incremental_analysis import incremental_input
+import logging
+
+logger = logging.getLogger(__name__)
+
+surface_scan_agent = SurfaceScanAgent()
+
+_START_LOG = ("표면 검사팀", "안전, 윤리, 맞춤법을 한 번에 꼼꼼히 살펴볼게요. 같은 문장을 세 번 읽지 않아도 되도록 함께 점검합니다!")
+
+
+def _incremental_inputs(state: AgentState) -> dict:
+    incremental = state.get("incremental")
+    return {task: incremental_input(incremental, task) for task in SurfaceScanAgent.tasks}
+
+
+def _finish_surface_scan(results: dict, logs: list) -> AgentState:
+    """
+    통합 결과를 기존 세 노드의 상태 키/로그로 나눠 기록 (후속 노드는 fused 여부를 모른다)
+    """
+    update: AgentState = {"logs": logs}
+    for finish, key in (
+        (_finish_trauma, "trauma"),
+        (_finish_hate_bias, "hate_bias"),
+        (_finish_spelling, "spelling"),
+    ):
+        partial = finish(results[key], [])
+        update["logs"] += partial.pop("logs")
+        update.update(partial)
+    logger.info("표면 통합 검사: [END]")
+    return update
+
+
+@traceable_timed(name="surface_scan")
+def surface_scan_node(state: AgentState) -> AgentState:
+    logger.info("표면 통합 검사: [START]")
+    logs = add_log(*_START_LOG)
+
+    results = surface_scan_agent.run(state.get("split_text"), incremental=_incremental_inputs(state))
+    return _finish_surface_scan(results, logs)
+
+
+@traceable_timed(name="surface_scan")
+async def surface_scan_node_async(state: AgentState) -> AgentState:
+    logger.info("표면 통합 검사: [START]")
+    logs = add_log(*_START_LOG)
+
+    results = await surface_scan_agent.arun(state.get("split_text"), incremental=_incremental_inputs(state))
+    return _finish_surface_scan(results, logs)
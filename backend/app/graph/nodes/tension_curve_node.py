@@ -8,16 +8,7 @@ logger = logging.getLogger(__name__)
 
 tension_curve_agent = TensionCurveAgent()
 
-@traceable_timed(name="tension_curve")
-def tension_curve_node(state: AgentState) -> AgentState:
-    logger.info("긴장감 분석: [START]")
-    logs = add_log("긴장감 설계자", "이야기의 긴장감이 어떻게 요동치는지 분석해 볼게요. 독자들이 숨죽이고 읽을 만한 클라이맥스가 어디인지 찾아보겠습니다!")
-    
-    result = tension_curve_agent.run(
-        state.get("split_text"),
-        persona=state.get("reader_persona")
-    )
-    
+def _finish_tension_curve(result: dict, logs: list) -> AgentState:
     # 긴장도 곡선은 보통 curve 리스트를 반환함
     curve_points = len(result.get("curve", []))
     if curve_points > 0:
@@ -30,3 +21,29 @@ def tension_curve_node(state: AgentState) -> AgentState:
         "tension_curve_result": result,
         "logs": logs
     }
+
+
+@traceable_timed(name="tension_curve")
+def tension_curve_node(state: AgentState) -> AgentState:
+    logger.info("긴장감 분석: [START]")
+    logs = add_log("긴장감 설계자", "이야기의 긴장감이 어떻게 요동치는지 분석해 볼게요. 독자들이 숨죽이고 읽을 만한 클라이맥스가 어디인지 찾아보겠습니다!")
+
+    result = tension_curve_agent.run(
+        state.get("split_text"),
+        persona=state.get("reader_persona"),
+        global_summary=state.get("global_summary"),
+    )
+    return _finish_tension_curve(result, logs)
+
+
+@traceable_timed(name="tension_curve")
+async def tension_curve_node_async(state: AgentState) -> AgentState:
+    logger.info("긴장감 분석: [START]")
+    logs = add_log("긴장감 설계자", "이야기의 긴장감이 어떻게 요동치는지 분석해 볼게요. 독자들이 숨죽이고 읽을 만한 클라이맥스가 어디인지 찾아보겠습니다!")
+
+    result = await tension_curve_agent.arun(
+        state.get("split_text"),
+        persona=state.get("reader_persona"),
+        global_summary=state.get("global_summary"),
+    )
+    return _finish_tension_curve(result, logs)
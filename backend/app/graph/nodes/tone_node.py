@@ -8,17 +8,7 @@ logger = logging.getLogger(__name__)
 
 tone_agent = ToneEvaluatorAgent()
 
-@traceable_timed(name="tone")
-def tone_node(state: AgentState) -> AgentState:
-    logger.info("톤앤매너 분석: [START]")
-    logs = add_log("문체 전문가", "글의 분위기와 말투가 독자들에게 어떻게 전달될지 분석해 볼게요. 펜을 든 작가님의 마음을 느껴보겠습니다.")
-    
-    result = tone_agent.run(
-        state.get("split_text"),
-        global_summary=state.get("global_summary"),
-        persona=state.get("reader_persona")
-    )
-    
+def _finish_tone(result: dict, logs: list) -> AgentState:
     issue_count = len(result.get("issues", []))
     if issue_count > 0:
         logs += add_log("문체 전문가", f"작가님, 글의 톤을 조금 더 일관되게 다듬으면 좋을 지점을 {issue_count}군데 정도 찾았어요. 리포트를 참고해 주세요!")
@@ -30,3 +20,29 @@ def tone_node(state: AgentState) -> AgentState:
         "tone_result": result,
         "logs": logs
     }
+
+
+@traceable_timed(name="tone")
+def tone_node(state: AgentState) -> AgentState:
+    logger.info("톤앤매너 분석: [START]")
+    logs = add_log("문체 전문가", "글의 분위기와 말투가 독자들에게 어떻게 전달될지 분석해 볼게요. 펜을 든 작가님의 마음을 느껴보겠습니다.")
+
+    result = tone_agent.run(
+        state.get("split_text"),
+        global_summary=state.get("global_summary"),
+        persona=state.get("reader_persona")
+    )
+    return _finish_tone(result, logs)
+
+
+@traceable_timed(name="tone")
+async def tone_node_async(state: AgentState) -> AgentState:
+    logger.info("톤앤매너 분석: [START]")
+    logs = add_log("문체 전문가", "글의 분위기와 말투가 독자들에게 어떻게 전달될지 분석해 볼게요. 펜을 든 작가님의 마음을 느껴보겠습니다.")
+
+    result = await tone_agent.arun(
+        state.get("split_text"),
+        global_summary=state.get("global_summary"),
+        persona=state.get("reader_persona")
+    )
+    return _finish_tone(result, logs)
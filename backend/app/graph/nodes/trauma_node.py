@@ -2,21 +2,14 @@ from app.agents import TraumaAgent
 from app.graph.state import AgentState
 from app.graph.nodes.utils import add_log
 from app.observability.langsmith import traceable_timed
+from app.services.incremental_analysis import incremental_input
 import logging
 
 logger = logging.getLogger(__name__)
 
 trauma_agent = TraumaAgent()
 
-@traceable_timed(name="trauma")
-def trauma_node(state: AgentState) -> AgentState:
-    logger.info("트라우마 분석: [START]")
-    logs = add_log("안전 관리자", "혹시 독자들에게 상처가 될 만한 민감한 묘사가 있는지 조심스럽게 살펴볼게요. 안전이 제일이니까요!")
-    
-    result = trauma_agent.run(
-        state.get("split_text")
-    )
-    
+def _finish_trauma(result: dict, logs: list) -> AgentState:
     issue_count = len(result.get("issues", []))
     if issue_count > 0:
         logs += add_log("안전 관리자", f"작가님, 독자들이 조금 주의 깊게 읽어야 할 표현을 {issue_count}건 정도 발견했어요. 리포트에 조언을 담아두었습니다.")
@@ -28,3 +21,27 @@ def trauma_node(state: AgentState) -> AgentState:
         "trauma_result": result,
         "logs": logs
     }
+
+
+@traceable_timed(name="trauma")
+def trauma_node(state: AgentState) -> AgentState:
+    logger.info("트라우마 분석: [START]")
+    logs = add_log("안전 관리자", "혹시 독자들에게 상처가 될 만한 민감한 묘사가 있는지 조심스럽게 살펴볼게요. 안전이 제일이니까요!")
+
+    result = trauma_agent.run(
+        state.get("split_text"),
+        incremental=incremental_input(state.get("incremental"), "trauma"),
+    )
+    return _finish_trauma(result, logs)
+
+
+@traceable_timed(name="trauma")
+async def trauma_node_async(state: AgentState) -> AgentState:
+    logger.info("트라우마 분석: [START]")
+    logs = add_log("안전 관리자", "혹시 독자들에게 상처가 될 만한 민감한 묘사가 있는지 조심스럽게 살펴볼게요. 안전이 제일이니까요!")
+
+    result = await trauma_agent.arun(
+        state.get("split_text"),
+        incremental=incremental_input(state.get("incremental"), "trauma"),
+    )
+    return _finish_trauma(result, logs)
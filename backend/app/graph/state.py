@@ -1,6 +1,8 @@
 # app/graph/state.py
 from typing import TypedDict, Optional, Dict, Any, List, Union, Annotated
 
+from app.services.split_map import SplitPayload
+
 def merge_logs(left: Optional[List[Dict[str, Any]]], right: Optional[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
     if left is None: left = []
     if right is None: right = []
@@ -14,11 +16,13 @@ class AgentState(TypedDict, total=False):
     logs: Annotated[List[Dict[str, Any]], merge_logs]  # [{agent: str, message: str, type: str, timestamp: float}]
 
     # preprocessing
-    split_text: Optional[Union[List[str], Dict[str, Any], str]]
-    split_sentences: Optional[List[str]]
-    split_map: Optional[List[Dict[str, Any]]]
+    split_text: Optional[Union[SplitPayload, List[str], Dict[str, Any], str]]  # 문장/맵은 SplitPayload에서 지연 생성
     global_summary: Optional[str]
 
+    # incremental re-analysis
+    incremental_base: Optional[Dict[str, Any]]  # build_incremental_base() 결과 (split 노드가 소비 후 비움)
+    incremental: Optional[Dict[str, Any]]  # build_incremental_state() 결과
+
     # persona
     reader_persona: Optional[Dict[str, Any]]
     persona_feedback: Optional[Dict[str, Any]]
@@ -0,0 +1,234 @@
+"""
+LLM 응답 캐시 (content-addressed)
+
+- 키: (model, system, prompt, temperature) 의 SHA-256 해시
+- 동일 원고 재분석 / eval 재실행 시 LLM 호출을 건너뛰기 위함
+- 백엔드 교체 가능: ResponseCache 인터페이스를 구현해 set_response_cache()로 주입
+- 비동기 경로는 aget()/aset()을 사용한다 (SQLite 디스크 I/O/쓰기 락 대기를 이벤트 루프 밖에서 수행)
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from app.core.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+def make_cache_key(model: str, system: str | None, prompt: str, temperature: float) -> str:
+    payload = json.dumps(
+        {
+            "model": model,
+            "system": system or "",
+            "prompt": prompt,
+            "temperature": round(float(temperature), 4),
+        },
+        ensure_ascii=False,
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    응답 캐시 인터페이스 (기본 구현은 아무것도 저장하지 않음)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> str | None:
+        self._record(hit=False)
+        return None
+
+    def set(self, key: str, value: str) -> None:
+        return None
+
+    async def aget(self, key: str) -> str | None:
+        return self.get(key)
+
+    async def aset(self, key: str, value: str) -> None:
+        self.set(key, value)
+
+    def clear(self) -> None:
+        return None
+
+    def close(self) -> None:
+        return None
+
+    def _record(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "backend": self.__class__.__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+class SQLiteResponseCache(ResponseCache):
+    """
+    SQLite 파일 기반 응답 캐시
+
+    - TTL: created_at 기준으로 만료된 항목은 조회 시 삭제
+    - LRU: max_entries 초과 시 last_access가 가장 오래된 항목부터 제거
+    """
+
+    def __init__(self, path: str, ttl_seconds: int = 0, max_entries: int = 0):
+        super().__init__()
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS llm_response_cache (
+                key TEXT PRIMARY KEY,
+                response TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                hit_count INTEGER NOT NULL DEFAULT 0
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_llm_response_cache_last_access "
+            "ON llm_response_cache (last_access)"
+        )
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        return self.ttl_seconds > 0 and now - created_at > self.ttl_seconds
+
+    def get(self, key: str) -> str | None:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM llm_response_cache WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            response, created_at = row
+            if self._expired(created_at, now):
+                self._conn.execute("DELETE FROM llm_response_cache WHERE key = ?", (key,))
+                self.misses += 1
+                return None
+
+            self._conn.execute(
+                "UPDATE llm_response_cache SET last_access = ?, hit_count = hit_count + 1 WHERE key = ?",
+                (now, key),
+            )
+            self.hits += 1
+            return response
+
+    def set(self, key: str, value: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_response_cache (key, response, created_at, last_access, hit_count) "
+                "VALUES (?, ?, ?, ?, 0)",
+                (key, value, now, now),
+            )
+            self._evict(now)
+
+    async def aget(self, key: str) -> str | None:
+        return await asyncio.to_thread(self.get, key)
+
+    async def aset(self, key: str, value: str) -> None:
+        await asyncio.to_thread(self.set, key, value)
+
+    def _evict(self, now: float) -> None:
+        if self.ttl_seconds > 0:
+            cur = self._conn.execute(
+                "DELETE FROM llm_response_cache WHERE created_at < ?",
+                (now - self.ttl_seconds,),
+            )
+            self.evictions += max(cur.rowcount, 0)
+
+        if self.max_entries > 0:
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM llm_response_cache").fetchone()
+            overflow = count - self.max_entries
+            if overflow > 0:
+                cur = self._conn.execute(
+                    "DELETE FROM llm_response_cache WHERE key IN ("
+                    "SELECT key FROM llm_response_cache ORDER BY last_access ASC LIMIT ?)",
+                    (overflow,),
+                )
+                self.evictions += max(cur.rowcount, 0)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_response_cache")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def stats(self) -> dict:
+        data = super().stats()
+        with self._lock:
+            (entries,) = self._conn.execute("SELECT COUNT(*) FROM llm_response_cache").fetchone()
+        data.update({"entries": entries, "path": self.path})
+        return data
+
+
+# --------------------------------------------------
+# Process-wide cache
+# --------------------------------------------------
+_cache: ResponseCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    global _cache
+    if _cache is not None:
+        return _cache
+    with _cache_lock:
+        if _cache is None:
+            settings = get_settings()
+            if settings.llm_cache_enabled:
+                try:
+                    _cache = SQLiteResponseCache(
+                        settings.llm_cache_path,
+                        ttl_seconds=settings.llm_cache_ttl_seconds,
+                        max_entries=settings.llm_cache_max_entries,
+                    )
+                except Exception as e:
+                    logger.warning(f"LLM response cache disabled: {e}")
+                    _cache = ResponseCache()
+            else:
+                _cache = ResponseCache()
+    return _cache
+
+
+def set_response_cache(cache: ResponseCache | None) -> None:
+    """
+    캐시 백엔드 교체 (None이면 다음 호출 시 설정값으로 다시 생성)
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is not None and _cache is not cache:
+            _cache.close()
+        _cache = cache
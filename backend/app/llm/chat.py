@@ -1,38 +1,96 @@
-from app.llm.client import get_upstage_client
+import json
+import time
+from types import SimpleNamespace
+from typing import Any
+
+import openai
+
+from app.core.settings import get_settings
+from app.llm.client import get_async_upstage_client, get_upstage_client
+from app.llm.cache import get_response_cache, make_cache_key
+from app.llm.json_stream import IncrementalJSONParser, ItemSink, current_item_sink, get_path, parse_json_text
+from app.llm.retry import acall_with_retry, call_with_retry, request_timeout
+from app.llm.scheduler import estimate_tokens, get_llm_scheduler
+from app.observability.metrics import current_run_metrics
 from app.observability.langsmith import create_llm_run
 import logging
 
 logger = logging.getLogger(__name__)
 CHAT_MODEL = "solar-pro2"
 
-def chat(prompt: str, system: str | None = None, temperature: float = 0.2) -> str:
-    logger.info(f"[DEBUG] chat: Requesting chat completion. Prompt len: {len(prompt)}")
-    client = get_upstage_client()
+# 프로바이더가 response_format을 거부하면(400) 프로세스 동안 JSON 모드 없이 요청
+_json_mode_unsupported = False
+
+_CONTINUE_PROMPT = """직전 JSON 응답이 길이 제한으로 중간에 잘렸다.
+잘린 배열 경로: {path}
+이미 받은 항목 수: {count}
+이미 받은 마지막 항목:
+{last}
+
+위 마지막 항목 다음 항목부터 나머지만 아래 형식의 JSON으로 출력하라. 이미 받은 항목은 반복하지 마라.
+남은 항목이 없으면 빈 배열을 출력하라.
+{{"items": [ ... ]}}"""
+
+_CONTINUE_TAIL_PROMPT = """직전 JSON 응답이 길이 제한으로 중간에 잘렸고, 잘린 배열({path})의 나머지 항목은 이미 받았다.
+원래 응답에서 그 배열 뒤에 이어졌어야 할 나머지 키만, 최상위 객체부터 원래와 같은 구조의 JSON 객체 하나로 출력하라.
+이미 받은 키와 배열 항목은 반복하지 마라. 남은 키가 없으면 빈 객체를 출력하라.
+예: {{"trauma": {{"남은 키": ...}}, "다음 최상위 키": ...}}"""
+
 
+def _build_messages(prompt: str, system: str | None) -> list[dict]:
     messages = []
     if system:
         messages.append({"role": "system", "content": system})
     messages.append({"role": "user", "content": prompt})
+    return messages
+
+
+def _estimate_request_tokens(messages: list[dict]) -> int:
+    return estimate_tokens("".join(m["content"] for m in messages))
 
-    try:
-        res = client.chat.completions.create(
-            model=CHAT_MODEL,
-            messages=messages,
-            temperature=temperature,
-        )
-        logger.info("[DEBUG] chat: Chat completion request successful.")
-    except Exception as e:
-        logger.error(f"[DEBUG] chat: Chat completion request failed: {e}")
-        raise e
 
+def _total_tokens(res) -> int | None:
     usage = getattr(res, "usage", None)
-    usage_payload = None
-    if usage:
-        usage_payload = {
-            "prompt_tokens": getattr(usage, "prompt_tokens", None),
-            "completion_tokens": getattr(usage, "completion_tokens", None),
-            "total_tokens": getattr(usage, "total_tokens", None),
-        }
+    return getattr(usage, "total_tokens", None) if usage else None
+
+
+def _record_call(ok: bool, started: float) -> None:
+    metrics = current_run_metrics()
+    if metrics is not None:
+        # 재시도/대기를 포함한 호출 1건의 전체 시간
+        metrics.record_call(ok=ok, seconds=time.perf_counter() - started)
+
+
+def _record_cache_hit() -> None:
+    metrics = current_run_metrics()
+    if metrics is not None:
+        metrics.record_cache_hit()
+
+
+def _usage_payload(res) -> dict | None:
+    usage = getattr(res, "usage", None)
+    if not usage:
+        return None
+    # 프로바이더 프롬프트 캐시 적중 토큰 (OpenAI 호환 usage.prompt_tokens_details.cached_tokens)
+    details = getattr(usage, "prompt_tokens_details", None)
+    return {
+        "prompt_tokens": getattr(usage, "prompt_tokens", None),
+        "completion_tokens": getattr(usage, "completion_tokens", None),
+        "total_tokens": getattr(usage, "total_tokens", None),
+        "cached_tokens": getattr(details, "cached_tokens", None) if details else None,
+    }
+
+
+def _finish(res, messages: list[dict]) -> str:
+    usage_payload = _usage_payload(res)
+    metrics = current_run_metrics()
+    if metrics is not None and usage_payload:
+        metrics.record_usage(
+            usage_payload["prompt_tokens"],
+            usage_payload["completion_tokens"],
+            usage_payload["cached_tokens"],
+            model=CHAT_MODEL,
+        )
     create_llm_run(
         name="chat.completions",
         provider="upstage",
@@ -43,3 +101,510 @@ def chat(prompt: str, system: str | None = None, temperature: float = 0.2) -> st
     )
 
     return res.choices[0].message.content
+
+
+def _json_mode_enabled(json_mode: bool) -> bool:
+    return json_mode and get_settings().llm_json_mode and not _json_mode_unsupported
+
+
+def _request_kwargs(json_mode: bool) -> dict:
+    if _json_mode_enabled(json_mode):
+        return {"response_format": {"type": "json_object"}}
+    return {}
+
+
+def _disable_json_mode(exc: BaseException, json_mode: bool) -> bool:
+    """
+    response_format 미지원(400)이면 JSON 모드를 끄고 True (호출자가 한 번 다시 요청)
+    """
+    global _json_mode_unsupported
+    if not _json_mode_enabled(json_mode) or not isinstance(exc, openai.BadRequestError):
+        return False
+    logger.warning(f"[LLM] response_format rejected, falling back to plain JSON prompts: {exc}")
+    _json_mode_unsupported = True
+    return True
+
+
+def _complete(messages: list[dict], temperature: float, label: str, json_mode: bool = False):
+    started = time.perf_counter()
+    client = get_upstage_client()
+
+    def _attempt(deadline: float):
+        # 프로세스 전역 스케줄러: 동시성/RPS/TPM 예산 + 우선순위/공정 큐잉
+        with get_llm_scheduler().request_slot(_estimate_request_tokens(messages)) as ticket:
+            res = client.chat.completions.create(
+                model=CHAT_MODEL,
+                messages=messages,
+                temperature=temperature,
+                timeout=request_timeout(deadline),
+                **_request_kwargs(json_mode),
+            )
+            ticket.total_tokens = _total_tokens(res)
+        return res
+
+    try:
+        # 일시적 오류(429/5xx/연결)는 백오프 후 재시도
+        res = call_with_retry(_attempt, label=label)
+        logger.info(f"[DEBUG] {label}: Chat completion request successful.")
+        _record_call(ok=True, started=started)
+    except Exception as e:
+        if _disable_json_mode(e, json_mode):
+            return _complete(messages, temperature, label, json_mode=False)
+        logger.error(f"[DEBUG] {label}: Chat completion request failed: {e}")
+        _record_call(ok=False, started=started)
+        raise e
+    return res
+
+
+async def _acomplete(messages: list[dict], temperature: float, label: str, json_mode: bool = False):
+    started = time.perf_counter()
+    client = get_async_upstage_client()
+
+    async def _attempt(deadline: float):
+        async with get_llm_scheduler().arequest_slot(_estimate_request_tokens(messages)) as ticket:
+            res = await client.chat.completions.create(
+                model=CHAT_MODEL,
+                messages=messages,
+                temperature=temperature,
+                timeout=request_timeout(deadline),
+                **_request_kwargs(json_mode),
+            )
+            ticket.total_tokens = _total_tokens(res)
+        return res
+
+    try:
+        # 재시도 + (설정 시) 꼬리 지연 헤지 요청
+        res = await acall_with_retry(_attempt, label=label)
+        logger.info(f"[DEBUG] {label}: Chat completion request successful.")
+        _record_call(ok=True, started=started)
+    except Exception as e:
+        if _disable_json_mode(e, json_mode):
+            return await _acomplete(messages, temperature, label, json_mode=False)
+        logger.error(f"[DEBUG] {label}: Chat completion request failed: {e}")
+        _record_call(ok=False, started=started)
+        raise e
+    return res
+
+
+def chat(
+    prompt: str,
+    system: str | None = None,
+    temperature: float = 0.2,
+    use_cache: bool = True,
+) -> str:
+    logger.info(f"[DEBUG] chat: Requesting chat completion. Prompt len: {len(prompt)}")
+    cache = get_response_cache() if use_cache else None
+    cache_key = make_cache_key(CHAT_MODEL, system, prompt, temperature)
+    if cache is not None:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            logger.info("[DEBUG] chat: Response cache hit.")
+            _record_cache_hit()
+            return cached
+
+    messages = _build_messages(prompt, system)
+    res = _complete(messages, temperature, "chat")
+
+    content = _finish(res, messages)
+    if cache is not None and content:
+        cache.set(cache_key, content)
+    return content
+
+
+async def achat(
+    prompt: str,
+    system: str | None = None,
+    temperature: float = 0.2,
+    use_cache: bool = True,
+) -> str:
+    """
+    chat()의 비동기 버전. 프로세스 전역 AsyncOpenAI 커넥션 풀을 공유한다.
+    """
+    logger.info(f"[DEBUG] achat: Requesting chat completion. Prompt len: {len(prompt)}")
+    cache = get_response_cache() if use_cache else None
+    cache_key = make_cache_key(CHAT_MODEL, system, prompt, temperature)
+    if cache is not None:
+        cached = await cache.aget(cache_key)
+        if cached is not None:
+            logger.info("[DEBUG] achat: Response cache hit.")
+            _record_cache_hit()
+            return cached
+
+    messages = _build_messages(prompt, system)
+    res = await _acomplete(messages, temperature, "achat")
+
+    content = _finish(res, messages)
+    if cache is not None and content:
+        await cache.aset(cache_key, content)
+    return content
+
+
+# --------------------------------------------------
+# JSON 응답 (JSON 모드 + 증분 파서 + 잘린 꼬리 이어받기)
+# --------------------------------------------------
+def _degraded(content: str, note: str) -> dict:
+    return {"issues": [], "note": note, "_raw": (content or "")[:300]}
+
+
+def _json_cache_key(system: str | None, prompt: str, temperature: float) -> str:
+    # 문자열 응답(chat)과 파싱된 JSON 응답은 따로 캐시
+    return make_cache_key(f"{CHAT_MODEL}:json", system, prompt, temperature)
+
+
+def _continuation_messages(messages: list[dict], content: str, path: list[str], items: list) -> list[dict]:
+    last = json.dumps(items[-1], ensure_ascii=False) if items else "(없음)"
+    prompt = _CONTINUE_PROMPT.format(path=".".join(path) or "(최상위)", count=len(items), last=last)
+    return messages + [
+        {"role": "assistant", "content": content},
+        {"role": "user", "content": prompt},
+    ]
+
+
+def _tail_messages(messages: list[dict], content: str, path: list[str]) -> list[dict]:
+    prompt = _CONTINUE_TAIL_PROMPT.format(path=".".join(path))
+    return messages + [
+        {"role": "assistant", "content": content},
+        {"role": "user", "content": prompt},
+    ]
+
+
+def _merge_missing(target: dict, tail: dict, path: list[str], added: list) -> None:
+    # 이미 받은 키는 덮어쓰지 않고, 빠진 키만 채운다 (새로 채운 배열 항목은 added에 (경로, 항목)으로)
+    for key, value in tail.items():
+        if key not in target:
+            target[key] = value
+            _collect_items(value, path + [key], added)
+        elif isinstance(target[key], dict) and isinstance(value, dict):
+            _merge_missing(target[key], value, path + [key], added)
+
+
+def _collect_items(value: Any, path: list[str], added: list) -> None:
+    if isinstance(value, list):
+        added.extend((path, item) for item in value if isinstance(item, dict))
+    elif isinstance(value, dict):
+        for key, child in value.items():
+            _collect_items(child, path + [key], added)
+
+
+class _JSONResult:
+    """
+    응답 파싱 상태 (동기/비동기 경로 공용)
+
+    - feed()로 응답(또는 스트림 조각)을 증분 파서에 넣고, 항목 콜백(sink)이 있으면
+      배열 항목이 완결되는 즉시 전달한다 (재시도로 스트림을 다시 받으면 이미 보낸 항목은 건너뜀)
+    - 잘린 배열이 있으면 continuation()이 이어받기 요청 메시지를 돌려주고,
+      extend()가 그 응답의 items를 해당 배열 뒤에 붙인다
+    - 잘린 배열이 최상위 객체 바로 아래가 아니면(예: trauma.issues) 바깥 객체의 나머지 키가
+      빠졌으므로, 한 번 더 나머지 키(tail)를 요청해 채운다. 그 전까지는 완결로 보지 않는다
+      (잘린 결과는 _truncated로 표시되고 캐시하지 않는다)
+    """
+
+    def __init__(self, sink: ItemSink | None = None):
+        self.sink = sink
+        self.emitted = 0
+        self.continued = 0
+        self.content = ""
+        self.value: Any = None
+        self.complete = False
+        self.path: list[str] | None = None
+        self.tail_pending = False
+        self.begin()
+
+    def begin(self) -> None:
+        # 요청 시도마다 새 파서 (스트리밍 재시도 시 처음부터 다시 읽음)
+        self.parser = IncrementalJSONParser(track_items=self.sink is not None)
+        self.seen = 0
+
+    def feed(self, chunk: str | None) -> None:
+        for path, item in self.parser.feed(chunk or ""):
+            self.seen += 1
+            if self.seen > self.emitted:
+                self.emitted = self.seen
+                self._emit(path, item)
+
+    def close(self) -> None:
+        self.content = self.parser.text
+        try:
+            self.value = self.parser.result()
+        except json.JSONDecodeError:
+            self.value = None
+        self.complete = self.parser.complete
+        self.path = self.parser.truncated_path()
+
+    def _emit(self, path: list[str], item: Any) -> None:
+        try:
+            self.sink(path, item)
+        except Exception as e:
+            logger.warning(f"[LLM] JSON item sink failed: {e}")
+
+    def continuation(self, messages: list[dict]) -> list[dict] | None:
+        if self.complete or self.path is None or not isinstance(self.value, dict):
+            return None
+        if self.continued >= get_settings().llm_json_max_continuations:
+            return None
+        if self.tail_pending:
+            return _tail_messages(messages, self.content, self.path)
+        items = get_path(self.value, self.path)
+        if not isinstance(items, list):
+            return None
+        return _continuation_messages(messages, self.content, self.path, items)
+
+    def extend(self, tail_content: str) -> None:
+        self.continued += 1
+        metrics = current_run_metrics()
+        if metrics is not None:
+            metrics.record_json_continuation()
+        tail, tail_complete, tail_path = parse_json_text(tail_content)
+        if self.tail_pending:
+            self._merge_tail(tail, tail_complete)
+            return
+        items = tail.get("items") if isinstance(tail, dict) else None
+        if not isinstance(items, list):
+            self.path = None
+            return
+        get_path(self.value, self.path).extend(items)
+        if self.sink is not None:
+            for item in items:
+                if isinstance(item, dict):
+                    self._emit(self.path, item)
+        if not tail_complete:
+            # 꼬리도 잘렸으면 같은 배열에 대해 한 번 더 이어받을 수 있다
+            if tail_path != ["items"]:
+                self.path = None
+            return
+        if len(self.path) == 1:
+            # 잘린 배열이 최상위 객체에서 마지막으로 열린 컨테이너
+            self.complete = True
+        else:
+            self.tail_pending = True
+
+    def _merge_tail(self, tail: Any, tail_complete: bool) -> None:
+        self.tail_pending = False
+        if not isinstance(tail, dict) or not tail_complete:
+            self.path = None
+            return
+        added: list = []
+        _merge_missing(self.value, tail, [], added)
+        if self.sink is not None:
+            for path, item in added:
+                self._emit(path, item)
+        self.complete = True
+
+    def result(self) -> dict:
+        metrics = current_run_metrics()
+        if not self.complete and metrics is not None:
+            metrics.record_json_truncation()
+        if self.value is None:
+            if "{" not in (self.content or ""):
+                return _degraded(self.content, "LLM output did not contain JSON block")
+            return _degraded(self.content, "JSON decode failed, degraded safely")
+        if not isinstance(self.value, dict):
+            return _degraded(self.content, "LLM output was not a JSON object")
+        if not self.complete:
+            logger.warning(
+                f"[LLM] JSON output truncated; salvaged partial result (continuations={self.continued})"
+            )
+            self.value["_truncated"] = True
+        return self.value
+
+
+def _stream_kwargs() -> dict:
+    return {"stream": True, "stream_options": {"include_usage": True}}
+
+
+class _StreamedResponse:
+    """
+    스트림 조각을 모은 응답 (_finish/_total_tokens가 일반 응답과 같은 방식으로 읽도록)
+    """
+
+    def __init__(self):
+        self._parts: list[str] = []
+        self.usage = None
+        self.finish_reason = None
+
+    def add(self, chunk) -> str | None:
+        if getattr(chunk, "usage", None):
+            self.usage = chunk.usage
+        if not chunk.choices:
+            return None
+        choice = chunk.choices[0]
+        if choice.finish_reason:
+            self.finish_reason = choice.finish_reason
+        delta = getattr(choice.delta, "content", None)
+        if delta:
+            self._parts.append(delta)
+        return delta
+
+    @property
+    def choices(self):
+        message = SimpleNamespace(role="assistant", content="".join(self._parts))
+        return [SimpleNamespace(message=message, finish_reason=self.finish_reason)]
+
+
+def _complete_stream(messages: list[dict], temperature: float, label: str, parsed: _JSONResult):
+    """
+    _complete()의 스트리밍 버전: 조각이 도착하는 대로 parsed에 넣는다
+
+    스케줄러 슬롯은 스트림을 다 읽을 때까지 유지한다 (동시 요청 수 제한 유지).
+    """
+    started = time.perf_counter()
+    client = get_upstage_client()
+
+    def _attempt(deadline: float):
+        parsed.begin()
+        with get_llm_scheduler().request_slot(_estimate_request_tokens(messages)) as ticket:
+            stream = client.chat.completions.create(
+                model=CHAT_MODEL,
+                messages=messages,
+                temperature=temperature,
+                timeout=request_timeout(deadline),
+                **_request_kwargs(True),
+                **_stream_kwargs(),
+            )
+            res = _StreamedResponse()
+            for chunk in stream:
+                parsed.feed(res.add(chunk))
+            ticket.total_tokens = _total_tokens(res)
+        return res
+
+    try:
+        res = call_with_retry(_attempt, label=label)
+        logger.info(f"[DEBUG] {label}: Streamed chat completion successful.")
+        _record_call(ok=True, started=started)
+    except Exception as e:
+        if _disable_json_mode(e, True):
+            return _complete_stream(messages, temperature, label, parsed)
+        logger.error(f"[DEBUG] {label}: Streamed chat completion failed: {e}")
+        _record_call(ok=False, started=started)
+        raise e
+    return res
+
+
+async def _acomplete_stream(messages: list[dict], temperature: float, label: str, parsed: _JSONResult):
+    started = time.perf_counter()
+    client = get_async_upstage_client()
+
+    async def _attempt(deadline: float):
+        parsed.begin()
+        async with get_llm_scheduler().arequest_slot(_estimate_request_tokens(messages)) as ticket:
+            stream = await client.chat.completions.create(
+                model=CHAT_MODEL,
+                messages=messages,
+                temperature=temperature,
+                timeout=request_timeout(deadline),
+                **_request_kwargs(True),
+                **_stream_kwargs(),
+            )
+            res = _StreamedResponse()
+            async for chunk in stream:
+                parsed.feed(res.add(chunk))
+            ticket.total_tokens = _total_tokens(res)
+        return res
+
+    try:
+        # 헤지 요청은 두 스트림이 같은 파서에 섞이므로 사용하지 않는다
+        res = await acall_with_retry(_attempt, label=label, hedge=False)
+        logger.info(f"[DEBUG] {label}: Streamed chat completion successful.")
+        _record_call(ok=True, started=started)
+    except Exception as e:
+        if _disable_json_mode(e, True):
+            return await _acomplete_stream(messages, temperature, label, parsed)
+        logger.error(f"[DEBUG] {label}: Streamed chat completion failed: {e}")
+        _record_call(ok=False, started=started)
+        raise e
+    return res
+
+
+def _cached_json(cached: str, sink: ItemSink | None) -> dict:
+    # 캐시 적중이어도 스트리밍 중이면 항목 이벤트를 같은 방식으로 보낸다
+    if sink is None:
+        return json.loads(cached)
+    parsed = _JSONResult(sink)
+    parsed.feed(cached)
+    parsed.close()
+    return parsed.value
+
+
+def chat_json(
+    prompt: str,
+    system: str | None = None,
+    temperature: float = 0.2,
+    use_cache: bool = True,
+) -> dict:
+    """
+    JSON 객체 응답 전용 chat()
+
+    - 지원 시 response_format(JSON 모드)으로 요청
+    - 응답을 증분 파서로 읽어, 잘린 경우 완결된 항목까지 살리고
+      잘린 배열의 나머지 꼬리만 이어받기 요청으로 받아 붙인다 (전체 재실행 없음)
+    - 항목 콜백(json_stream.item_sink_scope)이 설정돼 있으면 응답을 스트리밍으로 받아
+      배열 항목이 완결되는 즉시 콜백에 전달한다
+    - JSON을 전혀 얻지 못하면 {"issues": [], "note": ...} 형태로 안전하게 반환
+    """
+    logger.info(f"[DEBUG] chat_json: Requesting chat completion. Prompt len: {len(prompt)}")
+    sink = current_item_sink()
+    cache = get_response_cache() if use_cache else None
+    cache_key = _json_cache_key(system, prompt, temperature)
+    if cache is not None:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            logger.info("[DEBUG] chat_json: Response cache hit.")
+            _record_cache_hit()
+            return _cached_json(cached, sink)
+
+    messages = _build_messages(prompt, system)
+    parsed = _JSONResult(sink)
+    if sink is not None:
+        res = _complete_stream(messages, temperature, "chat_json", parsed)
+        _finish(res, messages)
+    else:
+        res = _complete(messages, temperature, "chat_json", json_mode=True)
+        parsed.feed(_finish(res, messages))
+    parsed.close()
+    while (follow_up := parsed.continuation(messages)) is not None:
+        res = _complete(follow_up, temperature, "chat_json", json_mode=True)
+        parsed.extend(_finish(res, follow_up))
+
+    result = parsed.result()
+    if cache is not None and parsed.complete and isinstance(parsed.value, dict):
+        cache.set(cache_key, json.dumps(result, ensure_ascii=False))
+    return result
+
+
+async def achat_json(
+    prompt: str,
+    system: str | None = None,
+    temperature: float = 0.2,
+    use_cache: bool = True,
+) -> dict:
+    """
+    chat_json()의 비동기 버전
+    """
+    logger.info(f"[DEBUG] achat_json: Requesting chat completion. Prompt len: {len(prompt)}")
+    sink = current_item_sink()
+    cache = get_response_cache() if use_cache else None
+    cache_key = _json_cache_key(system, prompt, temperature)
+    if cache is not None:
+        cached = await cache.aget(cache_key)
+        if cached is not None:
+            logger.info("[DEBUG] achat_json: Response cache hit.")
+            _record_cache_hit()
+            return _cached_json(cached, sink)
+
+    messages = _build_messages(prompt, system)
+    parsed = _JSONResult(sink)
+    if sink is not None:
+        res = await _acomplete_stream(messages, temperature, "achat_json", parsed)
+        _finish(res, messages)
+    else:
+        res = await _acomplete(messages, temperature, "achat_json", json_mode=True)
+        parsed.feed(_finish(res, messages))
+    parsed.close()
+    while (follow_up := parsed.continuation(messages)) is not None:
+        res = await _acomplete(follow_up, temperature, "achat_json", json_mode=True)
+        parsed.extend(_finish(res, follow_up))
+
+    result = parsed.result()
+    if cache is not None and parsed.complete and isinstance(parsed.value, dict):
+        await cache.aset(cache_key, json.dumps(result, ensure_ascii=False))
+    return result
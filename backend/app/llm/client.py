@@ -1,5 +1,10 @@
+import asyncio
 import os
-from openai import OpenAI
+import threading
+import weakref
+
+import httpx
+from openai import AsyncOpenAI, OpenAI
 from app.core.settings import get_settings
 
 _PLACEHOLDER_KEYS = {
@@ -10,6 +15,16 @@ _PLACEHOLDER_KEYS = {
     "change_me",
 }
 
+# 프로세스 전역으로 공유하는 클라이언트 (매 호출마다 TLS/커넥션을 새로 맺지 않도록)
+_client_lock = threading.Lock()
+_sync_client: OpenAI | None = None
+_sync_client_key: tuple[str, str] | None = None
+
+# httpx.AsyncClient의 커넥션 풀은 이벤트 루프에 묶이므로 루프별로 하나씩 유지한다.
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, tuple[tuple[str, str], AsyncOpenAI]]" = (
+    weakref.WeakKeyDictionary()
+)
+
 
 def resolve_upstage_api_key() -> str | None:
     key = os.getenv("UPSTAGE_API_KEY")
@@ -28,13 +43,85 @@ def resolve_upstage_api_key() -> str | None:
 def has_upstage_api_key() -> bool:
     return resolve_upstage_api_key() is not None
 
-def get_upstage_client() -> OpenAI:
+
+def _client_key() -> tuple[str, str]:
     api_key = resolve_upstage_api_key()
     if not api_key:
         raise RuntimeError("UPSTAGE_API_KEY is not set")
+    settings = get_settings()
+    return api_key, settings.upstage_base_url or "https://api.upstage.ai/v1"
 
+
+def _pool_limits() -> httpx.Limits:
     settings = get_settings()
-    return OpenAI(
-        api_key=api_key,
-        base_url=settings.upstage_base_url or "https://api.upstage.ai/v1",
+    return httpx.Limits(
+        max_connections=settings.llm_max_connections,
+        max_keepalive_connections=settings.llm_max_keepalive_connections,
+        keepalive_expiry=settings.llm_keepalive_expiry,
     )
+
+
+def _pool_timeout() -> httpx.Timeout:
+    return httpx.Timeout(get_settings().llm_timeout_seconds, connect=10.0)
+
+
+def get_upstage_client() -> OpenAI:
+    """
+    동기 OpenAI 호환 클라이언트 (프로세스 전역 커넥션 풀 공유)
+    """
+    global _sync_client, _sync_client_key
+    key = _client_key()
+    with _client_lock:
+        if _sync_client is None or _sync_client_key != key:
+            if _sync_client is not None:
+                _sync_client.close()
+            api_key, base_url = key
+            _sync_client = OpenAI(
+                api_key=api_key,
+                base_url=base_url,
+                max_retries=0,  # 재시도는 app.llm.retry가 담당
+                http_client=httpx.Client(limits=_pool_limits(), timeout=_pool_timeout()),
+            )
+            _sync_client_key = key
+        return _sync_client
+
+
+def get_async_upstage_client() -> AsyncOpenAI:
+    """
+    비동기 OpenAI 호환 클라이언트 (현재 이벤트 루프 기준 커넥션 풀 공유)
+    """
+    loop = asyncio.get_running_loop()
+    key = _client_key()
+    with _client_lock:
+        cached = _async_clients.get(loop)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        api_key, base_url = key
+        client = AsyncOpenAI(
+            api_key=api_key,
+            base_url=base_url,
+            max_retries=0,  # 재시도는 app.llm.retry가 담당
+            http_client=httpx.AsyncClient(limits=_pool_limits(), timeout=_pool_timeout()),
+        )
+        _async_clients[loop] = (key, client)
+    if cached is not None:
+        # 키/엔드포인트가 바뀐 경우 이전 풀은 백그라운드에서 정리
+        loop.create_task(cached[1].close())
+    return client
+
+
+async def close_upstage_clients() -> None:
+    """
+    애플리케이션 종료 시 공유 커넥션 풀 정리
+    """
+    global _sync_client, _sync_client_key
+    loop = asyncio.get_running_loop()
+    with _client_lock:
+        cached = _async_clients.pop(loop, None)
+        sync_client = _sync_client
+        _sync_client = None
+        _sync_client_key = None
+    if cached is not None:
+        await cached[1].close()
+    if sync_client is not None:
+        sync_client.close()
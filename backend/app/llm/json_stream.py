@@ -0,0 +1,228 @@
+"""
+증분(스트리밍) JSON 파서
+
+LLM 응답을 조각 단위로 feed()하면서 구조(중괄호/대괄호/문자열)를 한 번만 훑고,
+"여기서 잘라 닫으면 유효한 JSON"인 마지막 지점을 계속 기록한다.
+
+- 응답이 max_tokens 등으로 중간에 잘려도 완결된 항목까지는 살린다 (salvage)
+- 배열 안의 객체(이슈 1건)는 원자 단위로 취급해 필드가 일부만 있는 항목은 버린다
+- 잘린 배열의 경로(예: ["issues"], ["trauma", "issues"])를 알려줘
+  이어받기(continuation) 요청이 나머지 꼬리만 다시 받을 수 있게 한다
+- JSON 앞뒤의 설명/코드펜스는 무시한다 (첫 '{'부터 최상위 객체가 닫힐 때까지)
+- track_items=True면 배열 항목(객체)이 닫히는 즉시 (경로, 항목)을 돌려준다 (스트리밍 이벤트용)
+"""
+import contextvars
+import json
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, List, Tuple
+
+ItemSink = Callable[[List[str], Any], None]
+
+# 완결된 배열 항목을 받을 콜백 (설정돼 있으면 chat_json이 응답을 스트리밍으로 받는다)
+_item_sink: contextvars.ContextVar[ItemSink | None] = contextvars.ContextVar("json_item_sink", default=None)
+
+_CLOSERS = {"{": "}", "[": "]"}
+
+
+class _Frame:
+    __slots__ = ("closer", "atomic", "key", "expect_key", "start")
+
+    def __init__(self, closer: str, atomic: bool, start: int):
+        self.closer = closer
+        self.start = start
+        # 배열 원소인 객체: 중간에서 자르면 불완전한 항목이 되므로 내부 지점은 안전하지 않다
+        self.atomic = atomic
+        self.key: str | None = None
+        self.expect_key = closer == "}"
+
+
+class IncrementalJSONParser:
+    """
+    feed(chunk)로 텍스트를 이어붙이며 파싱 상태를 갱신한다 (이미 본 글자는 다시 보지 않음)
+
+    - complete: 최상위 값이 닫혔는지
+    - result(): 완결된 값, 아니면 마지막 안전 지점까지 잘라 닫은 값 (없으면 None)
+    - truncated_path(): 잘린 지점을 감싸는 가장 안쪽 (원자 아닌) 배열의 키 경로
+    """
+
+    def __init__(self, track_items: bool = False):
+        self._track_items = track_items
+        self._text = ""
+        self._pos = 0
+        self._start: int | None = None
+        self._end: int | None = None
+        self._stack: List[_Frame] = []
+        self._atomic_depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        # (자를 위치, 닫을 문자열)
+        self._safe: Tuple[int, str] | None = None
+
+    @property
+    def complete(self) -> bool:
+        return self._end is not None
+
+    @property
+    def text(self) -> str:
+        return self._text
+
+    def feed(self, chunk: str) -> List[Tuple[List[str], Any]]:
+        """
+        chunk를 이어 파싱하고, 이번 조각에서 완결된 배열 항목 [(경로, 항목), ...]을 반환 (track_items일 때만)
+        """
+        items: List[Tuple[List[str], Any]] = []
+        if not chunk or self._end is not None:
+            return items
+        self._text += chunk
+        text = self._text
+        i = self._pos
+        n = len(text)
+        stack = self._stack
+
+        while i < n:
+            ch = text[i]
+
+            if self._start is None:
+                # 에이전트 응답은 항상 객체 ('[참고]' 같은 설명 속 대괄호는 건너뜀)
+                if ch == "{":
+                    self._start = i
+                    self._open(ch, i)
+                i += 1
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    top = stack[-1]
+                    if top.closer == "}" and top.expect_key:
+                        try:
+                            top.key = json.loads(text[self._string_start:i + 1])
+                        except json.JSONDecodeError:
+                            top.key = None
+                i += 1
+                continue
+
+            if ch == '"':
+                self._in_string = True
+                self._string_start = i
+            elif ch in _CLOSERS:
+                self._open(ch, i)
+            elif ch == "}" or ch == "]":
+                frame = stack.pop()
+                if frame.atomic:
+                    self._atomic_depth -= 1
+                    if self._track_items and not self._atomic_depth:
+                        self._collect_item(frame, i, items)
+                if not stack:
+                    self._end = i + 1
+                    self._pos = i + 1
+                    return items
+                self._mark_safe(i + 1)
+            elif ch == ",":
+                if stack[-1].closer == "}":
+                    stack[-1].expect_key = True
+                self._mark_safe(i)
+            elif ch == ":":
+                stack[-1].expect_key = False
+            i += 1
+
+        self._pos = n
+        return items
+
+    def _collect_item(self, frame: _Frame, i: int, items: list) -> None:
+        path = self._key_path()
+        if path is None:
+            return
+        try:
+            items.append((path, json.loads(self._text[frame.start:i + 1])))
+        except json.JSONDecodeError:
+            pass
+
+    def _open(self, ch: str, i: int) -> None:
+        parent = self._stack[-1] if self._stack else None
+        atomic = ch == "{" and parent is not None and parent.closer == "]"
+        self._stack.append(_Frame(_CLOSERS[ch], atomic, i))
+        if atomic:
+            self._atomic_depth += 1
+        # 객체 값/최상위로 열린 컨테이너는 빈 채로 닫아도 유효
+        if not atomic:
+            self._mark_safe(i + 1)
+
+    def _mark_safe(self, cut: int) -> None:
+        if self._atomic_depth:
+            return
+        closers = "".join(frame.closer for frame in reversed(self._stack))
+        self._safe = (cut, closers)
+
+    def result(self) -> Any:
+        if self._start is None:
+            return None
+        if self._end is not None:
+            return json.loads(self._text[self._start:self._end])
+        if self._safe is None:
+            return None
+        cut, closers = self._safe
+        head = self._text[self._start:cut].rstrip()
+        if head.endswith(","):
+            head = head[:-1]
+        return json.loads(head + closers)
+
+    def truncated_path(self) -> List[str] | None:
+        """
+        잘린 지점을 감싸는 배열의 경로 (이어받기 대상). 완결됐거나 키 경로로 표현할 수 없으면 None
+        """
+        if self._end is not None or not self._stack:
+            return None
+        return self._key_path()
+
+    def _key_path(self) -> List[str] | None:
+        # 최상위부터 첫 배열까지의 객체 키 경로 (중간에 원자 프레임/키 없는 값이 있으면 None)
+        path: List[str] = []
+        for frame in self._stack:
+            if frame.atomic:
+                return None
+            if frame.closer == "]":
+                return path
+            if frame.key is None:
+                return None
+            path.append(frame.key)
+        return None
+
+
+def parse_json_text(text: str) -> Tuple[Any, bool, List[str] | None]:
+    """
+    텍스트 한 덩어리 파싱 -> (값 | None, 완결 여부, 잘린 배열 경로)
+    """
+    parser = IncrementalJSONParser()
+    parser.feed(text or "")
+    try:
+        value = parser.result()
+    except json.JSONDecodeError:
+        value = None
+    return value, parser.complete, parser.truncated_path()
+
+
+def get_path(value: Any, path: List[str]) -> Any:
+    for key in path:
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+@contextmanager
+def item_sink_scope(sink: ItemSink | None) -> Iterator[None]:
+    token = _item_sink.set(sink)
+    try:
+        yield
+    finally:
+        _item_sink.reset(token)
+
+
+def current_item_sink() -> ItemSink | None:
+    return _item_sink.get()
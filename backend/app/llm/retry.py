@@ -0,0 +1,191 @@
+"""
+LLM 호출 재시도 / 데드라인 / 헤지(hedged) 요청
+
+- 일시적 오류(429, 408/409, 5xx, 연결/타임아웃)만 재시도
+- 지수 백오프 + full jitter, 서버가 Retry-After를 주면 그 값을 우선
+- 호출 단위 데드라인: 재시도를 포함한 전체 시간이 llm_call_deadline_seconds를 넘지 않음
+- 헤지 요청(비동기 전용): 첫 요청이 llm_hedge_after_seconds 안에 끝나지 않으면
+  같은 요청을 하나 더 보내 먼저 끝난 쪽을 사용
+- 재시도/헤지는 현재 분석의 RunMetrics에 기록
+"""
+import asyncio
+import logging
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, TypeVar
+
+import openai
+
+from app.core.settings import get_settings
+from app.llm.scheduler import get_llm_scheduler
+from app.observability.metrics import current_run_metrics
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_RETRYABLE_STATUS = {408, 409, 429}
+
+
+class LLMDeadlineExceeded(TimeoutError):
+    """재시도를 포함한 LLM 호출이 데드라인을 넘김"""
+
+
+def _status_code(exc: BaseException) -> int | None:
+    return getattr(exc, "status_code", None)
+
+
+def is_retryable(exc: BaseException) -> bool:
+    if isinstance(exc, (openai.APIConnectionError, openai.APITimeoutError)):
+        return True
+    status = _status_code(exc)
+    if status is None:
+        return False
+    return status in _RETRYABLE_STATUS or status >= 500
+
+
+def retry_reason(exc: BaseException) -> str:
+    status = _status_code(exc)
+    if status is not None:
+        return str(status)
+    if isinstance(exc, openai.APITimeoutError):
+        return "timeout"
+    if isinstance(exc, openai.APIConnectionError):
+        return "connection"
+    return exc.__class__.__name__
+
+
+def retry_after_seconds(exc: BaseException) -> float | None:
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return max(0.0, float(retry_after_ms) / 1000.0)
+        except ValueError:
+            pass
+
+    retry_after = headers.get("retry-after")
+    if not retry_after:
+        return None
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int, exc: BaseException) -> float:
+    settings = get_settings()
+    server_delay = retry_after_seconds(exc)
+    if server_delay is not None:
+        # 서버 지정값 + 약간의 jitter (동시에 깨어나는 요청이 몰리지 않도록)
+        return server_delay + random.uniform(0, settings.llm_retry_base_delay)
+    cap = min(settings.llm_retry_max_delay, settings.llm_retry_base_delay * (2 ** attempt))
+    return random.uniform(0, cap)
+
+
+def _on_retry(label: str, attempt: int, exc: BaseException, delay: float) -> None:
+    reason = retry_reason(exc)
+    logger.warning(f"[LLM] {label}: attempt {attempt + 1} failed ({reason}), retrying in {delay:.2f}s")
+    metrics = current_run_metrics()
+    if metrics is not None:
+        metrics.record_retry(reason, delay)
+    if _status_code(exc) == 429:
+        # 한도 초과는 프로세스 전체 문제이므로 스케줄러도 잠시 멈춘다
+        get_llm_scheduler().pause(retry_after_seconds(exc) or delay)
+
+
+def request_timeout(deadline: float) -> float:
+    """
+    데드라인까지 남은 시간 기준 요청 타임아웃 (스케줄러 대기 후 요청 직전에 호출)
+    """
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise LLMDeadlineExceeded("LLM call deadline exceeded")
+    return min(get_settings().llm_timeout_seconds, remaining)
+
+
+def call_with_retry(call: Callable[[float], T], label: str = "chat") -> T:
+    """
+    call(deadline)을 재시도 정책에 따라 실행 (동기)
+
+    deadline은 time.monotonic() 기준 절대 시각이며, call은 요청 직전에
+    request_timeout(deadline)으로 타임아웃을 정한다.
+    """
+    settings = get_settings()
+    deadline = time.monotonic() + settings.llm_call_deadline_seconds
+    attempt = 0
+    while True:
+        try:
+            return call(deadline)
+        except Exception as exc:
+            if not is_retryable(exc) or attempt >= settings.llm_max_retries:
+                raise
+            delay = backoff_delay(attempt, exc)
+            if time.monotonic() + delay >= deadline:
+                raise
+            _on_retry(label, attempt, exc, delay)
+            time.sleep(delay)
+            attempt += 1
+
+
+async def _hedged(call: Callable[[float], Awaitable[T]], deadline: float, hedge_after: float) -> T:
+    primary = asyncio.ensure_future(call(deadline))
+    tasks = [primary]
+    try:
+        done, _ = await asyncio.wait({primary}, timeout=hedge_after)
+        if done:
+            return primary.result()
+
+        # 꼬리 지연: 같은 요청을 하나 더 보내 먼저 성공한 응답 사용
+        hedge = asyncio.ensure_future(call(deadline))
+        tasks.append(hedge)
+        pending = set(tasks)
+        error: BaseException | None = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    metrics = current_run_metrics()
+                    if metrics is not None:
+                        metrics.record_hedge(won=task is hedge)
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+
+
+async def acall_with_retry(call: Callable[[float], Awaitable[T]], label: str = "achat", hedge: bool = True) -> T:
+    """
+    call(deadline)을 재시도 정책에 따라 실행 (비동기, 선택적 헤지 요청)
+
+    hedge=False: 설정과 무관하게 헤지하지 않음 (스트리밍처럼 같은 요청을 두 번 보내면 안 되는 경우)
+    """
+    settings = get_settings()
+    deadline = time.monotonic() + settings.llm_call_deadline_seconds
+    attempt = 0
+    while True:
+        try:
+            if hedge and settings.llm_hedge_after_seconds > 0:
+                return await _hedged(call, deadline, settings.llm_hedge_after_seconds)
+            return await call(deadline)
+        except Exception as exc:
+            if not is_retryable(exc) or attempt >= settings.llm_max_retries:
+                raise
+            delay = backoff_delay(attempt, exc)
+            if time.monotonic() + delay >= deadline:
+                raise
+            _on_retry(label, attempt, exc, delay)
+            await asyncio.sleep(delay)
+            attempt += 1
@@ -0,0 +1,356 @@
+"""
+프로세스 전역 LLM 요청 스케줄러
+
+모든 chat()/achat() 호출은 이 스케줄러를 거친다.
+
+- 동시 요청 수 제한 (llm_max_concurrency)
+- 토큰 버킷 기반 속도 제한: 초당 요청 수(RPS), 분당 토큰 수(TPM)
+- 우선순위 클래스: interactive(스트리밍 분석) > batch(eval 등)
+- 공정 큐잉: 같은 우선순위 안에서는 분석(tenant)별로 라운드로빈 배분
+
+동기 호출(스레드)과 비동기 호출(여러 이벤트 루프)이 같은 예산을 공유해야 하므로
+asyncio 프리미티브가 아니라 threading.Lock 기반으로 구현한다.
+"""
+import asyncio
+import contextvars
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import Deque, Dict, Iterator
+
+from app.core.settings import get_settings
+from app.observability.metrics import current_run_metrics
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BATCH = 1
+
+PRIORITY_CLASSES = {
+    "interactive": PRIORITY_INTERACTIVE,
+    "batch": PRIORITY_BATCH,
+}
+
+DEFAULT_TENANT = "default"
+
+_priority_var: contextvars.ContextVar[int] = contextvars.ContextVar(
+    "llm_priority", default=PRIORITY_INTERACTIVE
+)
+_tenant_var: contextvars.ContextVar[str] = contextvars.ContextVar("llm_tenant", default=DEFAULT_TENANT)
+
+
+@contextmanager
+def llm_priority(name: str) -> Iterator[None]:
+    """
+    현재 컨텍스트(및 여기서 생성되는 태스크)의 LLM 요청 우선순위 지정
+    """
+    token = _priority_var.set(PRIORITY_CLASSES.get(name, PRIORITY_INTERACTIVE))
+    try:
+        yield
+    finally:
+        _priority_var.reset(token)
+
+
+@contextmanager
+def llm_tenant(key: str) -> Iterator[None]:
+    """
+    공정 큐잉 단위(보통 분석 1회) 지정
+    """
+    token = _tenant_var.set(key or DEFAULT_TENANT)
+    try:
+        yield
+    finally:
+        _tenant_var.reset(token)
+
+
+def estimate_tokens(text: str, completion_tokens: int = 512) -> int:
+    # 청크 패킹과 같은 입력 토큰 추정 + 예상 출력 토큰 (완료 후 실제 usage로 보정)
+    # app.agents는 LLM 클라이언트를 쓰므로 순환 import를 피해 호출 시점에 가져온다
+    from app.agents.utils import estimate_text_tokens
+
+    return estimate_text_tokens(text) + completion_tokens
+
+
+class _TokenBucket:
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def take(self, amount: float) -> None:
+        self.tokens -= min(amount, self.capacity)
+
+    def adjust(self, delta: float) -> None:
+        # 실제 사용량과 추정치 차이 보정 (음수 잔량 허용 -> 이후 요청이 그만큼 대기)
+        self.tokens = min(self.capacity, self.tokens - delta)
+
+
+class _Waiter:
+    __slots__ = ("priority", "tenant", "tokens", "event", "loop", "future", "granted", "queued_at")
+
+    def __init__(self, priority: int, tenant: str, tokens: int):
+        self.priority = priority
+        self.tenant = tenant
+        self.tokens = tokens
+        self.event: threading.Event | None = None
+        self.loop: asyncio.AbstractEventLoop | None = None
+        self.future: asyncio.Future | None = None
+        self.granted = False
+        self.queued_at = time.monotonic()
+
+
+class LLMTicket:
+    """
+    허가된 요청 1건. 완료 후 total_tokens에 실제 사용량을 기록하면 TPM 예산이 보정된다.
+    """
+
+    __slots__ = ("estimated_tokens", "total_tokens", "priority", "tenant", "wait_seconds")
+
+    def __init__(self, waiter: _Waiter):
+        self.estimated_tokens = waiter.tokens
+        self.total_tokens: int | None = None
+        self.priority = waiter.priority
+        self.tenant = waiter.tenant
+        self.wait_seconds = time.monotonic() - waiter.queued_at
+
+
+class LLMScheduler:
+    def __init__(
+        self,
+        max_concurrency: int,
+        requests_per_second: float = 0.0,
+        tokens_per_minute: int = 0,
+    ):
+        self.max_concurrency = max(1, max_concurrency)
+        self._lock = threading.Lock()
+        self._rps = (
+            _TokenBucket(requests_per_second, max(1.0, requests_per_second))
+            if requests_per_second > 0
+            else None
+        )
+        self._tpm = _TokenBucket(tokens_per_minute / 60.0, tokens_per_minute) if tokens_per_minute > 0 else None
+        self._in_flight = 0
+        # priority -> (tenant -> 대기열), tenant 순서가 라운드로빈 순서
+        self._queues: Dict[int, "OrderedDict[str, Deque[_Waiter]]"] = {}
+        self._timer: threading.Timer | None = None
+        self._timer_due = 0.0
+        self._paused_until = 0.0
+
+        self.granted = 0
+        self.total_wait_seconds = 0.0
+        self.max_queue_depth = 0
+
+    # --------------------------------------------------
+    # Queue (lock held)
+    # --------------------------------------------------
+    def _enqueue(self, waiter: _Waiter) -> None:
+        tenants = self._queues.setdefault(waiter.priority, OrderedDict())
+        tenants.setdefault(waiter.tenant, deque()).append(waiter)
+        self.max_queue_depth = max(self.max_queue_depth, self._queue_depth())
+
+    def _queue_depth(self) -> int:
+        return sum(len(q) for tenants in self._queues.values() for q in tenants.values())
+
+    def _peek(self) -> _Waiter | None:
+        for priority in sorted(self._queues):
+            tenants = self._queues[priority]
+            if tenants:
+                return next(iter(tenants.values()))[0]
+        return None
+
+    def _pop(self, waiter: _Waiter) -> None:
+        tenants = self._queues[waiter.priority]
+        queue = tenants[waiter.tenant]
+        queue.popleft()
+        if queue:
+            # 이번 tenant는 순서 맨 뒤로 (라운드로빈)
+            tenants.move_to_end(waiter.tenant)
+        else:
+            del tenants[waiter.tenant]
+        if not tenants:
+            del self._queues[waiter.priority]
+
+    def _remove(self, waiter: _Waiter) -> None:
+        tenants = self._queues.get(waiter.priority)
+        if not tenants or waiter.tenant not in tenants:
+            return
+        queue = tenants[waiter.tenant]
+        try:
+            queue.remove(waiter)
+        except ValueError:
+            return
+        if not queue:
+            del tenants[waiter.tenant]
+        if not tenants:
+            del self._queues[waiter.priority]
+
+    def _dispatch(self) -> None:
+        while self._in_flight < self.max_concurrency:
+            waiter = self._peek()
+            if waiter is None:
+                return
+
+            now = time.monotonic()
+            wait = max(0.0, self._paused_until - now)
+            if self._rps is not None:
+                wait = max(wait, self._rps.wait_time(1, now))
+            if self._tpm is not None:
+                wait = max(wait, self._tpm.wait_time(waiter.tokens, now))
+            if wait > 0:
+                # 맨 앞 요청이 예산을 기다리는 동안 뒤 요청이 추월하지 않도록 그대로 대기
+                self._schedule_dispatch(wait)
+                return
+
+            if self._rps is not None:
+                self._rps.take(1)
+            if self._tpm is not None:
+                self._tpm.take(waiter.tokens)
+            self._pop(waiter)
+            self._in_flight += 1
+            self._grant(waiter)
+
+    def _grant(self, waiter: _Waiter) -> None:
+        waiter.granted = True
+        self.granted += 1
+        self.total_wait_seconds += time.monotonic() - waiter.queued_at
+        if waiter.event is not None:
+            waiter.event.set()
+        elif waiter.loop is not None and waiter.future is not None:
+            future = waiter.future
+            waiter.loop.call_soon_threadsafe(lambda: future.done() or future.set_result(None))
+
+    def _schedule_dispatch(self, delay: float) -> None:
+        due = time.monotonic() + delay
+        if self._timer is not None and self._timer_due <= due:
+            return
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = threading.Timer(delay, self._on_timer)
+        self._timer.daemon = True
+        self._timer_due = due
+        self._timer.start()
+
+    def _on_timer(self) -> None:
+        with self._lock:
+            self._timer = None
+            self._dispatch()
+
+    def _release_locked(self, estimated_tokens: int, total_tokens: int | None) -> None:
+        self._in_flight -= 1
+        if self._tpm is not None and total_tokens is not None:
+            self._tpm.adjust(total_tokens - estimated_tokens)
+        self._dispatch()
+
+    # --------------------------------------------------
+    # Public API
+    # --------------------------------------------------
+    def _new_waiter(self, tokens: int) -> _Waiter:
+        return _Waiter(_priority_var.get(), _tenant_var.get(), max(1, tokens))
+
+    def acquire(self, tokens: int) -> LLMTicket:
+        waiter = self._new_waiter(tokens)
+        waiter.event = threading.Event()
+        with self._lock:
+            self._enqueue(waiter)
+            self._dispatch()
+        waiter.event.wait()
+        return LLMTicket(waiter)
+
+    async def aacquire(self, tokens: int) -> LLMTicket:
+        waiter = self._new_waiter(tokens)
+        waiter.loop = asyncio.get_running_loop()
+        waiter.future = waiter.loop.create_future()
+        with self._lock:
+            self._enqueue(waiter)
+            self._dispatch()
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            with self._lock:
+                if waiter.granted:
+                    self._release_locked(waiter.tokens, None)
+                else:
+                    self._remove(waiter)
+            raise
+        return LLMTicket(waiter)
+
+    def pause(self, seconds: float) -> None:
+        """
+        429 등으로 서버가 한도 초과를 알린 경우 새 요청 허가를 잠시 중단
+        """
+        if seconds <= 0:
+            return
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._schedule_dispatch(seconds)
+
+    def release(self, ticket: LLMTicket) -> None:
+        with self._lock:
+            self._release_locked(ticket.estimated_tokens, ticket.total_tokens)
+
+    @staticmethod
+    def _record_wait(ticket: LLMTicket) -> None:
+        metrics = current_run_metrics()
+        if metrics is not None:
+            metrics.record_queue_wait(ticket.wait_seconds)
+
+    @contextmanager
+    def request_slot(self, tokens: int) -> Iterator[LLMTicket]:
+        ticket = self.acquire(tokens)
+        self._record_wait(ticket)
+        try:
+            yield ticket
+        finally:
+            self.release(ticket)
+
+    @asynccontextmanager
+    async def arequest_slot(self, tokens: int):
+        ticket = await self.aacquire(tokens)
+        self._record_wait(ticket)
+        try:
+            yield ticket
+        finally:
+            self.release(ticket)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "in_flight": self._in_flight,
+                "queued": self._queue_depth(),
+                "max_queue_depth": self.max_queue_depth,
+                "granted": self.granted,
+                "avg_wait_ms": round(self.total_wait_seconds / self.granted * 1000.0, 2) if self.granted else 0.0,
+            }
+
+
+# --------------------------------------------------
+# Process-wide scheduler
+# --------------------------------------------------
+_scheduler: LLMScheduler | None = None
+_scheduler_lock = threading.Lock()
+
+
+def get_llm_scheduler() -> LLMScheduler:
+    global _scheduler
+    if _scheduler is not None:
+        return _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            settings = get_settings()
+            _scheduler = LLMScheduler(
+                max_concurrency=settings.llm_max_concurrency,
+                requests_per_second=settings.llm_requests_per_second,
+                tokens_per_minute=settings.llm_tokens_per_minute,
+            )
+    return _scheduler
@@ -1,7 +1,9 @@
+import inspect
 import os
 import time
 
 from app.core.settings import get_settings
+from app.observability.metrics import current_run_metrics, node_scope
 
 try:
     from langsmith import Client as _LangSmithClient
@@ -91,14 +93,41 @@ def create_feedback(entries: list[dict]) -> bool:
     return True
 
 
+def _record_node(name: str, started: float) -> None:
+    metrics = current_run_metrics()
+    if metrics is not None:
+        metrics.record_node(name, time.perf_counter() - started)
+
+
 def traceable_timed(name: str):
     """
     Traceable decorator for tool runs (uses LangSmith standard run_type="tool").
+    Supports both sync and async (coroutine) functions.
+
+    LangSmith 설정과 무관하게 항상 노드 실행 시간을 재고, 안에서 발생한 LLM 호출을
+    현재 RunMetrics의 노드별 집계(name)에 기록한다.
     """
     def decorator(func):
+        # async 노드는 코루틴 함수로 유지해야 LangGraph가 이벤트 루프에서 직접 실행한다.
+        if inspect.iscoroutinefunction(func):
+            @traceable(name=name, run_type="tool")
+            async def async_wrapper(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    with node_scope(name):
+                        return await func(*args, **kwargs)
+                finally:
+                    _record_node(name, started)
+            return async_wrapper
+
         @traceable(name=name, run_type="tool")
         def wrapper(*args, **kwargs):
-            return func(*args, **kwargs)
+            started = time.perf_counter()
+            try:
+                with node_scope(name):
+                    return func(*args, **kwargs)
+            finally:
+                _record_node(name, started)
         return wrapper
     return decorator
 
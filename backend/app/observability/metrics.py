@@ -0,0 +1,251 @@
+"""
+분석 실행(run) 단위 메트릭 수집
+
+- 분석 1회마다 RunMetrics를 contextvar로 설정하면, 그 안에서 발생한 LLM 호출이
+  (워커 스레드/태스크 포함) 같은 객체에 기록된다.
+- 그래프 노드(traceable_timed)가 node_scope()를 열면 그 안의 LLM 호출/재시도/대기/토큰/청크 수가
+  전체 합계와 함께 노드별로도 집계된다 (어느 에이전트가 느리고 비싼지 외부 SaaS 없이 확인).
+- 결과는 snapshot()으로 JSON 직렬화 가능한 dict로 꺼낸다.
+"""
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator
+
+from app.core.settings import get_settings
+
+_current: contextvars.ContextVar["RunMetrics | None"] = contextvars.ContextVar("run_metrics", default=None)
+_node: contextvars.ContextVar[str | None] = contextvars.ContextVar("run_metrics_node", default=None)
+
+# 노드별 누적 필드 (초 단위 값은 snapshot에서 ms로 변환)
+_NODE_FIELDS = (
+    "runs",
+    "wall_seconds",
+    "llm_calls",
+    "llm_failures",
+    "llm_seconds",
+    "queue_wait_seconds",
+    "cache_hits",
+    "retries",
+    "retry_wait_seconds",
+    "chunks",
+    "chunk_failures",
+    "prompt_tokens",
+    "completion_tokens",
+    "cached_prompt_tokens",
+    "cost_usd",
+)
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000.0, 2)
+
+
+def llm_cost_usd(model: str, prompt_tokens: int, completion_tokens: int, cached_tokens: int = 0) -> float:
+    """
+    설정의 모델별 100만 토큰당 단가(llm_pricing)로 비용 추정. 단가가 없으면 0
+    """
+    pricing = get_settings().llm_pricing.get(model)
+    if not pricing:
+        return 0.0
+    cached_tokens = min(cached_tokens, prompt_tokens)
+    input_price = pricing.get("input", 0.0)
+    cached_price = pricing.get("cached_input", input_price)
+    return (
+        (prompt_tokens - cached_tokens) * input_price
+        + cached_tokens * cached_price
+        + completion_tokens * pricing.get("output", 0.0)
+    ) / 1_000_000
+
+
+class RunMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+        self.llm_calls = 0
+        self.llm_failures = 0
+        self.llm_seconds = 0.0
+        self.queue_wait_seconds = 0.0
+        self.cache_hits = 0
+        self.retries = 0
+        self.retry_wait_seconds = 0.0
+        self.retry_reasons: Dict[str, int] = {}
+        self.hedged_requests = 0
+        self.hedge_wins = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cached_prompt_tokens = 0
+        self.cost_usd = 0.0
+        self.chunks = 0
+        self.chunk_failures = 0
+        self.json_continuations = 0
+        self.json_truncated = 0
+        self.nodes: Dict[str, Dict[str, float]] = {}
+
+    def _node_stats(self) -> Dict[str, float] | None:
+        # 호출자가 self._lock을 잡은 상태에서 사용
+        name = _node.get()
+        if name is None:
+            return None
+        stats = self.nodes.get(name)
+        if stats is None:
+            stats = self.nodes[name] = dict.fromkeys(_NODE_FIELDS, 0)
+        return stats
+
+    def _add(self, **values: float) -> None:
+        # 전체 합계 + 현재 노드 합계에 같은 값을 더한다 (호출자가 lock 보유)
+        stats = self._node_stats()
+        for key, value in values.items():
+            setattr(self, key, getattr(self, key) + value)
+            if stats is not None:
+                stats[key] += value
+
+    def record_call(self, ok: bool = True, seconds: float = 0.0) -> None:
+        with self._lock:
+            self._add(llm_calls=1, llm_failures=0 if ok else 1, llm_seconds=seconds)
+
+    def record_cache_hit(self) -> None:
+        with self._lock:
+            self._add(cache_hits=1)
+
+    def record_queue_wait(self, seconds: float) -> None:
+        # 스케줄러 슬롯(동시성/RPS/TPM 예산)을 기다린 시간
+        with self._lock:
+            self._add(queue_wait_seconds=seconds)
+
+    def record_retry(self, reason: str, delay: float) -> None:
+        with self._lock:
+            self._add(retries=1, retry_wait_seconds=delay)
+            self.retry_reasons[reason] = self.retry_reasons.get(reason, 0) + 1
+
+    def record_usage(
+        self,
+        prompt_tokens: int | None,
+        completion_tokens: int | None,
+        cached_tokens: int | None = None,
+        model: str | None = None,
+    ) -> None:
+        prompt_tokens = prompt_tokens or 0
+        completion_tokens = completion_tokens or 0
+        cached_tokens = cached_tokens or 0
+        cost = llm_cost_usd(model, prompt_tokens, completion_tokens, cached_tokens) if model else 0.0
+        with self._lock:
+            self._add(
+                prompt_tokens=prompt_tokens,
+                completion_tokens=completion_tokens,
+                cached_prompt_tokens=cached_tokens,
+                cost_usd=cost,
+            )
+
+    def record_chunks(self, count: int) -> None:
+        # 청크/윈도우 병렬 분석에서 나눈 단위 수
+        with self._lock:
+            self._add(chunks=count)
+
+    def record_chunk_failure(self) -> None:
+        # 예외로 결과 없이 버려진 청크/윈도우 (부분 결과 여부 확인용)
+        with self._lock:
+            self._add(chunk_failures=1)
+
+    def record_node(self, name: str, seconds: float) -> None:
+        with self._lock:
+            stats = self.nodes.get(name)
+            if stats is None:
+                stats = self.nodes[name] = dict.fromkeys(_NODE_FIELDS, 0)
+            stats["runs"] += 1
+            stats["wall_seconds"] += seconds
+
+    def record_json_continuation(self) -> None:
+        with self._lock:
+            self.json_continuations += 1
+
+    def record_json_truncation(self) -> None:
+        # 이어받기 후에도 완결되지 않아 부분 결과로 반환된 응답
+        with self._lock:
+            self.json_truncated += 1
+
+    def record_hedge(self, won: bool) -> None:
+        with self._lock:
+            self.hedged_requests += 1
+            if won:
+                self.hedge_wins += 1
+
+    @staticmethod
+    def _node_snapshot(stats: Dict[str, float]) -> Dict[str, Any]:
+        return {
+            "runs": int(stats["runs"]),
+            "wall_ms": _ms(stats["wall_seconds"]),
+            "llm_calls": int(stats["llm_calls"]),
+            "llm_failures": int(stats["llm_failures"]),
+            "llm_ms": _ms(stats["llm_seconds"]),
+            "queue_wait_ms": _ms(stats["queue_wait_seconds"]),
+            "cache_hits": int(stats["cache_hits"]),
+            "retries": int(stats["retries"]),
+            "retry_wait_ms": _ms(stats["retry_wait_seconds"]),
+            "chunks": int(stats["chunks"]),
+            "chunk_failures": int(stats["chunk_failures"]),
+            "prompt_tokens": int(stats["prompt_tokens"]),
+            "completion_tokens": int(stats["completion_tokens"]),
+            "cached_prompt_tokens": int(stats["cached_prompt_tokens"]),
+            "cost_usd": round(stats["cost_usd"], 6),
+        }
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "elapsed_ms": _ms(time.perf_counter() - self._started),
+                "llm_calls": self.llm_calls,
+                "llm_failures": self.llm_failures,
+                "llm_ms": _ms(self.llm_seconds),
+                "queue_wait_ms": _ms(self.queue_wait_seconds),
+                "cache_hits": self.cache_hits,
+                "retries": self.retries,
+                "retry_wait_ms": _ms(self.retry_wait_seconds),
+                "retry_reasons": dict(self.retry_reasons),
+                "hedged_requests": self.hedged_requests,
+                "hedge_wins": self.hedge_wins,
+                "prompt_tokens": self.prompt_tokens,
+                "completion_tokens": self.completion_tokens,
+                "cached_prompt_tokens": self.cached_prompt_tokens,
+                # 입력 토큰 중 프로바이더 프롬프트 캐시로 처리된 비율
+                "prompt_cache_ratio": (
+                    round(self.cached_prompt_tokens / self.prompt_tokens, 4) if self.prompt_tokens else 0.0
+                ),
+                "cost_usd": round(self.cost_usd, 6),
+                "chunks": self.chunks,
+                "chunk_failures": self.chunk_failures,
+                "json_continuations": self.json_continuations,
+                "json_truncated": self.json_truncated,
+                # 노드별 (wall_ms 내림차순: 가장 느린 노드가 먼저)
+                "nodes": {
+                    name: self._node_snapshot(stats)
+                    for name, stats in sorted(self.nodes.items(), key=lambda item: -item[1]["wall_seconds"])
+                },
+            }
+
+
+def current_run_metrics() -> RunMetrics | None:
+    return _current.get()
+
+
+@contextmanager
+def run_metrics_scope(metrics: RunMetrics | None = None) -> Iterator[RunMetrics]:
+    metrics = metrics or RunMetrics()
+    token = _current.set(metrics)
+    try:
+        yield metrics
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def node_scope(name: str) -> Iterator[None]:
+    """
+    이 안에서 기록되는 LLM 메트릭을 노드 name에도 집계 (스레드/태스크로 전파됨)
+    """
+    token = _node.set(name)
+    try:
+        yield
+    finally:
+        _node.reset(token)
@@ -0,0 +1,51 @@
+"""
+분석 진행 중 이벤트 스트리밍 (LangGraph custom stream mode)
+
+- stream_analysis_for_text가 issue_stream_scope()를 열고 astream(stream_mode=["updates", "custom"])으로
+  그래프를 실행하면, 그 안의 에이전트가 이슈를 파싱하는 즉시 emit_issue()로 issue_found 이벤트를 보낸다.
+- 스코프 밖(ainvoke, 레거시 파이프라인, 평가 러너)에서는 아무 일도 하지 않으며
+  LLM 호출도 기존처럼 한 번에 응답을 받는다.
+"""
+import contextvars
+import logging
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator
+
+from app.core.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+_streaming: contextvars.ContextVar[bool] = contextvars.ContextVar("issue_streaming", default=False)
+
+
+@contextmanager
+def issue_stream_scope(enabled: bool = True) -> Iterator[None]:
+    token = _streaming.set(enabled)
+    try:
+        yield
+    finally:
+        _streaming.reset(token)
+
+
+def issue_streaming_enabled() -> bool:
+    return _streaming.get() and get_settings().llm_stream_issues
+
+
+def emit_event(event: Dict[str, Any]) -> None:
+    """
+    현재 그래프 노드의 custom 스트림으로 이벤트 전송 (그래프 밖이면 무시)
+    """
+    try:
+        from langgraph.config import get_stream_writer
+
+        writer = get_stream_writer()
+    except Exception:
+        return
+    try:
+        writer(event)
+    except Exception as e:
+        logger.warning(f"[STREAM] Failed to emit {event.get('type')} event: {e}")
+
+
+def emit_issue(agent: str, issue: Dict[str, Any]) -> None:
+    emit_event({"type": "issue_found", "agent": agent, "issue": issue})
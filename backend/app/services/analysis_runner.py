@@ -1,9 +1,12 @@
+import contextlib
 import logging
 import time
+import uuid
 from typing import Any, Dict, Optional
 
 from app.core.settings import get_settings
 from app.graph.graph import agent_app
+from app.graph.checkpoint import delete_checkpoints, get_checkpointed_app, run_config
 from app.graph.state import AgentState
 from app.agents.tools.split import Splitter
 from app.agents.tools.causality_agent import CausalityEvaluatorAgent
@@ -14,7 +17,9 @@ from app.agents.tools.llm_aggregator import IssueBasedAggregatorAgent
 
 from app.observability.langsmith import traceable
 from app.llm.client import has_upstage_api_key
-from app.services.split_map import build_split_payload
+from app.llm.scheduler import llm_tenant
+from app.observability.metrics import current_run_metrics, run_metrics_scope
+from app.observability.stream import issue_stream_scope
 from app.services.issue_normalizer import normalize_issues
 
 logger = logging.getLogger(__name__)
@@ -43,7 +48,7 @@ def _run_final_evaluator(outputs: Dict[str, Any]) -> Dict[str, Any]:
     # except Exception as exc:
     #     return {"error": str(exc)}
 from app.llm.client import has_upstage_api_key
-from app.services.split_map import build_split_payload
+from app.services.split_map import build_split_payload, materialize_split_payload
 from app.services.issue_normalizer import normalize_issues
 
 logger = logging.getLogger(__name__)
@@ -53,11 +58,19 @@ async def run_analysis_for_text(
     text: str,
     context: Optional[str] = None,
     mode: str = "full",
+    incremental_base: Optional[Dict[str, Any]] = None,
+    run_id: Optional[str] = None,
 ) -> Dict[str, Any]:
-    # ... (기존 코드 유지)
+    """
+    run_id가 주어지면 그래프 체크포인트 키로 사용한다 (같은 run_id로 재시도하면 이어서 실행).
+    """
     if has_upstage_api_key():
         if mode == "full":
-            return await _run_langgraph_full(text=text, context=context, mode=mode)
+            # 분석 1회를 LLM 스케줄러의 공정 큐잉 단위로 사용
+            with llm_tenant(run_id or uuid.uuid4().hex), run_metrics_scope():
+                return await _run_langgraph_full(
+                    text=text, context=context, mode=mode, incremental_base=incremental_base, run_id=run_id
+                )
         return _run_causality_only(text=text, mode=mode)
     # ...
 
@@ -66,9 +79,15 @@ async def stream_analysis_for_text(
     context: Optional[str] = None,
     mode: str = "full",
     options: Optional[Dict[str, Any]] = None,
+    incremental_base: Optional[Dict[str, Any]] = None,
+    run_id: Optional[str] = None,
 ):
     """
     분석 과정을 실시간으로 스트리밍하는 비동기 제너레이터
+
+    incremental_base(load_incremental_base)가 주어지면 변경되지 않은 문장 청크는 이전 결과를 재사용한다 (증분 분석).
+    run_id가 주어지면 노드 완료마다 체크포인트를 남기고, 같은 run_id로 다시 호출하면
+    마지막 체크포인트부터 이어서 실행한다.
     """
     logger.info(f"[STREAM] Start streaming. Mode: {mode}, API_KEY: {has_upstage_api_key()}")
 
@@ -96,11 +115,14 @@ async def stream_analysis_for_text(
         "original_text": text,
         "context": context,
         "user_persona_input": user_persona_input,
+        "incremental_base": incremental_base,
         "logs": []
     }
 
-    # 누적된 최종 상태를 담을 변수
-    accumulated_state = initial_state.copy()
+    app, config, graph_input, resumed_state = await _prepare_graph_run(initial_state, run_id)
+
+    # 누적된 최종 상태를 담을 변수 (재개 시 체크포인트 상태에서 시작)
+    accumulated_state = dict(resumed_state) if resumed_state is not None else initial_state.copy()
 
     # 노드 이름 매핑 (가독성용)
     node_labels = {
@@ -115,54 +137,95 @@ async def stream_analysis_for_text(
         "genre_cliche": "장르 클리셰 분석",
         "spelling": "맞춤법 검사",
         "tension_curve": "긴장도 곡선 생성",
+        "surface_scan": "안전/윤리/맞춤법 통합 검사",
         "aggregate": "분석 결과 종합",
         "report": "최종 리포트 작성",
         "qa_scores": "품질 점수 산정"
     }
 
-    try:
-        async for event in agent_app.astream(initial_state, stream_mode="updates"):
-            for node_name, state_update in event.items():
-                try:
-                    # 상태 누적
-                    accumulated_state.update(state_update)
+    # 분석 1회를 LLM 스케줄러의 공정 큐잉 단위로 사용 (astream이 만드는 노드 태스크에 전파됨)
+    # 제너레이터가 다른 컨텍스트에서 정리(aclose)되면 ContextVar reset이 ValueError를 낼 수 있음
+    with contextlib.ExitStack() as scopes:
+        scopes.enter_context(contextlib.suppress(ValueError))
+        scopes.enter_context(llm_tenant(run_id or uuid.uuid4().hex))
+        scopes.enter_context(run_metrics_scope())
+        scopes.enter_context(issue_stream_scope())
+        try:
+            if resumed_state is not None:
+                yield {"type": "log", "agent": "코디네이터", "logs": [{"agent": "코디네이터", "message": "지난번에 멈춘 단계부터 이어서 분석할게요!", "timestamp": time.time()}]}
+
+            # updates: 노드 완료 단위 상태, custom: 에이전트가 이슈를 파싱하는 즉시 보내는 issue_found 이벤트
+            async for stream_mode, event in app.astream(graph_input, config=config, stream_mode=["updates", "custom"]):
+                if stream_mode == "custom":
+                    yield event
+                    continue
+                for node_name, state_update in event.items():
+                    try:
+                        # 상태 누적
+                        accumulated_state.update(state_update)
                     
-                    label = node_labels.get(node_name, node_name)
+                        label = node_labels.get(node_name, node_name)
                     
-                    # 1. 노드에서 발생한 실제 로그 전송
-                    if "logs" in state_update and state_update["logs"]:
-                        yield {"type": "log", "agent": node_name, "logs": state_update["logs"]}
-                    else:
-                        # 2. 로그가 없는 노드일 경우 단순 진행 상황 알림
-                        yield {"type": "log", "agent": "코디네이터", "logs": [{"agent": "코디네이터", "message": f"'{label}' 단계를 끝냈어요!", "timestamp": time.time()}]}
+                        # 1. 노드에서 발생한 실제 로그 전송
+                        if "logs" in state_update and state_update["logs"]:
+                            yield {"type": "log", "agent": node_name, "logs": state_update["logs"]}
+                        else:
+                            # 2. 로그가 없는 노드일 경우 단순 진행 상황 알림
+                            yield {"type": "log", "agent": "코디네이터", "logs": [{"agent": "코디네이터", "message": f"'{label}' 단계를 끝냈어요!", "timestamp": time.time()}]}
                     
-                    yield {"type": "node_complete", "node": node_name}
-                except Exception as node_err:
-                    logger.error(f"[STREAM] Node update error ({node_name}): {node_err}")
-
-        # 최종 결과 구성
-        res = await _build_final_result(accumulated_state, text, context, mode)
-        yield {"type": "final_result", "data": res}
+                        yield {"type": "node_complete", "node": node_name}
+                    except Exception as node_err:
+                        logger.error(f"[STREAM] Node update error ({node_name}): {node_err}")
+
+            # 최종 결과 구성
+            res = await _build_final_result(accumulated_state, text, context, mode)
+            res["debug"]["checkpoint"] = {"resumed": resumed_state is not None}
+            if config is not None:
+                await delete_checkpoints(run_id)
+            yield {"type": "final_result", "data": res}
         
-    except Exception as e:
-        logger.error(f"[STREAM] Critical Error: {e}", exc_info=True)
-        yield {"type": "error", "message": str(e)}
+        except Exception as e:
+            logger.error(f"[STREAM] Critical Error: {e}", exc_info=True)
+            yield {"type": "error", "message": str(e)}
 
-async def _build_final_result(final_state: AgentState, text: str, context: Optional[str], mode: str) -> Dict[str, Any]:
-    """최종 상태를 분석 결과 딕셔너리로 변환 (ainvoke 없이)"""
+async def _prepare_graph_run(initial_state: AgentState, run_id: Optional[str]):
+    """
+    실행할 그래프/설정/입력 결정
+
+    반환: (app, config, graph_input, resumed_state)
+    - run_id가 없거나 체크포인트를 쓸 수 없으면 기존 agent_app으로 처음부터 실행
+    - 같은 run_id의 미완료 체크포인트가 있으면 input=None으로 이어서 실행
+    """
+    checkpointed = await get_checkpointed_app() if run_id else None
+    if checkpointed is None:
+        return agent_app, None, initial_state, None
+
+    config = run_config(run_id)
+    snapshot = await checkpointed.aget_state(config)
+    if snapshot.values and snapshot.next:
+        logger.info(f"[CHECKPOINT] Resuming run {run_id} at {list(snapshot.next)}")
+        return checkpointed, config, None, snapshot.values
+    if snapshot.values:
+        # 이미 끝난 run이 남아 있으면 상태(logs 등)가 섞이지 않도록 지우고 새로 시작
+        await delete_checkpoints(run_id)
+    return checkpointed, config, initial_state, None
+
+
+async def _build_final_result(
+    final_state: AgentState,
+    text: str,
+    context: Optional[str],
+    mode: str,
+    debug_mode: Optional[str] = None,
+) -> Dict[str, Any]:
+    """최종 상태를 분석 결과 딕셔너리로 변환 (debug.mode 기본값은 스트리밍 실행 기준)"""
     aggregated = final_state.get("aggregated_result") or {}
     decision = aggregated.get("decision")
     final_report = final_state.get("final_report")
     logic = final_state.get("logic_result") or final_state.get("causality_result")
     tension = final_state.get("tension_curve_result")
 
-    split_payload = final_state.get("split_text") or {}
-    if isinstance(split_payload, list):
-        split_payload = {"split_sentences": [str(item) for item in split_payload], "split_map": []}
-    elif isinstance(split_payload, str):
-        split_payload = build_split_payload(split_payload)
-    elif not isinstance(split_payload, dict):
-        split_payload = {}
+    split_payload = materialize_split_payload(final_state.get("split_text"))
 
     result = {
         "split": split_payload,
@@ -183,7 +246,11 @@ async def _build_final_result(final_state: AgentState, text: str, context: Optio
         "persona_feedback": final_state.get("persona_feedback"),
         "rewrite_guidelines": final_state.get("rewrite_guidelines"),
         "logs": final_state.get("logs", []),
-        "debug": {"mode": f"langgraph_stream_{mode}"},
+        "debug": {
+            "mode": debug_mode or f"langgraph_stream_{mode}",
+            **_incremental_debug(final_state),
+            **_run_metrics_debug(),
+        },
     }
 
     result["final_metric"] = final_state.get("final_metric") or _run_final_evaluator(result)
@@ -193,6 +260,26 @@ async def _build_final_result(final_state: AgentState, text: str, context: Optio
     return result
 
 
+def _incremental_debug(final_state: AgentState) -> Dict[str, Any]:
+    incremental = final_state.get("incremental")
+    if not incremental:
+        return {}
+    return {
+        "incremental": {
+            "reused_sentences": incremental.get("reused_sentences"),
+            "total_sentences": incremental.get("total_sentences"),
+        }
+    }
+
+
+def _run_metrics_debug() -> Dict[str, Any]:
+    # LLM 호출/재시도/캐시 적중 등 실행 단위 메트릭
+    metrics = current_run_metrics()
+    if metrics is None:
+        return {}
+    return {"run_metrics": metrics.snapshot()}
+
+
 def _apply_optional_outputs(result: Dict[str, Any], split_payload: dict | None) -> None:
     settings = get_settings()
     if not isinstance(split_payload, dict):
@@ -208,63 +295,32 @@ def _apply_optional_outputs(result: Dict[str, Any], split_payload: dict | None)
         result["split_map"] = split_payload.get("split_map")
 
 
-async def _run_langgraph_full(text: str, context: Optional[str], mode: str) -> Dict[str, Any]:
+async def _run_langgraph_full(
+    text: str,
+    context: Optional[str],
+    mode: str,
+    incremental_base: Optional[Dict[str, Any]] = None,
+    run_id: Optional[str] = None,
+) -> Dict[str, Any]:
     logger.info("[DEBUG] _run_langgraph_full: Preparing initial state.")
     initial_state: AgentState = {
         "original_text": text,
         "context": context,
+        "incremental_base": incremental_base,
     }
+    app, config, graph_input, resumed_state = await _prepare_graph_run(initial_state, run_id)
     logger.info("[DEBUG] _run_langgraph_full: Invoking agent_app (LangGraph).")
     try:
-        final_state: AgentState = await agent_app.ainvoke(initial_state)
+        final_state: AgentState = await app.ainvoke(graph_input, config=config)
         logger.info("[DEBUG] _run_langgraph_full: agent_app returned successfully.")
     except Exception as e:
         logger.error(f"[DEBUG] _run_langgraph_full: agent_app failed with error: {e}")
         raise e
+    if config is not None:
+        await delete_checkpoints(run_id)
 
-    aggregated = final_state.get("aggregated_result") or {}
-    decision = aggregated.get("decision")
-    final_report = final_state.get("final_report")
-    logic = final_state.get("logic_result") or final_state.get("causality_result")
-    tension = final_state.get("tension_curve_result")
-
-    split_payload = final_state.get("split_text") or {}
-    if isinstance(split_payload, list):
-        split_payload = {
-            "split_sentences": [str(item) for item in split_payload],
-            "split_map": [],
-        }
-    elif isinstance(split_payload, str):
-        split_payload = build_split_payload(split_payload)
-    elif not isinstance(split_payload, dict):
-        split_payload = {}
-
-    result = {
-        "split": split_payload,
-        "final_report": final_report,
-        "report": final_report,
-        "decision": decision,
-        "tone": final_state.get("tone_result"),
-        "logic": logic,
-        "trauma": final_state.get("trauma_result"),
-        "hate_bias": final_state.get("hate_bias_result"),
-        "genre_cliche": final_state.get("genre_cliche_result"),
-        "spelling": final_state.get("spelling_result"),
-        "tension_curve": tension,
-        "causality": logic,
-        "aggregate": aggregated,
-        "aggregated": aggregated,
-        "reader_persona": final_state.get("reader_persona"),
-        "persona_feedback": final_state.get("persona_feedback"),
-        "rewrite_guidelines": final_state.get("rewrite_guidelines"),
-        "logs": final_state.get("logs", []),
-        "debug": {"mode": f"langgraph_{mode}"},
-    }
-
-    result["final_metric"] = final_state.get("final_metric") or _run_final_evaluator(result)
-    result["qa_scores"] = final_state.get("qa_scores") or _run_qa_scores(text, result, mode="full")
-    _apply_optional_outputs(result, split_payload)
-
+    result = await _build_final_result(final_state, text, context, mode, debug_mode=f"langgraph_{mode}")
+    result["debug"]["checkpoint"] = {"resumed": resumed_state is not None}
     return result
 
 
@@ -332,7 +388,8 @@ def _run_causality_only(text: str, mode: str) -> Dict[str, Any]:
         "qa_scores": _run_qa_scores(text, {"causality": causality}, mode="causality_only"),
         "debug": {"mode": f"langgraph_{mode}"},
     }
-    _apply_optional_outputs(result, split_result)
+    result["split"] = materialize_split_payload(split_result)
+    _apply_optional_outputs(result, result["split"])
     return result
 
 
@@ -429,7 +486,7 @@ def _run_qa_scores(text: str, outputs: Dict[str, Any], mode: str) -> Dict[str, i
 
 
 def _split_text(text: str) -> dict:
-    return build_split_payload(text)
+    return build_split_payload(text).to_dict()
 
 
 def _heuristic_tone(text: str) -> dict:
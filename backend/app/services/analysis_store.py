@@ -0,0 +1,146 @@
+"""
+분석 결과 저장/조회 헬퍼
+
+HTTP 엔드포인트와 백그라운드 작업 워커가 같은 방식으로 Analysis 행을 만들도록 공유한다.
+"""
+import asyncio
+import uuid
+from typing import Any, Dict, List
+
+from sqlalchemy import select
+
+from app.core.db import Analysis
+from app.core.serialization import dumps_text
+from app.core.settings import get_settings
+from app.services.incremental_analysis import INCREMENTAL_AGENTS, build_incremental_base
+from app.services.result_storage import RESULT_FORMAT, build_sections, load_result
+
+
+def _issue_count(result: dict | None) -> int:
+    if not result:
+        return 0
+    issues = result.get("issues", [])
+    return len(issues) if isinstance(issues, list) else 0
+
+
+def collect_issue_counts(result: dict) -> dict:
+    return {
+        "tone": _issue_count(result.get("tone")),
+        "logic": _issue_count(result.get("logic")),
+        "trauma": _issue_count(result.get("trauma")),
+        "hate_bias": _issue_count(result.get("hate_bias")),
+        "genre_cliche": _issue_count(result.get("genre_cliche")),
+        "spelling": _issue_count(result.get("spelling")),
+    }
+
+
+def is_fallback(result: dict) -> bool:
+    report = result.get("final_report") or {}
+    if isinstance(report, dict) and isinstance(report.get("note"), str):
+        return "LLM 미사용" in report.get("note")
+    return False
+
+
+# 증분 기준에 필요한 결과 필드만 읽는다 (전체 결과는 MB 단위)
+_INCREMENTAL_FIELDS = ["debug", "split", "split_sentences", *INCREMENTAL_AGENTS]
+
+
+async def load_incremental_base(session, doc_id: str) -> dict | None:
+    """
+    문서의 가장 최근 full 분석 결과로 만든 증분 기준 (build_incremental_base 참고)
+    """
+    if not get_settings().enable_incremental_analysis:
+        return None
+    res = await session.execute(
+        select(Analysis)
+        .where(Analysis.document_id == doc_id, Analysis.status == "done")
+        .order_by(Analysis.created_at.desc())
+        .limit(1)
+    )
+    previous = res.scalars().first()
+    if not previous:
+        return None
+    try:
+        result = await load_result(session, previous, fields=_INCREMENTAL_FIELDS)
+    except ValueError:
+        return None
+    mode = (result.get("debug") or {}).get("mode") or ""
+    if not mode.startswith("langgraph") or not mode.endswith("full"):
+        return None
+    # 문장 해시 계산은 긴 원고에서 수십 ms 걸리므로 이벤트 루프 밖에서
+    return await asyncio.to_thread(build_incremental_base, result)
+
+
+def run_metrics_of(result: dict) -> dict:
+    metrics = (result.get("debug") or {}).get("run_metrics")
+    return metrics if isinstance(metrics, dict) else {}
+
+
+# 노드별 합산 필드 (평균은 분석 수 기준)
+_SUMMED_NODE_FIELDS = (
+    "wall_ms",
+    "llm_calls",
+    "llm_ms",
+    "queue_wait_ms",
+    "retries",
+    "chunks",
+    "chunk_failures",
+    "prompt_tokens",
+    "completion_tokens",
+    "cached_prompt_tokens",
+    "cost_usd",
+)
+
+
+def summarize_node_metrics(metrics_rows: List[dict]) -> dict:
+    """
+    여러 분석의 metrics_json -> 노드별 합계/평균 (평균 wall_ms 내림차순: 병목 노드가 먼저)
+    """
+    totals: Dict[str, Dict[str, float]] = {}
+    counts: Dict[str, int] = {}
+    analyses = 0
+    for metrics in metrics_rows:
+        nodes = (metrics or {}).get("nodes")
+        if not isinstance(nodes, dict) or not nodes:
+            continue
+        analyses += 1
+        for name, stats in nodes.items():
+            bucket = totals.setdefault(name, dict.fromkeys(_SUMMED_NODE_FIELDS, 0))
+            counts[name] = counts.get(name, 0) + 1
+            for key in _SUMMED_NODE_FIELDS:
+                value = stats.get(key)
+                if isinstance(value, (int, float)):
+                    bucket[key] += value
+
+    summary = {}
+    for name, bucket in sorted(totals.items(), key=lambda item: -item[1]["wall_ms"] / counts[item[0]]):
+        n = counts[name]
+        summary[name] = {
+            "analyses": n,
+            "avg_wall_ms": round(bucket["wall_ms"] / n, 2),
+            "avg_llm_ms": round(bucket["llm_ms"] / n, 2),
+            "avg_queue_wait_ms": round(bucket["queue_wait_ms"] / n, 2),
+            "avg_llm_calls": round(bucket["llm_calls"] / n, 2),
+            "avg_cost_usd": round(bucket["cost_usd"] / n, 6),
+            "total": {key: round(value, 6) for key, value in bucket.items()},
+        }
+    return {"analyses": analyses, "nodes": summary}
+
+
+def build_analysis(doc_id: str, result: Dict[str, Any]) -> Analysis:
+    """
+    분석 결과 dict -> Analysis 행 (세션에 add/commit은 호출자가 수행)
+    """
+    issue_counts = collect_issue_counts(result)
+    return Analysis(
+        id=str(uuid.uuid4()),
+        document_id=doc_id,
+        status="fallback" if is_fallback(result) else "done",
+        decision=result.get("decision"),
+        has_issues=any(v > 0 for v in issue_counts.values()),
+        issue_counts_json=dumps_text(issue_counts),
+        result_format=RESULT_FORMAT,
+        result_json="",
+        sections=build_sections(result),
+        metrics_json=dumps_text(run_metrics_of(result)),
+    )
@@ -10,6 +10,7 @@ from sqlalchemy import select
 from app.core.db import Document, EvalRun, get_session
 from app.llm.client import get_upstage_client
 from app.llm.chat import chat
+from app.llm.scheduler import llm_priority
 from app.services.analysis_runner import run_analysis_for_text
 # Evaluators removed
 # from app.agents.evaluators.final_evaluator import FinalEvaluatorAgent
@@ -138,7 +139,13 @@ def collect_agent_metrics(
         persona_feedback = debug_payload.get("persona_feedback")
     aggregated = outputs.get("aggregated") or outputs.get("aggregate") or {}
 
-    latencies_ms: dict[str, float] = {}
+    # 그래프 노드별 실행 시간 (RunMetrics.nodes, 노드 이름 = 결과 키)
+    run_metrics = (outputs.get("debug") or {}).get("run_metrics") or {}
+    latencies_ms: dict[str, float] = {
+        name: stats["wall_ms"]
+        for name, stats in (run_metrics.get("nodes") or {}).items()
+        if isinstance(stats, dict) and isinstance(stats.get("wall_ms"), (int, float))
+    }
     
     # Use direct scores instead of running quality checks
     def _extract_metric(result):
@@ -704,15 +711,18 @@ async def evaluate_text(
         context = None
 
     analysis_start = time.perf_counter()
-    outputs = await run_analysis_for_text(text=text, context=context)
+    # eval 실행은 사용자 스트리밍 분석보다 낮은 우선순위로 LLM 예산을 사용
+    with llm_priority("batch"):
+        outputs = await run_analysis_for_text(text=text, context=context)
     analysis_latency_ms = round((time.perf_counter() - analysis_start) * 1000.0, 2)
     scores = perform_eval(outputs)
     if use_llm_judge:
-        scores.update(llm_as_judge(outputs))
-        if scores.get("llm_judge_rationale"):
-            scores["quality_rationale_ko"] = translate_rationale(
-                scores.get("llm_judge_rationale", "")
-            )
+        with llm_priority("batch"):
+            scores.update(llm_as_judge(outputs))
+            if scores.get("llm_judge_rationale"):
+                scores["quality_rationale_ko"] = translate_rationale(
+                    scores.get("llm_judge_rationale", "")
+                )
     else:
         scores.setdefault("llm_judge_status", "disabled")
 
@@ -0,0 +1,186 @@
+"""
+증분(incremental) 재분석 지원
+
+문서 수정 후 재분석 시, 직전 Analysis의 문장 해시와 새 문장 해시를
+비교해 변경되지 않은 문장을 찾는다. 청크 단위 에이전트(Trauma/HateBias/Spelling)는
+문장이 모두 그대로인 청크의 이슈를 재사용하고, 바뀐 청크만 다시 LLM에 보낸다.
+
+- 그래프 상태에는 직전 결과 전체가 아니라 증분 기준(build_incremental_base: 문장 해시 +
+  재사용할 에이전트 결과)만 싣고, split 노드가 증분 입력을 만든 뒤 비운다.
+- 재사용 이슈의 sentence_index는 새 문장 인덱스로 다시 매핑된다.
+- char_start/char_end는 문장 기준 오프셋이므로 그대로 유지되고,
+  doc_start/doc_end는 normalize_issues 단계에서 새 split_map으로 다시 계산된다.
+"""
+import hashlib
+from bisect import bisect_left
+from difflib import SequenceMatcher
+from typing import Any, Dict, List, Optional, Sequence
+
+# 증분 재사용을 지원하는 청크 단위 에이전트 (결과 키)
+INCREMENTAL_AGENTS = ("trauma", "hate_bias", "spelling")
+
+
+def sentence_hash(sentence: str) -> str:
+    return hashlib.blake2b(sentence.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def _unique_anchors(old: Sequence[str], a0: int, a1: int, new: Sequence[str], b0: int, b1: int) -> List[tuple]:
+    """
+    양쪽 구간에서 한 번씩만 나오는 해시 쌍 중 순서가 유지되는 최장 부분열 (patience diff 앵커)
+    """
+    old_pos: Dict[str, int] = {}
+    for i in range(a0, a1):
+        old_pos[old[i]] = -1 if old[i] in old_pos else i
+    new_pos: Dict[str, int] = {}
+    for j in range(b0, b1):
+        new_pos[new[j]] = -1 if new[j] in new_pos else j
+    pairs = [
+        (old_pos[h], j) for h, j in new_pos.items()
+        if j >= 0 and old_pos.get(h, -1) >= 0
+    ]
+    if not pairs:
+        return []
+    pairs.sort(key=lambda pair: pair[1])
+
+    # old 인덱스 기준 LIS (O(n log n))
+    tails: List[int] = []
+    tail_index: List[int] = []
+    previous: List[int] = [-1] * len(pairs)
+    for k, (a, _) in enumerate(pairs):
+        pos = bisect_left(tails, a)
+        if pos == len(tails):
+            tails.append(a)
+            tail_index.append(k)
+        else:
+            tails[pos] = a
+            tail_index[pos] = k
+        previous[k] = tail_index[pos - 1] if pos else -1
+    anchors = []
+    k = tail_index[-1]
+    while k >= 0:
+        anchors.append(pairs[k])
+        k = previous[k]
+    anchors.reverse()
+    return anchors
+
+
+def _match_region(
+    old: Sequence[str], a0: int, a1: int,
+    new: Sequence[str], b0: int, b1: int,
+    sentence_map: List[Optional[int]],
+) -> None:
+    # 앞뒤로 같은 구간은 바로 대응
+    while a0 < a1 and b0 < b1 and old[a0] == new[b0]:
+        sentence_map[b0] = a0
+        a0 += 1
+        b0 += 1
+    while a0 < a1 and b0 < b1 and old[a1 - 1] == new[b1 - 1]:
+        a1 -= 1
+        b1 -= 1
+        sentence_map[b1] = a1
+    if a0 == a1 or b0 == b1:
+        return
+
+    anchors = _unique_anchors(old, a0, a1, new, b0, b1)
+    if not anchors:
+        # 유일한 문장이 없는 (작은) 변경 구간만 difflib으로 비교
+        matcher = SequenceMatcher(None, old[a0:a1], new[b0:b1], autojunk=False)
+        for block in matcher.get_matching_blocks():
+            for offset in range(block.size):
+                sentence_map[b0 + block.b + offset] = a0 + block.a + offset
+        return
+
+    prev_a, prev_b = a0, b0
+    for a, b in anchors:
+        _match_region(old, prev_a, a, new, prev_b, b, sentence_map)
+        sentence_map[b] = a
+        prev_a, prev_b = a + 1, b + 1
+    _match_region(old, prev_a, a1, new, prev_b, b1, sentence_map)
+
+
+def build_sentence_map(old_hashes: Sequence[str], new_hashes: Sequence[str]) -> List[Optional[int]]:
+    """
+    새 문장 인덱스 -> 동일한 이전 문장 인덱스 (변경/추가된 문장은 None)
+
+    공통 앞뒤 구간과 양쪽에서 유일한 문장(앵커)으로 먼저 대응시키고,
+    앵커 사이의 변경 구간만 SequenceMatcher로 비교한다 (전체 비교는 긴 원고에서 거의 제곱 비용).
+    """
+    sentence_map: List[Optional[int]] = [None] * len(new_hashes)
+    _match_region(old_hashes, 0, len(old_hashes), new_hashes, 0, len(new_hashes), sentence_map)
+    return sentence_map
+
+
+def _previous_sentences(previous_result: Dict[str, Any]) -> List[str] | None:
+    sentences = previous_result.get("split_sentences")
+    if not isinstance(sentences, list):
+        split_payload = previous_result.get("split")
+        if isinstance(split_payload, dict):
+            sentences = split_payload.get("split_sentences")
+    if not isinstance(sentences, list):
+        return None
+    return [str(s) for s in sentences]
+
+
+def build_incremental_base(previous_result: Dict[str, Any] | None) -> Dict[str, Any] | None:
+    """
+    직전 분석 결과 -> 그래프 상태에 실을 증분 기준 (JSON 직렬화 가능)
+
+    {"sentence_hashes": [...], "results": {"trauma": {...}, "hate_bias": {...}, "spelling": {...}}}
+    """
+    if not isinstance(previous_result, dict):
+        return None
+    old_sentences = _previous_sentences(previous_result)
+    if not old_sentences:
+        return None
+
+    results = {}
+    for key in INCREMENTAL_AGENTS:
+        agent_result = previous_result.get(key)
+        if isinstance(agent_result, dict) and isinstance(agent_result.get("issues"), list):
+            results[key] = agent_result
+    if not results:
+        return None
+    return {"sentence_hashes": [sentence_hash(s) for s in old_sentences], "results": results}
+
+
+def build_incremental_state(
+    base: Dict[str, Any] | None,
+    new_sentences: Sequence[str] | None,
+) -> Dict[str, Any] | None:
+    """
+    증분 기준과 새 문장 목록으로 증분 분석 입력을 만든다.
+
+    반환 형식 (JSON 직렬화 가능):
+    {
+      "sentence_map": [old_idx | None, ...],
+      "results": {"trauma": {...}, "hate_bias": {...}, "spelling": {...}},
+      "reused_sentences": int,
+      "total_sentences": int,
+    }
+    """
+    if not isinstance(base, dict) or not new_sentences:
+        return None
+    old_hashes = base.get("sentence_hashes")
+    results = base.get("results")
+    if not old_hashes or not results:
+        return None
+
+    sentence_map = build_sentence_map(old_hashes, [sentence_hash(s) for s in new_sentences])
+    return {
+        "sentence_map": sentence_map,
+        "results": results,
+        "reused_sentences": sum(1 for idx in sentence_map if idx is not None),
+        "total_sentences": len(new_sentences),
+    }
+
+
+def incremental_input(incremental: Dict[str, Any] | None, agent_key: str) -> Dict[str, Any] | None:
+    """
+    에이전트 하나에 전달할 증분 입력 ({"sentence_map", "result"})
+    """
+    if not incremental:
+        return None
+    result = (incremental.get("results") or {}).get(agent_key)
+    if not result:
+        return None
+    return {"sentence_map": incremental.get("sentence_map") or [], "result": result}
@@ -1,3 +1,4 @@
+from bisect import bisect_right
 from typing import Any, Dict, List, Tuple
 
 
@@ -32,13 +33,125 @@ def _coerce_int(value: Any) -> int | None:
     return None
 
 
-def _find_sentence_index(quote: str, sentences: List[str]) -> int | None:
-    if not quote:
-        return None
-    for idx, sentence in enumerate(sentences):
-        if quote in sentence:
-            return idx
-    return None
+class _SentenceIndex:
+    """
+    인용문 -> 문장 인덱스 조회 (normalize_issues 1회당 한 번만 구성)
+
+    문장별 글자 n-gram -> 문장 id 목록(오름차순) 역색인을 한 번 만들고,
+    인용문의 n-gram 중 가장 드문 것의 후보 문장만 `quote in sentence`로 확인한다.
+    인용문 1개당 비용은 인용문 길이와 후보 수에 비례하고 원고 길이와는 무관하다.
+    n보다 짧은 인용문은 그 길이의 색인을 따로 (한 번만) 만든다. 같은 인용문은 캐시한다.
+
+    한 문장 안에서 못 찾은 인용문(문장 경계를 넘는 인용, 문장 사이 공백 포함)은
+    find_span으로 이어 붙인 문서 전체에서 찾고, 문장 시작 오프셋을 bisect해 문장 위치로 되돌린다.
+    """
+
+    _NGRAM = 3
+
+    def __init__(self, sentences: List[str], split_map: List[Dict[str, Any]] | None = None):
+        self.sentences = sentences
+        self.split_map = split_map or []
+        self._postings: Dict[int, Dict[str, List[int]]] = {}
+        self._cache: Dict[str, int | None] = {}
+        self._text: str | None = None
+        self._starts: List[int] = []
+        self._span_cache: Dict[str, Tuple[int, int, int, int] | None] = {}
+
+    def _index(self, n: int) -> Dict[str, List[int]]:
+        postings = self._postings.get(n)
+        if postings is None:
+            postings = {}
+            for sentence_id, sentence in enumerate(self.sentences):
+                for gram in {sentence[i:i + n] for i in range(len(sentence) - n + 1)}:
+                    postings.setdefault(gram, []).append(sentence_id)
+            self._postings[n] = postings
+        return postings
+
+    def find(self, quote: str) -> int | None:
+        if not quote:
+            return None
+        if quote in self._cache:
+            return self._cache[quote]
+        n = min(self._NGRAM, len(quote))
+        postings = self._index(n)
+        candidates: List[int] | None = None
+        for i in range(len(quote) - n + 1):
+            posting = postings.get(quote[i:i + n])
+            if posting is None:
+                candidates = []
+                break
+            if candidates is None or len(posting) < len(candidates):
+                candidates = posting
+        # 후보는 오름차순 -> 인용문을 포함하는 첫 문장 (기존 선형 탐색과 같은 결과)
+        idx = next((sid for sid in candidates or [] if quote in self.sentences[sid]), None)
+        if idx is None:
+            span = self.find_span(quote)
+            idx = span[0] if span else None
+        self._cache[quote] = idx
+        return idx
+
+    def _gap(self, index: int) -> str:
+        # 원문에서 두 문장 사이에 공백이 있었으면 공백 하나로 잇는다
+        if 0 < index < len(self.split_map):
+            prev, cur = self.split_map[index - 1], self.split_map[index]
+            if isinstance(prev, dict) and isinstance(cur, dict):
+                prev_end, cur_start = prev.get("doc_end"), cur.get("doc_start")
+                if isinstance(prev_end, int) and isinstance(cur_start, int) and cur_start <= prev_end:
+                    return ""
+        return " "
+
+    def _build_text(self) -> None:
+        parts: List[str] = []
+        starts: List[int] = []
+        pos = 0
+        for index, sentence in enumerate(self.sentences):
+            if index:
+                gap = self._gap(index)
+                parts.append(gap)
+                pos += len(gap)
+            starts.append(pos)
+            parts.append(sentence)
+            pos += len(sentence)
+        self._starts = starts
+        self._text = "".join(parts)
+
+    def find_span(self, quote: str, near: int | None = None) -> Tuple[int, int, int, int] | None:
+        """
+        문서 전체에서 quote 위치 (시작 문장, 시작 문장 내 오프셋, 끝 문장, 끝 문장 내 오프셋)
+
+        인용문 안의 공백/줄바꿈 연속은 공백 하나로 보고 찾는다.
+        near(힌트 문장)가 주어지면 그 앞뒤 문장에서 시작하는 위치만 본다.
+        """
+        quote = " ".join(quote.split())
+        if not quote or not self.sentences:
+            return None
+        if self._text is None:
+            self._build_text()
+        if near is not None:
+            if not 0 <= near < len(self.sentences):
+                return None
+            lo = max(0, near - _FUZZY_NEIGHBOR_SENTENCES)
+            hi = min(len(self.sentences) - 1, near + _FUZZY_NEIGHBOR_SENTENCES)
+            limit = self._starts[hi] + len(self.sentences[hi]) + len(quote)
+            pos = self._text.find(quote, self._starts[lo], limit)
+            if pos == -1 or bisect_right(self._starts, pos) - 1 > hi:
+                return None
+            return self._to_span(pos, len(quote))
+        if quote not in self._span_cache:
+            pos = self._text.find(quote)
+            self._span_cache[quote] = self._to_span(pos, len(quote)) if pos != -1 else None
+        return self._span_cache[quote]
+
+    def _to_span(self, pos: int, length: int) -> Tuple[int, int, int, int]:
+        end = pos + length
+        first = bisect_right(self._starts, pos) - 1
+        last = bisect_right(self._starts, end - 1) - 1
+        return (
+            first,
+            min(pos - self._starts[first], len(self.sentences[first])),
+            last,
+            min(end - self._starts[last], len(self.sentences[last])),
+        )
 
 
 def _find_char_range_with_hint(
@@ -77,6 +190,82 @@ def _find_char_range(quote: str, sentence: str) -> Tuple[int | None, int | None]
     # Deprecated: Use _find_char_range_with_hint instead if possible
     return _find_char_range_with_hint(quote, sentence, None)
 
+_FUZZY_MAX_ERROR_RATE = 0.25  # 인용문 길이 대비 허용 편집 거리
+_FUZZY_MIN_QUOTE_LEN = 4  # 너무 짧은 인용문은 근사 매칭하지 않음 (오탐 방지)
+_FUZZY_NEIGHBOR_SENTENCES = 1  # 힌트 문장 앞뒤로 함께 찾아볼 문장 수
+
+
+def _myers_scan(pattern: str, text: str) -> List[int]:
+    """
+    Myers 비트 병렬 근사 매칭 (Hyyrö 변형)
+
+    text의 각 위치 j에서 끝나는 부분 문자열과 pattern 사이 최소 편집 거리 목록.
+    파이썬 int를 비트 벡터로 쓰므로 pattern 길이 제한이 없고, 전체 O(len(text) * ceil(m / word)).
+    """
+    m = len(pattern)
+    full = (1 << m) - 1
+    high = 1 << (m - 1)
+    peq: Dict[str, int] = {}
+    for i, ch in enumerate(pattern):
+        peq[ch] = peq.get(ch, 0) | (1 << i)
+
+    pv, mv, score = full, 0, m
+    scores: List[int] = []
+    for ch in text:
+        eq = peq.get(ch, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | (~(xh | pv) & full)
+        mh = pv & xh
+        if ph & high:
+            score += 1
+        elif mh & high:
+            score -= 1
+        # 검색 모드: text 어느 위치에서든 매칭을 시작할 수 있으므로 0행 carry 없음
+        ph = (ph << 1) & full
+        mh = (mh << 1) & full
+        pv = mh | (~(xv | ph) & full)
+        mv = ph & xv
+        scores.append(score)
+    return scores
+
+
+def _fuzzy_find(
+    quote: str,
+    sentence: str,
+    hint_start: int | None = None,
+) -> Tuple[int | None, int | None, float]:
+    """
+    sentence 안에서 quote와 편집 거리가 가장 작은 구간 (start, end, confidence)
+
+    confidence = 1 - 편집 거리 / len(quote). 허용 거리를 넘으면 (None, None, 0.0)
+    """
+    m = len(quote)
+    if m < _FUZZY_MIN_QUOTE_LEN or not sentence:
+        return None, None, 0.0
+    max_dist = max(1, int(m * _FUZZY_MAX_ERROR_RATE))
+
+    scores = _myers_scan(quote, sentence)
+    best = min(scores)
+    if best > max_dist:
+        return None, None, 0.0
+    ends = [j for j, score in enumerate(scores) if score == best]
+    if hint_start is not None:
+        # 같은 거리면 LLM이 준 위치에 가까운 쪽
+        end = min(ends, key=lambda j: abs(j + 1 - m - hint_start))
+    else:
+        end = ends[0]
+
+    # 시작 위치: 뒤집은 pattern/text로 다시 스캔해 같은 거리로 끝나는 가장 가까운 지점
+    lo = max(0, end + 1 - m - max_dist)
+    window = sentence[lo:end + 1][::-1]
+    reverse_scores = _myers_scan(quote[::-1], window)
+    reverse_best = min(reverse_scores)
+    length = reverse_scores.index(reverse_best) + 1
+    start = end + 1 - length
+    return start, end + 1, round(1.0 - best / m, 3)
+
+
 def _strip_markup(quote: str) -> str:
     if not quote:
         return ""
@@ -88,7 +277,8 @@ def _build_location(
     issue: dict,
     sentences: List[str],
     split_map: List[Dict[str, Any]],
-) -> Dict[str, int] | None:
+    sentence_lookup: _SentenceIndex | None = None,
+) -> Dict[str, Any] | None:
     location_payload = issue.get("location") if isinstance(issue.get("location"), dict) else {}
     sentence_index = location_payload.get("sentence_index", issue.get("sentence_index"))
     char_start = location_payload.get("char_start", issue.get("char_start"))
@@ -101,11 +291,14 @@ def _build_location(
     char_start = _coerce_int(char_start)
     char_end = _coerce_int(char_end)
 
+    if sentence_lookup is None:
+        sentence_lookup = _SentenceIndex(sentences, split_map)
+
     # 1. 인덱스가 아예 없는 경우에만 전역 검색 (기존 로직 유지)
     if sentence_index is None or sentence_index >= len(sentences):
-        sentence_index = _find_sentence_index(quote, sentences)
+        sentence_index = sentence_lookup.find(quote)
         if sentence_index is None and quote_stripped:
-            sentence_index = _find_sentence_index(quote_stripped, sentences)
+            sentence_index = sentence_lookup.find(quote_stripped)
     
     # 2. 인덱스가 유효하지 않으면 포기
     if sentence_index is None or sentence_index >= len(sentences):
@@ -117,6 +310,7 @@ def _build_location(
     
     # 4. 문장 내에서 Quote 찾기 (Proximity Search 적용)
     final_start, final_end = None, None
+    confidence = 1.0
 
     # 4-1. LLM이 준 char offset이 유효하고, 실제 텍스트와 일치하는지 확인
     if char_start is not None and char_end is not None:
@@ -140,9 +334,33 @@ def _build_location(
             if s is not None:
                 final_start, final_end = s, e
 
+    # 4-3. 문장 경계를 넘는 인용문은 힌트 문장 주변의 이어 붙인 문서에서 찾는다
+    if final_start is None and quote_stripped:
+        span = sentence_lookup.find_span(quote_stripped, near=sentence_index)
+        if span is not None:
+            return _span_location(span, sentences, split_map)
+
+    # 4-4. 정확히 일치하지 않으면 근사 매칭 (공백/구두점/마크다운 차이 허용)
+    #      힌트 문장과 앞뒤 문장을 함께 보고 편집 거리가 가장 작은 곳에 고정
+    if final_start is None and quote_stripped:
+        best: Tuple[float, int, int, int] | None = None
+        lo = max(0, sentence_index - _FUZZY_NEIGHBOR_SENTENCES)
+        hi = min(len(sentences), sentence_index + _FUZZY_NEIGHBOR_SENTENCES + 1)
+        for candidate in range(lo, hi):
+            hint = char_start if candidate == sentence_index else None
+            s, e, score = _fuzzy_find(quote_stripped, sentences[candidate], hint)
+            # 동점이면 힌트 문장 우선
+            if s is not None and (best is None or score > best[0] or (score == best[0] and candidate == sentence_index)):
+                best = (score, candidate, s, e)
+        if best is not None:
+            confidence, sentence_index, final_start, final_end = best
+            sentence = sentences[sentence_index]
+            sentence_len = len(sentence)
+
     # 5. [Fallback] 정 못 찾겠으면 문장 전체 하이라이팅 (다른 문장으로 튀는 것보다 낫다)
     if final_start is None:
         final_start, final_end = 0, sentence_len
+        confidence = 0.0 if quote else 1.0
 
     if sentence_index >= len(split_map):
         return None
@@ -159,6 +377,29 @@ def _build_location(
         "char_end": int(final_end),
         "doc_start": int(doc_start) + int(final_start),
         "doc_end": int(doc_start) + int(final_end),
+        "confidence": confidence,  # 인용문 고정 신뢰도 (1.0 정확 일치, 0.0 문장 전체 대체)
+    }
+
+
+def _span_location(
+    span: Tuple[int, int, int, int],
+    sentences: List[str],
+    split_map: List[Dict[str, Any]],
+) -> Dict[str, Any] | None:
+    first, start, last, end = span
+    if last >= len(split_map) or not isinstance(split_map[first], dict) or not isinstance(split_map[last], dict):
+        return None
+    first_start = split_map[first].get("doc_start")
+    last_start = split_map[last].get("doc_start")
+    if first_start is None or last_start is None:
+        return None
+    return {
+        "sentence_index": int(first),
+        "char_start": int(start),
+        "char_end": int(end) if first == last else len(sentences[first]),
+        "doc_start": int(first_start) + int(start),
+        "doc_end": int(last_start) + int(end),
+        "confidence": 1.0,
     }
 
 
@@ -168,6 +409,7 @@ def _normalize_issue(
     sentences: List[str],
     split_map: List[Dict[str, Any]],
     index: int,
+    sentence_lookup: _SentenceIndex | None = None,
 ) -> Dict[str, Any] | None:
     issue_type = (
         raw_issue.get("issue_type")
@@ -192,7 +434,7 @@ def _normalize_issue(
     suggestion = raw_issue.get("suggestion")
     confidence = _safe_number(raw_issue.get("confidence"))
 
-    location = _build_location(raw_issue, sentences, split_map)
+    location = _build_location(raw_issue, sentences, split_map, sentence_lookup)
 
     if location and not quote:
         quote = sentences[location["sentence_index"]][
@@ -221,6 +463,9 @@ def normalize_issues(outputs: dict, split_payload: dict | None) -> Tuple[List[di
     if not isinstance(split_map, list):
         split_map = []
 
+    sentences = [s if isinstance(s, str) else str(s) for s in sentences]
+    sentence_lookup = _SentenceIndex(sentences, split_map)
+
     normalized: List[dict] = []
     highlight_items: List[dict] = []
 
@@ -230,7 +475,7 @@ def normalize_issues(outputs: dict, split_payload: dict | None) -> Tuple[List[di
             if not isinstance(raw_issue, dict):
                 continue
             normalized_issue = _normalize_issue(
-                agent_key, raw_issue, sentences, split_map, len(normalized)
+                agent_key, raw_issue, sentences, split_map, len(normalized), sentence_lookup
             )
             if not normalized_issue:
                 continue
@@ -260,6 +505,7 @@ def normalize_issues(outputs: dict, split_payload: dict | None) -> Tuple[List[di
                 "doc_end": doc_end,
                 "label": issue.get("issue_type"),
                 "reason": issue.get("reason") or issue.get("issue_type"),
+                "anchor_confidence": location.get("confidence"),
             }
         )
 
@@ -0,0 +1,408 @@
+"""
+백그라운드 분석 작업 큐
+
+- 작업/이벤트는 DB(analysis_jobs, analysis_job_events)에 저장되므로
+  클라이언트 연결이 끊기거나 API 프로세스가 재시작돼도 작업이 사라지지 않는다.
+- 워커 풀은 queued 작업을 조건부 UPDATE로 가져가므로(claim) 여러 프로세스에서 동시에 돌려도 된다.
+  (API 프로세스 내장 워커: analysis_job_workers, 별도 프로세스: scripts/run_job_worker.py)
+- 실행 중 작업은 heartbeat를 갱신하고, heartbeat가 끊긴 작업은 다시 queued로 돌린다.
+- 진행 이벤트는 seq 순서로 저장되어 job id + 마지막 seq로 NDJSON 스트림에 다시 붙을 수 있다.
+"""
+import asyncio
+import contextlib
+import logging
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Dict, List, Set
+
+from sqlalchemy import func, select, update
+
+from app.core.db import Analysis, AnalysisJob, AnalysisJobEvent, Document, get_session
+from app.core.serialization import dumps_text, loads, raw_json
+from app.core.settings import get_settings
+from app.services.analysis_runner import stream_analysis_for_text
+from app.services.analysis_store import build_analysis, load_incremental_base
+from app.services.result_storage import load_result_json
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = {"done", "failed"}
+
+# 같은 프로세스 안의 스트림 구독자 깨우기 (다른 프로세스 워커는 폴링으로 감지)
+_job_listeners: Dict[str, Set[asyncio.Event]] = {}
+
+
+def _notify(job_id: str) -> None:
+    for event in _job_listeners.get(job_id, ()):
+        event.set()
+
+
+async def _wait_for_update(job_id: str, timeout: float) -> None:
+    event = asyncio.Event()
+    _job_listeners.setdefault(job_id, set()).add(event)
+    try:
+        with contextlib.suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(event.wait(), timeout=timeout)
+    finally:
+        listeners = _job_listeners.get(job_id)
+        if listeners is not None:
+            listeners.discard(event)
+            if not listeners:
+                del _job_listeners[job_id]
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+# --------------------------------------------------
+# Jobs
+# --------------------------------------------------
+async def enqueue_analysis_job(
+    document_id: str,
+    mode: str,
+    options: Dict[str, Any] | None = None,
+    incremental: bool = True,
+    user_id: str | None = None,
+) -> AnalysisJob:
+    async with get_session() as session:
+        job = AnalysisJob(
+            id=str(uuid.uuid4()),
+            document_id=document_id,
+            user_id=user_id,
+            status="queued",
+            mode=mode,
+            options_json=dumps_text(options or {}),
+            incremental=incremental,
+            attempts=0,
+        )
+        session.add(job)
+        await session.commit()
+    get_job_worker_pool().wake()
+    return job
+
+
+async def retry_analysis_job(job_id: str) -> bool:
+    """
+    실패한 작업을 다시 대기열에 넣는다 (그래프는 마지막 체크포인트부터 재개)
+    """
+    async with get_session() as session:
+        res = await session.execute(
+            update(AnalysisJob)
+            .where(AnalysisJob.id == job_id, AnalysisJob.status == "failed")
+            .values(status="queued", error=None, worker_id=None, finished_at=None)
+        )
+        await session.commit()
+    if res.rowcount != 1:
+        return False
+    get_job_worker_pool().wake()
+    return True
+
+
+async def get_analysis_job(job_id: str) -> AnalysisJob | None:
+    async with get_session() as session:
+        return await session.get(AnalysisJob, job_id)
+
+
+async def _shielded(coro) -> Any:
+    # 워커 종료(cancel) 중에 쓰기 트랜잭션이 중간에 끊겨 SQLite 잠금이 남지 않도록 끝까지 실행
+    return await asyncio.shield(asyncio.ensure_future(coro))
+
+
+async def append_job_event(job_id: str, seq: int, event: Dict[str, Any]) -> None:
+    async def _write() -> None:
+        async with get_session() as session:
+            session.add(
+                AnalysisJobEvent(
+                    job_id=job_id,
+                    seq=seq,
+                    event_json=dumps_text(event),
+                )
+            )
+            await session.commit()
+
+    await _shielded(_write())
+    _notify(job_id)
+
+
+async def _last_seq(job_id: str) -> int:
+    async with get_session() as session:
+        res = await session.execute(
+            select(func.max(AnalysisJobEvent.seq)).where(AnalysisJobEvent.job_id == job_id)
+        )
+        return res.scalar() or 0
+
+
+async def iter_job_events(job_id: str, after: int = 0) -> AsyncIterator[Dict[str, Any]]:
+    """
+    seq > after 인 이벤트를 순서대로 내보내고, 작업이 끝날 때까지 새 이벤트를 기다린다.
+
+    final_result 이벤트는 analysis_id만 저장되어 있으므로 전송 시 Analysis 결과로 채운다.
+    (저장된 결과 JSON을 파싱하지 않고 raw_json으로 그대로 실어 보낸다 -> 직렬화는 저장 시 1회)
+    """
+    poll_interval = get_settings().analysis_job_poll_interval
+    while True:
+        async with get_session() as session:
+            # 상태를 먼저 읽어야 "끝남 + 남은 이벤트 없음" 판단이 경쟁 없이 맞다
+            # (워커는 모든 이벤트를 저장한 뒤 작업을 종료 상태로 바꾼다)
+            job = await session.get(AnalysisJob, job_id)
+            if job is None:
+                return
+            status = job.status
+            res = await session.execute(
+                select(AnalysisJobEvent)
+                .where(AnalysisJobEvent.job_id == job_id, AnalysisJobEvent.seq > after)
+                .order_by(AnalysisJobEvent.seq)
+                .limit(200)
+            )
+            rows = res.scalars().all()
+
+        for row in rows:
+            after = row.seq
+            event = loads(row.event_json)
+            if event.get("type") == "final_result" and "data" not in event:
+                event["data"] = await _load_analysis_result_json(event.get("analysis_id"))
+            yield {"job_id": job_id, "seq": row.seq, **event}
+
+        if rows:
+            continue
+        if status in TERMINAL_STATUSES:
+            return
+        await _wait_for_update(job_id, poll_interval)
+
+
+async def _save_analysis(document_id: str, result: Dict[str, Any]) -> str:
+    # 수 MB 결과의 직렬화가 이벤트 루프를 막지 않도록 스레드에서 수행
+    analysis = await asyncio.to_thread(build_analysis, document_id, result)
+    async with get_session() as session:
+        session.add(analysis)
+        await session.commit()
+        return analysis.id
+
+
+async def _load_analysis_result_json(analysis_id: str | None) -> Any:
+    if not analysis_id:
+        return None
+    async with get_session() as session:
+        analysis = await session.get(Analysis, analysis_id)
+        if not analysis:
+            return None
+        return raw_json(await load_result_json(session, analysis))
+
+
+# --------------------------------------------------
+# Worker pool
+# --------------------------------------------------
+class AnalysisJobWorkerPool:
+    def __init__(self, workers: int, poll_interval: float, stale_seconds: float, max_attempts: int):
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.stale_seconds = stale_seconds
+        self.max_attempts = max(1, max_attempts)
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup: asyncio.Event | None = None
+        self.running_jobs: Set[str] = set()
+
+    def wake(self) -> None:
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def start(self) -> None:
+        if self._tasks or self.workers <= 0:
+            return
+        self._wakeup = asyncio.Event()
+        await self.requeue_stale_jobs()
+        self._tasks = [asyncio.create_task(self._worker_loop(i)) for i in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._reaper_loop()))
+        logger.info(f"[JOBS] Started {self.workers} analysis workers ({self.worker_id})")
+
+    async def stop(self) -> None:
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            with contextlib.suppress(asyncio.CancelledError, Exception):
+                await task
+        # 중단된 작업은 다른 워커(또는 재시작 후)가 바로 이어받도록 되돌린다
+        if self.running_jobs:
+            async with get_session() as session:
+                await session.execute(
+                    update(AnalysisJob)
+                    .where(AnalysisJob.id.in_(self.running_jobs), AnalysisJob.status == "running")
+                    .values(status="queued", worker_id=None)
+                )
+                await session.commit()
+            self.running_jobs.clear()
+
+    def stats(self) -> dict:
+        return {"workers": self.workers, "running": len(self.running_jobs)}
+
+    async def _worker_loop(self, index: int) -> None:
+        while True:
+            # claim 전에 clear해야 그 사이 들어온 wake()를 놓치지 않는다
+            self._wakeup.clear()
+            try:
+                job_id = await _shielded(self._claim_next())
+            except Exception as e:
+                logger.error(f"[JOBS] Worker {index} failed to claim a job: {e}")
+                job_id = None
+            if job_id is None:
+                with contextlib.suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                continue
+            await self._run_job(job_id)
+
+    async def _claim_next(self) -> str | None:
+        async with get_session() as session:
+            res = await session.execute(
+                select(AnalysisJob.id)
+                .where(AnalysisJob.status == "queued")
+                .order_by(AnalysisJob.created_at)
+                .limit(5)
+            )
+            for job_id in res.scalars().all():
+                # 조건부 UPDATE로 한 워커만 가져가도록 보장
+                claimed = await session.execute(
+                    update(AnalysisJob)
+                    .where(AnalysisJob.id == job_id, AnalysisJob.status == "queued")
+                    .values(
+                        status="running",
+                        worker_id=self.worker_id,
+                        attempts=AnalysisJob.attempts + 1,
+                        started_at=_utcnow(),
+                        heartbeat_at=_utcnow(),
+                    )
+                )
+                await session.commit()
+                if claimed.rowcount == 1:
+                    return job_id
+        return None
+
+    async def _run_job(self, job_id: str) -> None:
+        self.running_jobs.add(job_id)
+        heartbeat = asyncio.create_task(self._heartbeat_loop(job_id))
+        try:
+            analysis_id, error = await self._execute(job_id)
+        except Exception as e:
+            logger.error(f"[JOBS] Job {job_id} failed: {e}", exc_info=True)
+            analysis_id, error = None, str(e)
+        finally:
+            # CancelledError(워커 종료)는 그대로 전파 -> stop()에서 queued로 되돌린다
+            heartbeat.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await heartbeat
+
+        status = "done" if analysis_id else "failed"
+        if status == "failed" and not error:
+            error = "Analysis finished without a result"
+        await self._finish(job_id, status, analysis_id, error)
+        self.running_jobs.discard(job_id)
+
+    async def _execute(self, job_id: str) -> tuple[str | None, str | None]:
+        async with get_session() as session:
+            job = await session.get(AnalysisJob, job_id)
+            document = await session.get(Document, job.document_id) if job else None
+            if job is None or document is None:
+                return None, "Document not found"
+            incremental_base = None
+            if job.mode == "full" and job.incremental:
+                incremental_base = await load_incremental_base(session, job.document_id)
+            document_id, text, context = document.id, document.extracted_text, document.meta_json
+            mode, options, attempts = job.mode, loads(job.options_json or "{}"), job.attempts
+
+        analysis_id, error = None, None
+        seq = await _last_seq(job_id)
+        if attempts > 1:
+            seq += 1
+            await append_job_event(job_id, seq, {"type": "job_restarted", "attempt": attempts})
+
+        async for event in stream_analysis_for_text(
+            text,
+            context=context,
+            mode=mode,
+            options=options,
+            incremental_base=incremental_base,
+            run_id=job_id,  # 재시도 시 그래프 체크포인트에서 이어서 실행
+        ):
+            if event["type"] == "final_result":
+                analysis_id = await _shielded(_save_analysis(document_id, event["data"]))
+                # 결과 본문은 Analysis에만 저장 (재전송 시 채워 넣음)
+                event = {"type": "final_result", "analysis_id": analysis_id}
+            elif event["type"] == "error":
+                error = event.get("message")
+            seq += 1
+            await append_job_event(job_id, seq, event)
+        return analysis_id, error
+
+    async def _finish(self, job_id: str, status: str, analysis_id: str | None, error: str | None) -> None:
+        async with get_session() as session:
+            await session.execute(
+                update(AnalysisJob)
+                .where(AnalysisJob.id == job_id)
+                .values(status=status, analysis_id=analysis_id, error=error, finished_at=_utcnow())
+            )
+            await session.commit()
+        _notify(job_id)
+
+    async def _heartbeat_loop(self, job_id: str) -> None:
+        interval = max(1.0, self.stale_seconds / 3)
+        while True:
+            await asyncio.sleep(interval)
+            with contextlib.suppress(Exception):
+                await _shielded(self._touch(job_id))
+
+    async def _touch(self, job_id: str) -> None:
+        async with get_session() as session:
+            await session.execute(
+                update(AnalysisJob)
+                .where(AnalysisJob.id == job_id, AnalysisJob.worker_id == self.worker_id)
+                .values(heartbeat_at=_utcnow())
+            )
+            await session.commit()
+
+    async def _reaper_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.stale_seconds)
+            with contextlib.suppress(Exception):
+                await self.requeue_stale_jobs()
+
+    async def requeue_stale_jobs(self) -> int:
+        """
+        heartbeat가 끊긴(워커가 죽은) running 작업을 다시 queued로 돌리거나,
+        재시도 횟수를 넘기면 failed로 마감한다.
+        """
+        cutoff = _utcnow() - timedelta(seconds=self.stale_seconds)
+        stale = (AnalysisJob.status == "running") & (AnalysisJob.heartbeat_at < cutoff)
+        async with get_session() as session:
+            failed = await session.execute(
+                update(AnalysisJob)
+                .where(stale, AnalysisJob.attempts >= self.max_attempts)
+                .values(status="failed", error="Worker lost", finished_at=_utcnow())
+            )
+            requeued = await session.execute(
+                update(AnalysisJob).where(stale).values(status="queued", worker_id=None)
+            )
+            await session.commit()
+        if failed.rowcount or requeued.rowcount:
+            logger.warning(f"[JOBS] Stale jobs: requeued={requeued.rowcount}, failed={failed.rowcount}")
+            self.wake()
+        return requeued.rowcount
+
+
+_pool: AnalysisJobWorkerPool | None = None
+
+
+def get_job_worker_pool(workers: int | None = None) -> AnalysisJobWorkerPool:
+    global _pool
+    if _pool is None:
+        settings = get_settings()
+        _pool = AnalysisJobWorkerPool(
+            workers=settings.analysis_job_workers if workers is None else workers,
+            poll_interval=settings.analysis_job_poll_interval,
+            stale_seconds=settings.analysis_job_stale_seconds,
+            max_attempts=settings.analysis_job_max_attempts,
+        )
+    return _pool
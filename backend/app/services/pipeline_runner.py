@@ -1,5 +1,7 @@
 # app/services/pipeline_runner.py
 
+from collections.abc import Mapping
+
 from app.agents.tools.split import Splitter
 from app.agents.tools.tone_agent import ToneEvaluatorAgent
 from app.agents.tools.causality_agent import CausalityEvaluatorAgent
@@ -9,6 +11,7 @@ from app.agents.tools.Spelling_Agent import SpellingAgent
 from app.agents.tools.Trauma_agent import TraumaAgent
 from app.agents.tools.HateBias_agent import HateBiasAgent
 from app.agents.tools.GenerCliche_agent import GenreClicheAgent
+from app.agents.tools.SurfaceScan_agent import SurfaceScanAgent
 
 from app.agents.tools.render_persona import ReaderPersonaAgent
 from app.agents.tools.persona_feedback import PersonaFeedbackAgent
@@ -22,8 +25,9 @@ from app.agents.tools.report_agent import ComprehensiveReportAgent
 # Evaluators removed
 # ...
 
+from app.core.settings import get_settings
 from app.services.issue_normalizer import normalize_issues
-from app.services.split_map import build_split_payload
+from app.services.split_map import SplitPayload, build_split_payload, materialize_split_payload
 
 
 # ---- singleton instances (서비스와 동일)
@@ -36,6 +40,7 @@ spelling_agent = SpellingAgent()
 trauma_agent = TraumaAgent()
 hate_bias_agent = HateBiasAgent()
 genre_cliche_agent = GenreClicheAgent()
+surface_scan_agent = SurfaceScanAgent()
 
 persona_agent = ReaderPersonaAgent()
 persona_feedback_agent = PersonaFeedbackAgent()
@@ -51,13 +56,13 @@ report_agent = ComprehensiveReportAgent()
 
 
 def run_full_pipeline(text: str, *, debug: bool = False, mode: str = "full"):
-    def _fallback_split_payload(source_text: str) -> dict:
+    def _fallback_split_payload(source_text: str) -> SplitPayload:
         return build_split_payload(source_text)
 
     # 1. split
     try:
         split_result = splitter.run(text)
-        if not isinstance(split_result, dict):
+        if not isinstance(split_result, Mapping):
             split_result = _fallback_split_payload(str(split_result))
     except Exception as e:
         print(f"Splitter failed: {e}")
@@ -111,10 +116,17 @@ def run_full_pipeline(text: str, *, debug: bool = False, mode: str = "full"):
     if mode == "full":
         tone = safe_run(tone_agent, split_result, persona=reader_context)
         tension = safe_run(tension_agent, split_result, persona=reader_context)
-        trauma = safe_run(trauma_agent, split_result)
-        hate = safe_run(hate_bias_agent, split_result)
         cliche = safe_run(genre_cliche_agent, split_result, persona=reader_context)
-        spelling = safe_run(spelling_agent, split_result)
+        if get_settings().fused_surface_scan:
+            scan = safe_run(surface_scan_agent, split_result)
+            if "error" in scan:
+                trauma, hate, spelling = dict(scan), dict(scan), dict(scan)
+            else:
+                trauma, hate, spelling = scan["trauma"], scan["hate_bias"], scan["spelling"]
+        else:
+            trauma = safe_run(trauma_agent, split_result)
+            hate = safe_run(hate_bias_agent, split_result)
+            spelling = safe_run(spelling_agent, split_result)
 
     # 5. aggregate
     aggregate = None
@@ -214,6 +226,8 @@ def run_full_pipeline(text: str, *, debug: bool = False, mode: str = "full"):
         "report": report,
         "qa_scores": qa_scores,
     }
+    split_result = materialize_split_payload(split_result)
+    result["split"] = split_result
     normalized_issues, highlights = normalize_issues(result, split_result)
     result["normalized_issues"] = normalized_issues
     result["highlights"] = highlights
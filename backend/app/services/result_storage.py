@@ -0,0 +1,245 @@
+"""
+분석 결과 저장 형식 (analyses.result_format = "sections")
+
+- 같은 값을 가리키는 별칭 키(report/final_report, aggregate/aggregated, logic/causality,
+  split_sentences/split_map -> split 내부)는 한 번만 저장하고 별칭 목록만 남긴다.
+- 결과를 섹션(issues, report, split, tension_curve, core)으로 나눠 analysis_sections에 따로 저장하고
+  각 섹션은 zstd로 압축한다.
+- fields 프로젝션이 주어지면 필요한 섹션만 읽어 푼다 (이력/목록 화면에서 전체 결과를 풀지 않도록).
+- 전체 결과 응답(load_result_json)은 파싱하지 않는다: 압축을 푼 섹션 JSON을 바이트 그대로 이어 붙이고,
+  별칭 값은 저장 시 기록한 바이트 구간(span)을 잘라 붙인다.
+- result_format = "json"인 예전 행은 result_json 그대로 읽는다.
+"""
+import asyncio
+from typing import Any, Dict, Iterable, List, Tuple
+
+from sqlalchemy import select
+import zstandard
+
+from app.core.db import Analysis, AnalysisSection
+from app.core.serialization import dumps, loads
+
+RESULT_FORMAT = "sections"
+LEGACY_RESULT_FORMAT = "json"
+
+# 별칭 키 -> 실제 값 위치 (최상위 키, 하위 키...)
+ALIASES: Dict[str, Tuple[str, ...]] = {
+    "final_report": ("report",),
+    "aggregated": ("aggregate",),
+    "causality": ("logic",),
+    "split_sentences": ("split", "split_sentences"),
+    "split_map": ("split", "split_map"),
+}
+
+# 섹션 -> 최상위 키 (여기 없는 키는 core)
+SECTIONS: Dict[str, Tuple[str, ...]] = {
+    "issues": ("tone", "logic", "trauma", "hate_bias", "genre_cliche", "spelling", "normalized_issues", "highlights"),
+    "report": ("report",),
+    "split": ("split",),
+    "tension_curve": ("tension_curve",),
+}
+CORE_SECTION = "core"
+ALIAS_SECTION = "aliases"
+
+_SECTION_OF_KEY = {key: name for name, keys in SECTIONS.items() for key in keys}
+
+# 이 크기 미만의 섹션은 압축하지 않는다 (헤더 비용이 더 큼)
+_MIN_COMPRESS_BYTES = 256
+_ZSTD_LEVEL = 3
+
+
+def _get_path(result: Dict[str, Any], path: Tuple[str, ...]) -> Any:
+    value: Any = result
+    for key in path:
+        if not isinstance(value, dict) or key not in value:
+            return None
+        value = value[key]
+    return value
+
+
+def _has_path(result: Dict[str, Any], path: Tuple[str, ...]) -> bool:
+    parent = _get_path(result, path[:-1]) if len(path) > 1 else result
+    return isinstance(parent, dict) and path[-1] in parent
+
+
+def _compress(raw: bytes) -> Tuple[str, bytes]:
+    if len(raw) < _MIN_COMPRESS_BYTES:
+        return "none", raw
+    return "zstd", zstandard.ZstdCompressor(level=_ZSTD_LEVEL).compress(raw)
+
+
+def _decompress(codec: str, data: bytes) -> bytes:
+    if codec == "none":
+        return data
+    if codec == "zstd":
+        return zstandard.ZstdDecompressor().decompress(data)
+    raise ValueError(f"Unknown section codec: {codec}")
+
+
+def _dump_with_spans(
+    value: Any,
+    paths: set[Tuple[str, ...]],
+    prefix: Tuple[str, ...] = (),
+) -> Tuple[bytes, Dict[Tuple[str, ...], Tuple[int, int]]]:
+    """
+    dumps(value)와 같은 JSON + paths에 있는 값들의 바이트 구간 {path: (start, end)}
+
+    paths로 내려가는 dict만 키 단위로 직접 이어 붙이고 나머지는 dumps() 그대로 쓴다.
+    """
+    depth = len(prefix)
+    if not isinstance(value, dict) or not any(len(path) > depth and path[:depth] == prefix for path in paths):
+        return dumps(value), {}
+    out = bytearray(b"{")
+    spans: Dict[Tuple[str, ...], Tuple[int, int]] = {}
+    for i, (key, item) in enumerate(value.items()):
+        if i:
+            out += b","
+        key = key if isinstance(key, str) else str(key)
+        out += dumps(key) + b":"
+        child = prefix + (key,)
+        start = len(out)
+        data, child_spans = _dump_with_spans(item, paths, child)
+        out += data
+        if child in paths:
+            spans[child] = (start, len(out))
+        for path, (s, e) in child_spans.items():
+            spans[path] = (start + s, start + e)
+    out += b"}"
+    return bytes(out), spans
+
+
+def build_sections(result: Dict[str, Any]) -> List[AnalysisSection]:
+    """
+    결과 dict -> AnalysisSection 행 목록 (analysis_id는 Analysis.sections 관계로 채워진다)
+
+    별칭 항목: {"path": 실제 값 위치, "section": 섹션 이름, "span": [start, end] (압축 전 섹션 JSON 기준)}
+    """
+    aliases: Dict[str, List[str]] = {}
+    grouped: Dict[str, Dict[str, Any]] = {}
+    for key, value in result.items():
+        target = ALIASES.get(key)
+        if target is not None and _has_path(result, target):
+            canonical = _get_path(result, target)
+            if canonical is value or (value is not None and canonical == value):
+                aliases[key] = list(target)
+                continue
+        grouped.setdefault(_SECTION_OF_KEY.get(key, CORE_SECTION), {})[key] = value
+
+    alias_entries: Dict[str, Dict[str, Any]] = {}
+    rows = []
+    for name, payload in grouped.items():
+        paths = {tuple(path) for path in aliases.values() if path[0] in payload}
+        raw, spans = _dump_with_spans(payload, paths)
+        for alias, path in aliases.items():
+            span = spans.get(tuple(path))
+            if span is not None:
+                alias_entries[alias] = {"path": path, "section": name, "span": list(span)}
+        codec, data = _compress(raw)
+        rows.append(AnalysisSection(name=name, codec=codec, data=data, raw_bytes=len(raw)))
+    if alias_entries:
+        raw = dumps(alias_entries)
+        rows.append(AnalysisSection(name=ALIAS_SECTION, codec="none", data=raw, raw_bytes=len(raw)))
+    return rows
+
+
+def parse_fields(fields: str | None) -> List[str] | None:
+    """
+    "?fields=tone,report" -> ["tone", "report"] (비었으면 None = 전체)
+    """
+    if not fields:
+        return None
+    parsed = [field.strip() for field in fields.split(",") if field.strip()]
+    return parsed or None
+
+
+def sections_for_fields(fields: Iterable[str] | None) -> set[str] | None:
+    if fields is None:
+        return None
+    names = {ALIAS_SECTION}
+    for field in fields:
+        key = ALIASES[field][0] if field in ALIASES else field
+        names.add(_SECTION_OF_KEY.get(key, CORE_SECTION))
+    return names
+
+
+def assemble_result(sections: Dict[str, Tuple[str, bytes]], fields: List[str] | None = None) -> Dict[str, Any]:
+    """
+    {섹션 이름: (codec, data)} -> 결과 dict (fields가 있으면 그 키만)
+    """
+    result: Dict[str, Any] = {}
+    aliases: Dict[str, List[str]] = {}
+    for name, (codec, data) in sections.items():
+        payload = loads(_decompress(codec, data))
+        if name == ALIAS_SECTION:
+            aliases = payload
+        else:
+            result.update(payload)
+    for alias, entry in aliases.items():
+        # 예전 행은 별칭 항목이 경로 리스트 그대로
+        path = entry["path"] if isinstance(entry, dict) else entry
+        if path and path[0] in result:
+            result[alias] = _get_path(result, tuple(path))
+    return project(result, fields)
+
+
+def assemble_result_json(sections: Dict[str, Tuple[str, bytes]]) -> bytes:
+    """
+    {섹션 이름: (codec, data)} -> 전체 결과 JSON 바이트 (섹션을 파싱하지 않고 이어 붙임)
+    """
+    raw = {name: _decompress(codec, data) for name, (codec, data) in sections.items()}
+    alias_raw = raw.pop(ALIAS_SECTION, None)
+    aliases = loads(alias_raw) if alias_raw else {}
+    if any(not isinstance(entry, dict) for entry in aliases.values()):
+        # 바이트 구간이 없는 예전 별칭 형식 -> 파싱해서 조립
+        return dumps(assemble_result(sections))
+
+    # 각 섹션은 키가 겹치지 않는 JSON 객체 -> 바깥 중괄호를 떼고 쉼표로 잇는다
+    parts = [body[1:-1] for body in raw.values() if len(body) > 2]
+    for alias, entry in aliases.items():
+        body = raw.get(entry["section"])
+        if body is not None:
+            start, end = entry["span"]
+            parts.append(dumps(alias) + b":" + body[start:end])
+    return b"{" + b",".join(parts) + b"}"
+
+
+def project(result: Dict[str, Any], fields: List[str] | None) -> Dict[str, Any]:
+    if fields is None:
+        return result
+    return {field: result[field] for field in fields if field in result}
+
+
+async def load_section_blobs(session, analysis_id: str, names: set[str] | None = None) -> Dict[str, Tuple[str, bytes]]:
+    query = select(AnalysisSection.name, AnalysisSection.codec, AnalysisSection.data).where(
+        AnalysisSection.analysis_id == analysis_id
+    )
+    if names is not None:
+        query = query.where(AnalysisSection.name.in_(names))
+    res = await session.execute(query)
+    return {name: (codec, data) for name, codec, data in res.all()}
+
+
+async def load_result(session, analysis: Analysis, fields: List[str] | None = None) -> Dict[str, Any]:
+    """
+    Analysis 행의 결과 (저장 형식 무관). 압축 해제/파싱은 호출자 루프를 막지 않도록 스레드에서 수행
+    """
+    if (analysis.result_format or LEGACY_RESULT_FORMAT) == LEGACY_RESULT_FORMAT:
+        text = analysis.result_json
+        return project(await asyncio.to_thread(loads, text), fields) if text else {}
+    blobs = await load_section_blobs(session, analysis.id, sections_for_fields(fields))
+    return await asyncio.to_thread(assemble_result, blobs, fields)
+
+
+async def load_result_json(session, analysis: Analysis, fields: List[str] | None = None) -> bytes:
+    """
+    Analysis 행의 결과 JSON 바이트 (응답/스트림에 raw_json으로 그대로 싣는 용도)
+
+    fields가 없으면 다시 파싱하지 않는다 (예전 행은 result_json, 섹션 행은 바이트 이어 붙이기).
+    fields 프로젝션만 필요한 섹션을 파싱해 다시 직렬화한다.
+    """
+    if fields is not None:
+        return dumps(await load_result(session, analysis, fields))
+    if (analysis.result_format or LEGACY_RESULT_FORMAT) == LEGACY_RESULT_FORMAT:
+        return (analysis.result_json or "{}").encode("utf-8")
+    blobs = await load_section_blobs(session, analysis.id)
+    return await asyncio.to_thread(assemble_result_json, blobs)
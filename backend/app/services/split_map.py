@@ -1,37 +1,145 @@
 import re
-from typing import Dict, List, Tuple
+from array import array
+from collections.abc import Mapping, Sequence
+from typing import Dict, Iterable, Iterator, List, Tuple
 
 
-_SENTENCE_PATTERN = re.compile(r".*?(?:[!?]|\.(?!\d)|\n|$)", re.S)
+# 문장 끝 (대부분의 규칙을 정규식 안에서 처리해 문장당 파이썬 작업을 최소화)
+# - 그룹 1: 줄바꿈 (+ 이어지는 공백) -> 줄바꿈 앞에서 끊는다
+# - 그룹 2: 종결 부호 + 닫는 따옴표/괄호, 그룹 3: 뒤따르는 공백
+#   * 느낌표/물음표(전각 포함)
+#   * 말줄임표("...", "…"): 뒤에 공백/닫는 부호/끝이 올 때만 ("그게...아니야"는 한 문장)
+#   * 마침표: 뒤에 숫자가 오면 소수점/번호(3.14)로 보고 잇되, "~다." 뒤는 숫자가 와도 문장 끝
+#   * 닫는 따옴표 바로 뒤에 인용 조사("왜?"라고, “가자.”하며)가 붙으면 문장이 이어진다
+#     (종결 부호+닫는 부호는 원자 그룹이라 더 짧게 되짚어 가며 끊지 않는다)
+_CLOSERS = "\"'”’」』)]》〉>"
+_AMBIGUOUS_QUOTES = "\"'"  # 여는/닫는 따옴표가 같은 문자
+_QUOTE_CLOSERS = "\"'”’」』"
+# 인용 조사 뒤에는 공백/부호/끝이 온다 ("고양이."고양이가 -> 두 문장)
+_QUOTATIVE = r"(?:(?:이?라|하)?(?:고|며|면서|는)|이?란)(?![\uAC00-\uD7A3])"
+# 청크 끝에서 이만큼 안에 경계가 있으면 다음 청크까지 보류 (인용 조사 + 다음 글자)
+_HOLD_CHARS = 4
+_C = re.escape(_CLOSERS)
+_TERMINATOR = re.compile(
+    r"(?=[\n.!?。！？…])(?:"
+    r"(\n\s*)"
+    r"|((?>(?:[!?。！？][!?。！？.…]*"
+    r"|(?<![.…])(?:\.{2,}|…+)[!?。！？.…]*(?=[" + _C + r"\s]|$)"
+    r"|(?<![.…])(?<=다)\.(?![.…])"
+    r"|(?<![.…])\.(?![\d.…])"
+    r")[" + _C + r"]*)"
+    r"(?!(?<=[" + re.escape(_QUOTE_CLOSERS) + r"])(?:" + _QUOTATIVE + r")))(\s*))"
+)
+_CONTENT_CHAR = re.compile(r"[0-9A-Za-z\uAC00-\uD7A3]")
+
+
+def _opening_quote_cut(buffer: str, seg_start: int, match: re.Match) -> int:
+    """
+    공백 없이 다음 글자가 이어질 때 끝의 "/'가 닫는 따옴표인지 판단
+
+    문장 안의 같은 따옴표 개수가 홀수면 닫는 따옴표("좋아."그리고), 짝수면 다음 대사의 여는 따옴표(말했다."좋아.")
+    """
+    token = match.group(2)
+    cut = match.end(2)
+    while token and token[-1] in _AMBIGUOUS_QUOTES:
+        quote = token[-1]
+        if buffer.count(quote, seg_start, cut - 1) % 2 == 1:
+            break
+        token = token[:-1]
+        cut -= 1
+    return cut
+
+
+def _trim(buffer: str, start: int, end: int) -> Tuple[int, int]:
+    while start < end and buffer[start].isspace():
+        start += 1
+    while end > start and buffer[end - 1].isspace():
+        end -= 1
+    return start, end
+
+
+def iter_sentence_spans(stream: str | Iterable[str]) -> Iterator[Tuple[str, int, int]]:
+    """
+    텍스트(또는 텍스트 청크 스트림)를 문장 단위로 나눠 (sentence, doc_start, doc_end)를 순서대로 생성
+
+    - 줄바꿈, 마침표/물음표/느낌표(전각 포함), 말줄임표("...", "…")에서 끊는다
+    - 대사 닫는 따옴표/괄호("”", "」", "』" 등)는 앞 문장에 붙인다
+    - 경계 판단에 다음 글자가 필요한 경우에만 청크 끝을 다음 청크까지 보류하므로
+      입력 전체를 메모리에 올리지 않고도 같은 결과를 낸다
+    - 글자/숫자가 하나도 없는 조각(구두점만 있는 줄 등)은 건너뛴다
+    """
+    if isinstance(stream, str):
+        stream = (stream,)
+    chunks = iter(stream)
+    content = _CONTENT_CHAR.search
+    buffer = ""
+    base = 0  # buffer[0]의 문서 내 오프셋
+    final = False
+
+    while not final:
+        chunk = next(chunks, None)
+        if chunk is None:
+            final = True
+        elif not chunk:
+            continue
+        else:
+            buffer = buffer + chunk if buffer else chunk
+
+        size = len(buffer)
+        seg_start = 0
+        for match in _TERMINATOR.finditer(buffer):
+            next_start = match.end()
+            if size - next_start < _HOLD_CHARS and not final:
+                # 닫는 따옴표/숫자/말줄임표/공백/인용 조사가 다음 청크에서 이어질 수 있음
+                break
+            if match.lastindex == 1:
+                cut = match.start()
+            else:
+                cut = match.end(2)
+                if cut == next_start and cut < size and buffer[cut - 1] in _AMBIGUOUS_QUOTES:
+                    cut = next_start = _opening_quote_cut(buffer, seg_start, match)
+            start = seg_start
+            if start < cut and (buffer[start].isspace() or buffer[cut - 1].isspace()):
+                start, cut = _trim(buffer, start, cut)
+            if cut > start and content(buffer, start, cut):
+                yield buffer[start:cut], base + start, base + cut
+            seg_start = next_start
+
+        if final:
+            start, end = _trim(buffer, seg_start, size)
+            if end > start and content(buffer, start, end):
+                yield buffer[start:end], base + start, base + end
+            break
+
+        base += seg_start
+        buffer = buffer[seg_start:]
+
+
+def split_offsets(stream: str | Iterable[str]) -> Tuple[array, array]:
+    """
+    문장 시작/끝 오프셋만 담은 압축 테이블 (array('I') 두 개, 문장당 8바이트)
+    """
+    starts, ends = array("I"), array("I")
+    for _, doc_start, doc_end in iter_sentence_spans(stream):
+        starts.append(doc_start)
+        ends.append(doc_end)
+    return starts, ends
 
 
 def split_with_map(text: str) -> Tuple[List[str], List[Dict[str, int | str]]]:
     sentences: List[str] = []
     split_map: List[Dict[str, int | str]] = []
 
-    for match in _SENTENCE_PATTERN.finditer(text):
-        segment = match.group()
-        if not segment or not segment.strip():
-            continue
-        leading = len(segment) - len(segment.lstrip())
-        trailing = len(segment) - len(segment.rstrip())
-        doc_start = match.start() + leading
-        doc_end = match.end() - trailing
-        if doc_end <= doc_start:
-            continue
-        sentence = text[doc_start:doc_end]
-        if not re.search(r"[0-9A-Za-z\uAC00-\uD7A3]", sentence):
-            continue
-        sentence_index = len(sentences)
-        sentences.append(sentence)
+    for sentence, doc_start, doc_end in iter_sentence_spans(text):
         split_map.append(
             {
-                "sentence_index": sentence_index,
+                "sentence_index": len(sentences),
                 "doc_start": doc_start,
                 "doc_end": doc_end,
                 "text": sentence,
             }
         )
+        sentences.append(sentence)
 
     if not sentences:
         stripped = text.strip()
@@ -51,15 +159,198 @@ def split_with_map(text: str) -> Tuple[List[str], List[Dict[str, int | str]]]:
     return sentences, split_map
 
 
+class _SentenceView(Sequence):
+    """
+    SplitPayload의 문장 목록 (원문 슬라이스를 접근할 때 만든다)
+    """
+
+    __slots__ = ("_payload",)
+
+    def __init__(self, payload: "SplitPayload"):
+        self._payload = payload
+
+    def __len__(self) -> int:
+        return len(self._payload.starts)
+
+    def __getitem__(self, index):
+        payload = self._payload
+        if isinstance(index, slice):
+            text = payload.text
+            return [text[s:e] for s, e in zip(payload.starts[index], payload.ends[index])]
+        return payload.text[payload.starts[index]:payload.ends[index]]
+
+    def __iter__(self) -> Iterator[str]:
+        text = self._payload.text
+        for s, e in zip(self._payload.starts, self._payload.ends):
+            yield text[s:e]
+
+    def __repr__(self) -> str:
+        return f"<sentences n={len(self)}>"
+
+
+class _SplitMapView(Sequence):
+    """
+    SplitPayload의 split_map 항목 (기존 dict 형식을 접근할 때 만든다)
+    """
+
+    __slots__ = ("_payload",)
+
+    def __init__(self, payload: "SplitPayload"):
+        self._payload = payload
+
+    def __len__(self) -> int:
+        return len(self._payload.starts)
+
+    def _entry(self, index: int) -> Dict[str, int | str]:
+        payload = self._payload
+        start, end = payload.starts[index], payload.ends[index]
+        return {
+            "sentence_index": index,
+            "doc_start": start,
+            "doc_end": end,
+            "text": payload.text[start:end],
+        }
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._entry(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("split_map index out of range")
+        return self._entry(index)
+
+    def __iter__(self) -> Iterator[Dict[str, int | str]]:
+        for i in range(len(self)):
+            yield self._entry(i)
+
+    def __repr__(self) -> str:
+        return f"<split_map n={len(self)}>"
+
+
+def _as_offsets(values: array | bytes | Iterable[int]) -> array:
+    if isinstance(values, array):
+        return values
+    offsets = array("I")
+    if isinstance(values, (bytes, bytearray)):
+        offsets.frombytes(values)
+    else:
+        offsets.extend(values)
+    return offsets
+
+
+class SplitPayload(Mapping):
+    """
+    문장 분리 결과 (원문 + 문장 시작/끝 오프셋)
+
+    원문 한 벌과 array('I') 오프셋(문장당 8바이트)만 들고 있고,
+    split_sentences / split_map은 접근할 때 원문 슬라이스로 만든다.
+    기존 dict 형식(split_sentences, split_map, embedding_dim)의 읽기 전용 Mapping으로 동작하며,
+    API 응답/DB 저장 직전에는 to_dict()로 현재 JSON 형식 그대로 변환한다.
+    """
+
+    __slots__ = ("text", "starts", "ends", "embedding_dim")
+
+    def __init__(
+        self,
+        text: str,
+        starts: array | bytes | Iterable[int],
+        ends: array | bytes | Iterable[int],
+        embedding_dim: int | None = None,
+    ):
+        self.text = text
+        self.starts = _as_offsets(starts)
+        self.ends = _as_offsets(ends)
+        self.embedding_dim = embedding_dim
+
+    @classmethod
+    def from_text(cls, text: str, embedding_dim: int | None = None) -> "SplitPayload":
+        starts, ends = split_offsets(text)
+        if not starts:
+            stripped = text.strip()
+            if stripped:
+                start = text.find(stripped)
+                starts.append(start)
+                ends.append(start + len(stripped))
+        return cls(text, starts, ends, embedding_dim)
+
+    @property
+    def sentences(self) -> _SentenceView:
+        return _SentenceView(self)
+
+    @property
+    def split_map(self) -> _SplitMapView:
+        return _SplitMapView(self)
+
+    def _keys(self) -> Tuple[str, ...]:
+        if self.embedding_dim is None:
+            return ("split_sentences", "split_map")
+        return ("split_sentences", "split_map", "embedding_dim")
+
+    def __getitem__(self, key: str):
+        if key == "split_sentences":
+            return self.sentences
+        if key == "split_map":
+            return self.split_map
+        if key == "embedding_dim" and self.embedding_dim is not None:
+            return self.embedding_dim
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys())
+
+    def __len__(self) -> int:
+        return len(self._keys())
+
+    def __repr__(self) -> str:
+        return f"SplitPayload(sentences={len(self.starts)}, chars={len(self.text)})"
+
+    def __reduce__(self):
+        return (self.__class__, (self.text, self.starts.tobytes(), self.ends.tobytes(), self.embedding_dim))
+
+    def _asdict(self) -> Dict[str, object]:
+        # LangGraph 체크포인트 직렬화(JsonPlusSerializer)용: cls(**_asdict())로 복원된다
+        return {
+            "text": self.text,
+            "starts": self.starts.tobytes(),
+            "ends": self.ends.tobytes(),
+            "embedding_dim": self.embedding_dim,
+        }
+
+    def to_dict(self) -> Dict[str, object]:
+        """
+        API/DB용 dict (기존 build_split_payload 반환 형식과 동일)
+        """
+        sentences = list(self.sentences)
+        payload: Dict[str, object] = {
+            "split_sentences": sentences,
+            "split_map": [
+                {"sentence_index": i, "doc_start": s, "doc_end": e, "text": sentence}
+                for i, (s, e, sentence) in enumerate(zip(self.starts, self.ends, sentences))
+            ],
+        }
+        if self.embedding_dim is not None:
+            payload["embedding_dim"] = self.embedding_dim
+        return payload
+
+
 def build_split_payload(
     text: str,
     embedding_dim: int | None = None,
-) -> Dict[str, object]:
-    sentences, split_map = split_with_map(text)
-    payload: Dict[str, object] = {
-        "split_sentences": sentences,
-        "split_map": split_map,
-    }
-    if embedding_dim is not None:
-        payload["embedding_dim"] = embedding_dim
-    return payload
+) -> SplitPayload:
+    return SplitPayload.from_text(text, embedding_dim)
+
+
+def materialize_split_payload(split_payload: object) -> Dict[str, object]:
+    """
+    그래프 상태의 split_text(SplitPayload / dict / 문장 list / 원문 str) -> JSON 직렬화 가능한 dict
+    """
+    if isinstance(split_payload, SplitPayload):
+        return split_payload.to_dict()
+    if isinstance(split_payload, dict):
+        return split_payload
+    if isinstance(split_payload, list):
+        return {"split_sentences": [str(item) for item in split_payload], "split_map": []}
+    if isinstance(split_payload, str):
+        return build_split_payload(split_payload).to_dict()
+    return {}
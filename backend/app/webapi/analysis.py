@@ -1,14 +1,18 @@
-import json, uuid, logging
-from fastapi import APIRouter, HTTPException, Depends
+import asyncio, json, logging
+from fastapi import APIRouter, HTTPException, Depends, Query, Response
 from fastapi.responses import StreamingResponse
-from fastapi.encoders import jsonable_encoder
 from sqlalchemy import select
 from pydantic import BaseModel
 
 from app.core.db import get_session, Document, Analysis, User
 from app.core.auth import get_current_user
-from app.services.analysis_runner import run_analysis_for_text, stream_analysis_for_text
-from app.webapi.schemas import AnalysisOut, AnalysisDetail
+from app.core.serialization import dumps, ndjson_chunks, raw_json
+from app.services.analysis_runner import run_analysis_for_text
+from app.services.analysis_store import build_analysis, load_incremental_base, summarize_node_metrics
+from app.services.job_queue import enqueue_analysis_job, get_analysis_job, iter_job_events, retry_analysis_job
+from app.services.result_storage import load_result_json, parse_fields
+from app.webapi.pagination import MAX_PAGE_SIZE, cursor_key, finish_page, paginate
+from app.webapi.schemas import AnalysisOut, AnalysisDetail, AnalysisJobOut
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/analysis", tags=["analysis"])
@@ -16,6 +20,19 @@ router = APIRouter(prefix="/analysis", tags=["analysis"])
 class AnalysisRequest(BaseModel):
     persona_name: str | None = None
     persona_desc: str | None = None
+    incremental: bool = True  # 직전 분석과 달라진 문장 청크만 재분석
+
+
+def _analysis_options(payload: AnalysisRequest | None) -> dict:
+    # 페르소나 설정 추출
+    analysis_options = {}
+    if payload:
+        if payload.persona_name:
+            analysis_options['persona_name'] = payload.persona_name
+        if payload.persona_desc:
+            analysis_options['persona_desc'] = payload.persona_desc
+    return analysis_options
+
 
 @router.post("/run-stream/{doc_id}")
 async def run_analysis_stream(
@@ -25,91 +42,133 @@ async def run_analysis_stream(
 ):
     mode = "full" if current_user else "causality_only"
     
-    # 페르소나 설정 추출
-    analysis_options = {}
-    if payload:
-        if payload.persona_name:
-            analysis_options['persona_name'] = payload.persona_name
-        if payload.persona_desc:
-            analysis_options['persona_desc'] = payload.persona_desc
+    analysis_options = _analysis_options(payload)
 
-    # 세션을 미리 열어 문서 정보를 가져온 뒤 닫음
     async with get_session() as session:
         d = await session.get(Document, doc_id)
         if not d:
             raise HTTPException(404, "Document not found")
-        extracted_text = d.extracted_text
-        meta_json = d.meta_json
 
+    # 분석은 백그라운드 작업으로 실행하고, 이 요청은 작업 이벤트만 중계한다.
+    # 연결이 끊겨도 작업은 계속되며 /analysis/jobs/{job_id}/events?after=<seq>로 다시 붙을 수 있다.
+    job = await enqueue_analysis_job(
+        doc_id,
+        mode=mode,
+        options=analysis_options,
+        incremental=payload is None or payload.incremental,
+        user_id=current_user.id if current_user else None,
+    )
+    return _job_event_stream(job.id, after=0)
+
+
+async def _ndjson(event: dict):
+    # 이벤트당 1회 직렬화. 큰 final_result는 조각마다 루프에 양보한다
+    for chunk in ndjson_chunks(event):
+        yield chunk
+        await asyncio.sleep(0)
+
+
+def _job_event_stream(job_id: str, after: int) -> StreamingResponse:
     async def event_generator():
+        if after == 0:
+            async for chunk in _ndjson({"type": "job", "job_id": job_id, "seq": 0}):
+                yield chunk
         try:
-            # options를 context에 병합하거나 별도로 전달
-            # 여기서는 context(meta_json)는 원본 데이터이므로, options를 별도 인자로 넘기는 것이 깔끔하지만
-            # stream_analysis_for_text 인터페이스에 맞춰 options를 추가 인자로 전달
-            async for event in stream_analysis_for_text(extracted_text, context=meta_json, mode=mode, options=analysis_options):
-                if event["type"] == "final_result":
-                    final_result = event["data"]
-                    
-                    issue_counts = _collect_issue_counts(final_result)
-                    has_issues = any(v > 0 for v in issue_counts.values())
-                    status = "fallback" if _is_fallback(final_result) else "done"
-                    
-                    # 최종 결과를 DB에 저장하기 위해 새로운 세션 생성
-                    async with get_session() as internal_session:
-                        a = Analysis(
-                            id=str(uuid.uuid4()),
-                            document_id=doc_id,
-                            status=status,
-                            decision=final_result.get("decision"),
-                            has_issues=has_issues,
-                            issue_counts_json=json.dumps(issue_counts, ensure_ascii=False),
-                            result_json=json.dumps(jsonable_encoder(final_result), ensure_ascii=False),
-                        )
-                        internal_session.add(a)
-                        await internal_session.commit()
-                        event["analysis_id"] = a.id
-                
-                yield json.dumps(jsonable_encoder(event), ensure_ascii=False) + "\n"
+            async for event in iter_job_events(job_id, after=after):
+                async for chunk in _ndjson(event):
+                    yield chunk
         except Exception as e:
             logger.error(f"[API_STREAM] Generator error: {e}", exc_info=True)
-            yield json.dumps({"type": "error", "message": str(e)}, ensure_ascii=False) + "\n"
+            async for chunk in _ndjson({"type": "error", "job_id": job_id, "message": str(e)}):
+                yield chunk
 
     return StreamingResponse(
-        event_generator(), 
+        event_generator(),
         media_type="application/x-ndjson",
         headers={
             "Cache-Control": "no-cache",
-            "X-Accel-Buffering": "no"  # Nginx 사용 시 버퍼링 방지
+            "X-Accel-Buffering": "no",  # Nginx 사용 시 버퍼링 방지
+            "X-Job-Id": job_id,
         }
     )
 
-def _issue_count(result: dict | None) -> int:
-    if not result:
-        return 0
-    issues = result.get("issues", [])
-    return len(issues) if isinstance(issues, list) else 0
+
+def _job_out(job) -> AnalysisJobOut:
+    return AnalysisJobOut(
+        id=job.id,
+        document_id=job.document_id,
+        status=job.status,
+        mode=job.mode,
+        analysis_id=job.analysis_id,
+        error=job.error,
+        attempts=job.attempts or 0,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+    )
+
+
+@router.post("/jobs/{doc_id}", response_model=AnalysisJobOut, status_code=202)
+async def create_analysis_job(
+    doc_id: str,
+    payload: AnalysisRequest | None = None,
+    current_user: User = Depends(get_current_user)
+):
+    mode = "full" if current_user else "causality_only"
+    analysis_options = _analysis_options(payload)
+
+    async with get_session() as session:
+        d = await session.get(Document, doc_id)
+        if not d:
+            raise HTTPException(404, "Document not found")
+
+    job = await enqueue_analysis_job(
+        doc_id,
+        mode=mode,
+        options=analysis_options,
+        incremental=payload is None or payload.incremental,
+        user_id=current_user.id if current_user else None,
+    )
+    job = await get_analysis_job(job.id)
+    return _job_out(job)
+
+
+@router.get("/jobs/{job_id}", response_model=AnalysisJobOut)
+async def get_job_status(job_id: str):
+    job = await get_analysis_job(job_id)
+    if not job:
+        raise HTTPException(404, "Job not found")
+    return _job_out(job)
 
 
-def _collect_issue_counts(result: dict) -> dict:
-    return {
-        "tone": _issue_count(result.get("tone")),
-        "logic": _issue_count(result.get("logic")),
-        "trauma": _issue_count(result.get("trauma")),
-        "hate_bias": _issue_count(result.get("hate_bias")),
-        "genre_cliche": _issue_count(result.get("genre_cliche")),
-        "spelling": _issue_count(result.get("spelling")),
-    }
+@router.post("/jobs/{job_id}/retry", response_model=AnalysisJobOut, status_code=202)
+async def retry_job(job_id: str):
+    """
+    실패한 작업 재시도. 이미 끝난 노드(평가 에이전트 등)는 체크포인트에서 재사용된다.
+    """
+    job = await get_analysis_job(job_id)
+    if not job:
+        raise HTTPException(404, "Job not found")
+    if not await retry_analysis_job(job_id):
+        raise HTTPException(409, f"Job is {job.status}, only failed jobs can be retried")
+    return _job_out(await get_analysis_job(job_id))
 
 
-def _is_fallback(result: dict) -> bool:
-    report = result.get("final_report") or {}
-    if isinstance(report, dict) and isinstance(report.get("note"), str):
-        return "LLM 미사용" in report.get("note")
-    return False
+@router.get("/jobs/{job_id}/events")
+async def stream_job_events(job_id: str, after: int = 0):
+    """
+    작업 이벤트 NDJSON 스트림. 마지막으로 받은 seq를 after로 넘기면 그 다음부터 이어서 받는다.
+    """
+    job = await get_analysis_job(job_id)
+    if not job:
+        raise HTTPException(404, "Job not found")
+    return _job_event_stream(job_id, after=max(0, after))
+
 
 @router.post("/run/{doc_id}", response_model=AnalysisOut)
 async def run_analysis(
     doc_id: str,
+    incremental: bool = True,
     current_user: User = Depends(get_current_user)
 ):
     # Determine analysis mode based on login status
@@ -120,24 +179,17 @@ async def run_analysis(
         if not d:
             raise HTTPException(404, "Document not found")
 
+        incremental_base = None
+        if mode == "full" and incremental:
+            incremental_base = await load_incremental_base(session, doc_id)
+
         result = await run_analysis_for_text(
             d.extracted_text,
             context=d.meta_json,
             mode=mode,
+            incremental_base=incremental_base,
         )
-        issue_counts = _collect_issue_counts(result)
-        has_issues = any(v > 0 for v in issue_counts.values())
-        status = "fallback" if _is_fallback(result) else "done"
-
-        a = Analysis(
-            id=str(uuid.uuid4()),
-            document_id=doc_id,
-            status=status,
-            decision=result.get("decision"),
-            has_issues=has_issues,
-            issue_counts_json=json.dumps(issue_counts, ensure_ascii=False),
-            result_json=json.dumps(result, ensure_ascii=False),
-        )
+        a = build_analysis(doc_id, result)
         session.add(a)
         await session.commit()
         return AnalysisOut(
@@ -146,17 +198,37 @@ async def run_analysis(
             status=a.status,
             decision=a.decision,
             has_issues=a.has_issues,
-            issue_counts=issue_counts,
+            issue_counts=json.loads(a.issue_counts_json),
             created_at=str(a.created_at),
         )
 
+@router.get("/metrics/nodes")
+async def get_node_metrics_summary(limit: int = 50):
+    """
+    최근 분석 limit건의 노드별 평균/합계 (느리거나 비싼 에이전트 찾기용)
+    """
+    limit = max(1, min(limit, 1000))
+    async with get_session() as session:
+        res = await session.execute(
+            select(Analysis.metrics_json).order_by(Analysis.created_at.desc()).limit(limit)
+        )
+        rows = [json.loads(metrics_json or "{}") for (metrics_json,) in res.all()]
+    return summarize_node_metrics(rows)
+
+
 @router.get("/{analysis_id}", response_model=AnalysisDetail)
-async def get_analysis(analysis_id: str):
+async def get_analysis(analysis_id: str, fields: str | None = None):
+    """
+    fields: 쉼표로 구분한 결과 키만 반환 (예: ?fields=tone,logic,report). 필요한 섹션만 읽는다
+
+    result/metrics는 저장된 JSON 바이트를 다시 파싱하지 않고 응답에 그대로 싣는다.
+    """
     async with get_session() as session:
         a = await session.get(Analysis, analysis_id)
         if not a:
             raise HTTPException(404, "Analysis not found")
-        return AnalysisDetail(
+        result_json = await load_result_json(session, a, parse_fields(fields))
+        summary = AnalysisOut(
             id=a.id,
             document_id=a.document_id,
             status=a.status,
@@ -164,27 +236,67 @@ async def get_analysis(analysis_id: str):
             has_issues=a.has_issues,
             issue_counts=json.loads(a.issue_counts_json or "{}"),
             created_at=str(a.created_at),
-            result=json.loads(a.result_json),
         )
+        payload = {
+            **summary.model_dump(mode="json"),
+            "result": raw_json(result_json),
+            "metrics": raw_json(a.metrics_json or "{}"),
+        }
+    return Response(content=dumps(payload), media_type="application/json")
+
+
+@router.get("/{analysis_id}/metrics")
+async def get_analysis_metrics(analysis_id: str):
+    """
+    분석 1회의 실행 메트릭 (전체 합계 + 노드별 wall/LLM/대기 시간, 토큰, 비용, 재시도, 청크 수)
+    """
+    async with get_session() as session:
+        res = await session.execute(select(Analysis.metrics_json).where(Analysis.id == analysis_id))
+        row = res.first()
+        if row is None:
+            raise HTTPException(404, "Analysis not found")
+        return json.loads(row[0] or "{}")
+
+# 목록에는 메타데이터 컬럼만 읽는다 (result_json/metrics_json 제외)
+_ANALYSIS_SUMMARY_COLUMNS = (
+    Analysis.id,
+    Analysis.document_id,
+    Analysis.status,
+    Analysis.decision,
+    Analysis.has_issues,
+    Analysis.issue_counts_json,
+    Analysis.created_at,
+)
+
 
 @router.get("/by-document/{doc_id}", response_model=list[AnalysisOut])
-async def list_analyses_for_doc(doc_id: str):
+async def list_analyses_for_doc(
+    doc_id: str,
+    response: Response,
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+):
+    """
+    limit을 주면 키셋 페이지네이션 (다음 페이지 커서는 X-Next-Cursor 헤더)
+    """
     async with get_session() as session:
-        res = await session.execute(select(Analysis).where(Analysis.document_id==doc_id).order_by(Analysis.created_at.desc()))
-        items = res.scalars().all()
-        out = []
-        for i in items:
-            issue_counts = json.loads(i.issue_counts_json or "{}")
-            out.append(AnalysisOut(
-                id=i.id,
-                document_id=i.document_id,
-                status=i.status,
-                decision=i.decision,
-                has_issues=i.has_issues,
-                issue_counts=issue_counts,
-                created_at=str(i.created_at),
-            ))
-        return out
+        query = select(*_ANALYSIS_SUMMARY_COLUMNS, cursor_key(Analysis.created_at)).where(
+            Analysis.document_id == doc_id
+        )
+        res = await session.execute(paginate(query, Analysis.created_at, Analysis.id, limit, cursor))
+        rows = finish_page(res.all(), limit, response)
+        return [
+            AnalysisOut(
+                id=row.id,
+                document_id=row.document_id,
+                status=row.status,
+                decision=row.decision,
+                has_issues=row.has_issues,
+                issue_counts=json.loads(row.issue_counts_json or "{}"),
+                created_at=row.created_at,
+            )
+            for row in rows
+        ]
 
 
 @router.delete("/{analysis_id}")
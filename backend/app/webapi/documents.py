@@ -4,13 +4,14 @@ import json
 from datetime import datetime
 from pathlib import Path
 
-from fastapi import APIRouter, File, HTTPException, UploadFile, Depends
+from fastapi import APIRouter, File, HTTPException, UploadFile, Depends, Query, Response
 from sqlalchemy import select
 from pydantic import BaseModel
 
 from app.core.db import get_session, Document, User
 from app.core.auth import get_current_user
 from app.services.document_parser import document_parser
+from app.webapi.pagination import MAX_PAGE_SIZE, cursor_key, finish_page, paginate
 from app.webapi.schemas import DocumentDetail, DocumentOut
 
 router = APIRouter(prefix="/documents", tags=["documents"])
@@ -21,12 +22,29 @@ class DocumentUpdate(BaseModel):
     title: str | None = None
 
 
+# 목록에는 메타데이터 컬럼만 읽는다 (extracted_text 제외)
+_DOCUMENT_SUMMARY_COLUMNS = (
+    Document.id,
+    Document.title,
+    Document.filename,
+    Document.content_type,
+    Document.created_at,
+    Document.updated_at,
+)
+
+
 @router.get("", response_model=list[DocumentOut])
 async def list_documents(
+    response: Response,
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
     current_user: User | None = Depends(get_current_user)
 ):
+    """
+    limit을 주면 키셋 페이지네이션 (다음 페이지 커서는 X-Next-Cursor 헤더)
+    """
     async with get_session() as session:
-        query = select(Document).order_by(Document.created_at.desc())
+        query = select(*_DOCUMENT_SUMMARY_COLUMNS, cursor_key(Document.created_at))
         
         if current_user:
             # 로그인 유저: 내 문서만 조회
@@ -35,9 +53,9 @@ async def list_documents(
             # 비로그인 유저: 익명(user_id=None) 문서만 조회 (또는 빈 목록)
             query = query.where(Document.user_id == None)
             
-        res = await session.execute(query)
-        items = res.scalars().all()
-        return items
+        res = await session.execute(paginate(query, Document.created_at, Document.id, limit, cursor))
+        rows = finish_page(res.all(), limit, response)
+        return [DocumentOut.model_validate(row) for row in rows]
 
 
 @router.post("/upload", response_model=DocumentOut)
@@ -0,0 +1,64 @@
+"""
+목록 API 키셋 페이지네이션 (created_at DESC, id DESC)
+
+- ?limit=N&cursor=<X-Next-Cursor 헤더 값> 으로 다음 페이지를 받는다 (limit이 없으면 전체)
+- OFFSET 없이 (user_id|document_id, created_at, id) 인덱스를 그대로 타므로 페이지가 깊어져도 비용이 같다
+- 커서는 DB에 저장된 created_at 문자열 그대로 비교한다 (SQLite CURRENT_TIMESTAMP 형식과 정확히 일치)
+"""
+import base64
+import binascii
+from typing import Any, Sequence
+
+from fastapi import HTTPException, Response
+from sqlalchemy import String, and_, or_, type_coerce
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+MAX_PAGE_SIZE = 200
+
+
+def cursor_key(created_at_column) -> Any:
+    # 저장된 문자열 그대로 읽고 비교 (DateTime 변환 없이)
+    return type_coerce(created_at_column, String).label("cursor_created_at")
+
+
+def encode_cursor(created_at_raw: str, row_id: str) -> str:
+    return base64.urlsafe_b64encode(f"{created_at_raw}|{row_id}".encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[str, str]:
+    try:
+        decoded = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8")
+    except (binascii.Error, UnicodeDecodeError):
+        raise HTTPException(400, "Invalid cursor")
+    created_at_raw, sep, row_id = decoded.rpartition("|")
+    if not sep or not created_at_raw or not row_id:
+        raise HTTPException(400, "Invalid cursor")
+    return created_at_raw, row_id
+
+
+def paginate(query, created_at_column, id_column, limit: int | None, cursor: str | None):
+    """
+    query에 키셋 조건/정렬/limit(+1, 다음 페이지 존재 확인용)을 붙인다
+    """
+    if cursor:
+        created_at_raw, row_id = decode_cursor(cursor)
+        created_at = type_coerce(created_at_column, String)
+        query = query.where(
+            or_(created_at < created_at_raw, and_(created_at == created_at_raw, id_column < row_id))
+        )
+    query = query.order_by(created_at_column.desc(), id_column.desc())
+    if limit is not None:
+        query = query.limit(limit + 1)
+    return query
+
+
+def finish_page(rows: Sequence[Any], limit: int | None, response: Response) -> Sequence[Any]:
+    """
+    limit+1번째 행이 있으면 잘라내고 다음 페이지 커서를 응답 헤더로 알린다
+    """
+    if limit is None or len(rows) <= limit:
+        return rows
+    rows = rows[:limit]
+    last = rows[-1]
+    response.headers[NEXT_CURSOR_HEADER] = encode_cursor(last.cursor_created_at, last.id)
+    return rows
@@ -39,3 +39,19 @@ class AnalysisOut(BaseModel):
 
 class AnalysisDetail(AnalysisOut):
     result: Dict[str, Any]
+    metrics: Dict[str, Any] | None = None  # RunMetrics 스냅샷 (노드별 시간/토큰/비용)
+
+
+class AnalysisJobOut(BaseModel):
+    id: str
+    document_id: str
+    status: str
+    mode: str
+    analysis_id: str | None = None
+    error: str | None = None
+    attempts: int = 0
+    created_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,12 @@
+"""
+오프라인 벤치마크 (Upstage 쿼터 없이 파이프라인 처리량/지연/메모리 측정)
+
+- mock_llm: 지연 분포/토큰 속도/오류 주입을 설정할 수 있는 OpenAI 호환 스텁 서버
+- corpus: 시드 고정 합성 한국어 원고 (1k ~ 1M자)
+- run: 스텁을 띄우고 run_analysis_for_text / stream_analysis_for_text / run_full_pipeline을
+  크기별로 돌려 커밋 간 비교 가능한 JSON 리포트를 만든다
+
+사용 예 (backend 디렉터리에서):
+    python -m bench.run --sizes 1k,10k,100k --out bench/results/$(git rev-parse --short HEAD).json
+    python -m bench.run --sizes 10k --compare bench/results/<이전 커밋>.json
+"""
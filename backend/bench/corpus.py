@@ -0,0 +1,91 @@
+"""
+벤치마크용 합성 한국어 원고
+
+- 인물/장소/행동/대사 템플릿을 시드 고정 난수로 조합해 장(章)/문단/대화가 섞인 원고를 만든다
+- 같은 (크기, 시드)면 항상 같은 텍스트 -> 커밋 간 결과 비교 가능
+"""
+import random
+import re
+
+DEFAULT_SIZES = ("1k", "10k", "100k")
+SIZE_SUFFIXES = {"k": 1_000, "m": 1_000_000}
+
+_NAMES = ["서연", "민준", "하은", "도윤", "지우", "예준", "수아", "시우", "할머니", "박 형사"]
+_PLACES = ["낡은 골목", "비 내리는 역 앞", "학교 옥상", "바닷가 마을", "지하 연구실", "시장 골목", "병원 복도", "산속 절"]
+_TIMES = ["새벽녘", "해 질 무렵", "자정이 넘어", "점심 무렵", "그날 밤", "이튿날 아침"]
+_ACTIONS = [
+    "{a}은(는) {p}에서 오래도록 서성였다.",
+    "{a}은(는) {b}의 얼굴을 똑바로 바라보지 못했다.",
+    "{t}, {a}은(는) {p}을(를) 향해 천천히 걸음을 옮겼다.",
+    "바람이 불 때마다 {p}의 간판이 삐걱거렸다.",
+    "{a}은(는) 주머니 속 편지를 몇 번이고 만지작거렸다.",
+    "{b}은(는) 아무 말 없이 창밖만 바라보고 있었다.",
+    "{t}의 공기는 이상할 만큼 무거웠다.",
+    "{a}의 손끝이 가늘게 떨렸다.",
+    "멀리서 개 짖는 소리가 들려왔고, {a}은(는) 걸음을 멈췄다.",
+    "{a}은(는) 그제야 {b}이(가) 숨기고 있던 것이 무엇인지 알 것 같았다.",
+]
+_DIALOGUES = [
+    "\"{b}, 너 정말 아무것도 몰랐어?\" {a}이(가) 물었다.",
+    "\"이제 와서 그런 말 하지 마.\" {b}이(가) 낮게 말했다.",
+    "\"여기서 기다리면 올 거야.\" {a}은(는) 스스로에게 말하듯 중얼거렸다.",
+    "\"왜 하필 {p}이었을까?\" {b}이(가) 고개를 갸웃했다.",
+    "\"괜찮아, 다 지나갈 거야.\" {a}이(가) 웃어 보였지만 눈은 웃고 있지 않았다.",
+]
+
+
+_JOSA_RE = re.compile(r"([가-힣])(은\(는\)|이\(가\)|을\(를\))")
+
+
+def _attach_josa(text: str) -> str:
+    # "민준은(는)" -> 받침 유무에 맞는 조사 선택
+    def pick(match: re.Match) -> str:
+        char, marker = match.group(1), match.group(2)
+        has_final = (ord(char) - 0xAC00) % 28 != 0
+        return char + (marker[0] if has_final else marker[2])
+
+    return _JOSA_RE.sub(pick, text)
+
+
+def parse_size(label: str) -> int:
+    """
+    "1k", "100k", "1m", "2500" -> 글자 수
+    """
+    label = label.strip().lower()
+    multiplier = SIZE_SUFFIXES.get(label[-1:], 1)
+    number = label[:-1] if label[-1:] in SIZE_SUFFIXES else label
+    return int(float(number) * multiplier)
+
+
+def _sentence(rng: random.Random) -> str:
+    a, b = rng.sample(_NAMES, 2)
+    template = rng.choice(_DIALOGUES) if rng.random() < 0.25 else rng.choice(_ACTIONS)
+    return _attach_josa(template.format(a=a, b=b, p=rng.choice(_PLACES), t=rng.choice(_TIMES)))
+
+
+def generate_manuscript(chars: int, seed: int = 0) -> str:
+    """
+    chars 글자 내외(문장 경계에서 자름)의 합성 원고
+    """
+    rng = random.Random(f"corpus:{seed}:{chars}")
+    parts: list[str] = []
+    length = 0
+    chapter = 0
+    while length < chars:
+        if length == 0 or rng.random() < 0.02:
+            chapter += 1
+            heading = f"제{chapter}장\n\n"
+            parts.append(heading)
+            length += len(heading)
+        paragraph = " ".join(_sentence(rng) for _ in range(rng.randint(3, 8))) + "\n\n"
+        parts.append(paragraph)
+        length += len(paragraph)
+    text = "".join(parts)
+    if len(text) > chars:
+        cut = text.rfind(".", 0, chars)
+        text = text[: cut + 1] if cut > 0 else text[:chars]
+    return text.strip()
+
+
+def build_corpus(sizes: tuple[str, ...] | list[str] = DEFAULT_SIZES, seed: int = 0) -> dict[str, str]:
+    return {label: generate_manuscript(parse_size(label), seed=seed) for label in sizes}
@@ -0,0 +1,374 @@
+"""
+HTTP API 부하 테스트 (동시 스트리밍 분석 세션)
+
+시나리오 하나 = (동시 사용자 수, 원고 크기). 시나리오마다:
+1. 임시 작업 디렉터리(빈 SQLite DB/업로드 폴더)에서 백엔드(uvicorn main:app)를 mock LLM에 붙여 띄운다
+2. 가상 사용자 N명을 DB에 만들고 JWT를 발급 (익명이면 causality_only 모드로 돈다)
+3. 사용자마다 /api/documents/upload -> /api/analysis/run-stream/{doc_id} NDJSON 스트림을 --iterations회 반복
+4. 그동안 /health 응답 시간(이벤트 루프 포화)과 SQLite 쓰기 잠금 획득 시간(BEGIN IMMEDIATE)을 주기적으로 잰다
+
+리포트: 업로드 지연, 첫 이벤트까지 시간(TTFE), 이벤트 간 간격, 스트림 완료 시간의 백분위수,
+실패 스트림 수, /health 지연, DB 쓰기 잠금 대기, 서버 로그의 "database is locked" 횟수.
+같은 인자(시드 포함)면 같은 원고/같은 mock 응답으로 재현된다.
+
+예:
+    python -m bench.load --users 1,8,32 --sizes 10k --iterations 2 --out bench/results/load.json
+    python -m bench.load --users 16 --sizes 100k --env ANALYSIS_JOB_WORKERS=4 --latency-ms 500
+"""
+import argparse
+import asyncio
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List
+
+import httpx
+
+from bench.corpus import build_corpus
+from bench.mock_llm import MockServer, add_config_arguments, free_port, http_json, mock_cli_args
+from bench.run import BENCH_ENV, git_revision, parse_env_overrides, percentile
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+LOAD_SECRET_KEY = "bench-load-secret"
+
+
+def _distribution(values: List[float]) -> Dict[str, Any]:
+    if not values:
+        return {"count": 0}
+    return {
+        "count": len(values),
+        "p50": round(percentile(values, 50), 4),
+        "p90": round(percentile(values, 90), 4),
+        "p99": round(percentile(values, 99), 4),
+        "max": round(max(values), 4),
+    }
+
+
+class BackendServer:
+    """
+    임시 디렉터리를 cwd로 백엔드를 띄운다 (./data 아래 DB/업로드/캐시가 모두 격리됨)
+    """
+
+    def __init__(self, env: Dict[str, str]):
+        self._tmp = tempfile.TemporaryDirectory(prefix="contextor-load-")
+        self.workdir = Path(self._tmp.name)
+        self.db_path = self.workdir / "data" / "team.db"
+        self.log_path = self.workdir / "server.log"
+        self.port = free_port()
+        self.url = f"http://127.0.0.1:{self.port}"
+        self._env = env
+        self._proc: subprocess.Popen | None = None
+        self._log = None
+
+    def __enter__(self) -> "BackendServer":
+        (self.workdir / "data").mkdir()
+        self._log = self.log_path.open("w", encoding="utf-8")
+        self._proc = subprocess.Popen(
+            [
+                sys.executable, "-m", "uvicorn", "main:app",
+                "--app-dir", str(BACKEND_DIR),
+                "--port", str(self.port),
+                "--log-level", "warning",
+            ],
+            cwd=self.workdir,
+            env={**os.environ, **self._env},
+            stdout=self._log,
+            stderr=subprocess.STDOUT,
+        )
+        deadline = time.time() + 60
+        while time.time() < deadline:
+            if self._proc.poll() is not None:
+                raise RuntimeError(f"Backend exited during startup (see {self.log_path})")
+            try:
+                http_json(f"{self.url}/health")
+                return self
+            except OSError:
+                time.sleep(0.2)
+        self.__exit__(None, None, None)
+        raise RuntimeError("Backend did not start")
+
+    def __exit__(self, *exc) -> None:
+        if self._proc is not None:
+            self._proc.terminate()
+            try:
+                self._proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self._proc.kill()
+        if self._log is not None:
+            self._log.close()
+        self._tmp.cleanup()
+
+    def count_in_log(self, needle: str) -> int:
+        try:
+            return self.log_path.read_text(encoding="utf-8", errors="replace").count(needle)
+        except OSError:
+            return 0
+
+
+def _create_users(db_path: Path, count: int, secret_key: str) -> List[str]:
+    """
+    가상 사용자를 DB에 넣고 access token을 발급 (OAuth 로그인과 같은 sub=user.id 형식)
+    """
+    from jose import jwt
+
+    expire = datetime.now(timezone.utc) + timedelta(hours=6)
+    tokens = []
+    with sqlite3.connect(db_path, timeout=30) as conn:
+        for index in range(count):
+            user_id = str(uuid.uuid4())
+            conn.execute(
+                "INSERT INTO users (id, email, name) VALUES (?, ?, ?)",
+                (user_id, f"load-{index}-{user_id[:8]}@bench.local", f"load user {index}"),
+            )
+            tokens.append(jwt.encode({"sub": user_id, "exp": expire}, secret_key, algorithm="HS256"))
+    return tokens
+
+
+class _Probe:
+    """
+    부하 중 주기적으로 /health 응답 시간과 SQLite 쓰기 잠금 획득 시간을 잰다 (별도 스레드)
+    """
+
+    def __init__(self, base_url: str, db_path: Path | None, interval: float):
+        self.base_url = base_url
+        self.db_path = db_path
+        self.interval = interval
+        self.health_s: List[float] = []
+        self.health_errors = 0
+        self.db_lock_wait_s: List[float] = []
+        self.db_busy = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+
+    def __enter__(self) -> "_Probe":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join(timeout=30)
+
+    def _loop(self) -> None:
+        conn = None
+        if self.db_path is not None:
+            conn = sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+        try:
+            while not self._stop.wait(self.interval):
+                started = time.perf_counter()
+                try:
+                    http_json(f"{self.base_url}/health", timeout=30)
+                    self.health_s.append(time.perf_counter() - started)
+                except OSError:
+                    self.health_errors += 1
+                if conn is not None:
+                    started = time.perf_counter()
+                    try:
+                        # 쓰기 잠금만 잡았다 놓는다 (데이터는 바꾸지 않음)
+                        conn.execute("BEGIN IMMEDIATE")
+                        self.db_lock_wait_s.append(time.perf_counter() - started)
+                        conn.execute("ROLLBACK")
+                    except sqlite3.OperationalError:
+                        self.db_busy += 1
+        finally:
+            if conn is not None:
+                conn.close()
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "health_s": _distribution(self.health_s),
+            "health_errors": self.health_errors,
+            "db_write_lock_wait_s": _distribution(self.db_lock_wait_s),
+            "db_write_lock_busy": self.db_busy,
+        }
+
+
+async def _session(client: httpx.AsyncClient, token: str | None, text: str, name: str) -> Dict[str, Any]:
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    session: Dict[str, Any] = {"ok": False, "gaps_s": [], "events": {}}
+    started = time.perf_counter()
+    res = await client.post(
+        "/api/documents/upload",
+        files={"file": (f"{name}.txt", text.encode("utf-8"), "text/plain")},
+        headers=headers,
+    )
+    session["upload_s"] = time.perf_counter() - started
+    if res.status_code != 200:
+        session["error"] = f"upload {res.status_code}"
+        return session
+
+    started = time.perf_counter()
+    last = None
+    async with client.stream("POST", f"/api/analysis/run-stream/{res.json()['id']}", headers=headers) as stream:
+        if stream.status_code != 200:
+            session["error"] = f"run-stream {stream.status_code}"
+            return session
+        async for line in stream.aiter_lines():
+            if not line.strip():
+                continue
+            now = time.perf_counter()
+            if last is None:
+                session["ttfe_s"] = now - started
+            else:
+                session["gaps_s"].append(now - last)
+            last = now
+            event = json.loads(line)
+            kind = event.get("type", "unknown")
+            session["events"][kind] = session["events"].get(kind, 0) + 1
+            if kind == "final_result":
+                session["ok"] = True
+            elif kind == "error":
+                session["error"] = event.get("message")
+    session["complete_s"] = time.perf_counter() - started
+    return session
+
+
+async def _virtual_user(
+    client: httpx.AsyncClient, index: int, token: str | None, text: str, iterations: int, delay: float
+) -> List[Dict[str, Any]]:
+    await asyncio.sleep(delay)
+    sessions = []
+    for iteration in range(iterations):
+        try:
+            sessions.append(await _session(client, token, text, f"load-{index}-{iteration}"))
+        except httpx.HTTPError as e:
+            sessions.append({"ok": False, "error": f"{type(e).__name__}: {e}", "gaps_s": [], "events": {}})
+    return sessions
+
+
+async def _drive(base_url: str, tokens: List[str | None], text: str, args: argparse.Namespace) -> List[Dict[str, Any]]:
+    limits = httpx.Limits(max_connections=len(tokens) + 4, max_keepalive_connections=len(tokens) + 4)
+    timeout = httpx.Timeout(args.timeout, connect=30)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=timeout) as client:
+        per_user = await asyncio.gather(
+            *[
+                _virtual_user(client, index, token, text, args.iterations, index / args.spawn_rate)
+                for index, token in enumerate(tokens)
+            ]
+        )
+    return [session for sessions in per_user for session in sessions]
+
+
+def _scenario_report(users: int, label: str, text: str, sessions: List[Dict[str, Any]], wall_s: float) -> Dict[str, Any]:
+    events: Dict[str, int] = {}
+    errors: Dict[str, int] = {}
+    for session in sessions:
+        for kind, count in session["events"].items():
+            events[kind] = events.get(kind, 0) + count
+        if not session["ok"]:
+            reason = str(session.get("error") or "no final_result")[:120]
+            errors[reason] = errors.get(reason, 0) + 1
+    completed = sum(1 for session in sessions if session["ok"])
+    return {
+        "users": users,
+        "size": label,
+        "chars": len(text),
+        "sessions": len(sessions),
+        "completed": completed,
+        "failed": len(sessions) - completed,
+        "errors": errors,
+        "wall_s": round(wall_s, 3),
+        "sessions_per_min": round(completed / wall_s * 60, 2) if wall_s else None,
+        "upload_s": _distribution([s["upload_s"] for s in sessions if "upload_s" in s]),
+        "ttfe_s": _distribution([s["ttfe_s"] for s in sessions if "ttfe_s" in s]),
+        "event_gap_s": _distribution([gap for s in sessions for gap in s["gaps_s"]]),
+        "complete_s": _distribution([s["complete_s"] for s in sessions if s["ok"]]),
+        "events": events,
+    }
+
+
+def _print_scenario(report: Dict[str, Any]) -> None:
+    def p(key: str, q: str = "p50") -> Any:
+        return report[key].get(q)
+
+    print(
+        f"users={report['users']:<4} size={report['size']:>5} ok={report['completed']}/{report['sessions']} "
+        f"ttfe p50={p('ttfe_s')}s p99={p('ttfe_s', 'p99')}s "
+        f"gap p99={p('event_gap_s', 'p99')}s complete p50={p('complete_s')}s p99={p('complete_s', 'p99')}s "
+        f"health p99={report['probe']['health_s'].get('p99')}s "
+        f"db_lock p99={report['probe']['db_write_lock_wait_s'].get('p99')}s locked_errors={report['db_locked_errors']}"
+    )
+
+
+def run_scenario(users: int, label: str, text: str, args: argparse.Namespace, mock: MockServer) -> Dict[str, Any]:
+    env = {
+        **BENCH_ENV,
+        "SECRET_KEY": LOAD_SECRET_KEY,
+        "UPSTAGE_BASE_URL": f"{mock.url}/v1",
+        **args.env_overrides,
+    }
+    with BackendServer(env) as backend:
+        tokens: List[str | None] = (
+            [None] * users if args.anonymous else _create_users(backend.db_path, users, env["SECRET_KEY"])
+        )
+        mock.reset()
+        with _Probe(backend.url, backend.db_path, args.probe_interval) as probe:
+            started = time.perf_counter()
+            sessions = asyncio.run(_drive(backend.url, tokens, text, args))
+            wall_s = time.perf_counter() - started
+        report = _scenario_report(users, label, text, sessions, wall_s)
+        report["probe"] = probe.report()
+        report["db_locked_errors"] = backend.count_in_log("database is locked")
+        stats = mock.stats()
+        report["mock"] = {key: stats.get(key) for key in ("calls", "errors", "max_in_flight")}
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="run-stream 동시 세션 부하 테스트 (mock LLM)")
+    parser.add_argument("--users", default="1,4,16", help="동시 사용자 수 목록 (쉼표 구분, 시나리오마다 새 백엔드)")
+    parser.add_argument("--sizes", default="10k", help="원고 크기 목록 (예: 1k,10k,100k)")
+    parser.add_argument("--iterations", type=int, default=1, help="사용자당 업로드+분석 반복 횟수")
+    parser.add_argument("--spawn-rate", type=float, default=4.0, help="초당 사용자 투입 수")
+    parser.add_argument("--timeout", type=float, default=900.0, help="요청/스트림 읽기 타임아웃(초)")
+    parser.add_argument("--probe-interval", type=float, default=0.25)
+    parser.add_argument("--anonymous", action="store_true", help="토큰 없이 실행 (causality_only 모드)")
+    parser.add_argument("--corpus-seed", type=int, default=0)
+    parser.add_argument("--env", action="append", default=[], help="백엔드 설정 덮어쓰기 KEY=VALUE (반복 가능)")
+    parser.add_argument("--out", help="JSON 리포트 저장 경로")
+    add_config_arguments(parser)
+    args = parser.parse_args()
+    args.env_overrides = parse_env_overrides(args.env)
+
+    user_counts = [int(u) for u in args.users.split(",") if u.strip()]
+    corpus = build_corpus([s.strip() for s in args.sizes.split(",") if s.strip()], seed=args.corpus_seed)
+
+    scenarios = []
+    with MockServer(mock_cli_args(args)) as mock:
+        mock_config = mock.stats().get("config")
+        for label, text in corpus.items():
+            for users in user_counts:
+                report = run_scenario(users, label, text, args, mock)
+                _print_scenario(report)
+                scenarios.append(report)
+
+    result = {
+        "meta": {
+            **git_revision(),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "cpu_count": os.cpu_count(),
+            "iterations": args.iterations,
+            "spawn_rate": args.spawn_rate,
+            "anonymous": args.anonymous,
+            "corpus_seed": args.corpus_seed,
+            "mock": mock_config,
+            "env": args.env_overrides,
+        },
+        "scenarios": scenarios,
+    }
+    if args.out:
+        out = Path(args.out)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_text(json.dumps(result, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"report saved: {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,369 @@
+"""
+벤치마크용 OpenAI 호환 LLM 스텁 서버
+
+- POST /v1/chat/completions: 일반/스트리밍(SSE, include_usage) 응답, response_format(JSON 모드) 지원
+- 응답 지연 = 첫 토큰 지연(fixed | uniform | lognormal 분포) + 출력 토큰 수 / tokens_per_sec
+- error_rate 비율로 429/5xx 오류를 주입 (429는 retry-after 헤더 포함)
+- 같은 요청 본문 + 시도 횟수 + seed가 같으면 지연/오류/응답이 항상 같다 (동시 실행 순서와 무관)
+- GET /_stats, POST /_reset: 호출 수, 오류 수, 토큰 수, 최대 동시 요청 수
+
+단독 실행 (실제 백엔드를 스텁에 붙여 부하 테스트할 때):
+    python -m bench.mock_llm --port 8765 --latency lognormal --latency-ms 400 --error-rate 0.02
+    UPSTAGE_API_KEY=bench UPSTAGE_BASE_URL=http://127.0.0.1:8765/v1 uvicorn main:app
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import random
+import re
+import socket
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import List
+from urllib.request import Request as UrlRequest, urlopen
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "lognormal")
+
+BENCH_DIR = Path(__file__).resolve().parent
+
+_QUOTE_RE = re.compile(r"[가-힣][^\"\n\[\]{}]{3,30}?[.!?다]")
+
+
+@dataclass
+class MockLLMConfig:
+    latency: str = "lognormal"
+    latency_ms: float = 300.0  # fixed: 고정값, uniform: 중앙값, lognormal: 중앙값
+    latency_jitter: float = 0.5  # uniform: ±비율, lognormal: sigma
+    tokens_per_sec: float = 80.0  # 0이면 생성 시간 없음
+    error_rate: float = 0.0
+    error_statuses: tuple[int, ...] = (429, 500, 503)
+    retry_after: float = 0.2
+    max_issues: int = 3
+    stream_chunk_chars: int = 16
+    seed: int = 0
+
+
+def _approx_tokens(text: str) -> int:
+    # 한국어 기준 대략 2자 = 1토큰
+    return max(1, len(text) // 2)
+
+
+class _Stats:
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self.started = time.time()
+        self.calls = 0
+        self.stream_calls = 0
+        self.json_mode_calls = 0
+        self.errors = {}
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.attempts = {}
+
+    def snapshot(self) -> dict:
+        return {
+            "uptime_s": round(time.time() - self.started, 3),
+            "calls": self.calls,
+            "stream_calls": self.stream_calls,
+            "json_mode_calls": self.json_mode_calls,
+            "errors": {str(status): count for status, count in self.errors.items()},
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+        }
+
+
+def _request_rng(config: MockLLMConfig, stats: _Stats, body: dict) -> random.Random:
+    # 본문 해시 + 같은 본문의 시도 횟수 -> 재시도는 다른 결과를 받는다
+    digest = hashlib.sha1(json.dumps(body.get("messages"), ensure_ascii=False, sort_keys=True).encode()).hexdigest()
+    attempt = stats.attempts.get(digest, 0)
+    stats.attempts[digest] = attempt + 1
+    return random.Random(f"{config.seed}:{digest}:{attempt}")
+
+
+def _first_token_delay(config: MockLLMConfig, rng: random.Random) -> float:
+    base = config.latency_ms / 1000.0
+    if config.latency == "uniform":
+        return max(0.0, base * (1.0 + rng.uniform(-config.latency_jitter, config.latency_jitter)))
+    if config.latency == "lognormal":
+        return base * math.exp(rng.gauss(0.0, config.latency_jitter))
+    return base
+
+
+def _issue(rng: random.Random, quote: str, index: int) -> dict:
+    return {
+        "issue_type": rng.choice(["tone_shift", "logic_gap", "spacing", "cliche"]),
+        "severity": rng.choice(["low", "medium", "high"]),
+        "ref_id": index,
+        "sentence_index": index,
+        "start_word_id": 0,
+        "end_word_id": 1,
+        "char_start": 0,
+        "char_end": len(quote),
+        "quote": quote,
+        "reason": "벤치마크용 합성 이슈",
+        "confidence": round(rng.uniform(0.4, 0.95), 2),
+    }
+
+
+def _json_content(prompt: str, config: MockLLMConfig, rng: random.Random) -> str:
+    quotes = _QUOTE_RE.findall(prompt)[: max(1, config.max_issues * 4)] or ["원문"]
+    issues = [_issue(rng, rng.choice(quotes), i) for i in range(rng.randint(0, config.max_issues))]
+    if "직전 JSON 응답이" in prompt:
+        return json.dumps({"items": issues}, ensure_ascii=False)
+    section = {"score": rng.randint(50, 95), "issues": issues}
+    if "원고 표면 검사기" in prompt:
+        return json.dumps(
+            {"trauma": section, "hate_bias": {"score": 90, "issues": []}, "spelling": section},
+            ensure_ascii=False,
+        )
+    # 에이전트마다 키가 달라 공통 응답에 모두 넣는다 (각 에이전트는 자기 키만 읽음)
+    return json.dumps(
+        {
+            **section,
+            "note": "벤치마크 응답",
+            "curve": [{"stage": "도입", "tension": "increase", "reason": "합성"}],
+            "anomalies": [],
+            "persona": {"name": "벤치 독자", "age_group": "20대", "reading_level": "보통"},
+            "persona_feedback": {"confusions": [], "missing_context": [], "questions_to_author": []},
+            "guidelines": [],
+        },
+        ensure_ascii=False,
+    )
+
+
+def _text_content(prompt: str, rng: random.Random) -> str:
+    if "마크다운" in prompt or "Markdown" in prompt:
+        return "# 종합 리포트\n\n" + "\n".join(f"- 합성 항목 {i}" for i in range(rng.randint(5, 15)))
+    summary = " ".join(_QUOTE_RE.findall(prompt)[:3])
+    return f"요약: {summary or '합성 원고'}"
+
+
+def create_app(config: MockLLMConfig) -> FastAPI:
+    app = FastAPI()
+    stats = _Stats()
+
+    def _error(status: int) -> JSONResponse:
+        stats.errors[status] = stats.errors.get(status, 0) + 1
+        headers = {"retry-after": str(config.retry_after)} if status == 429 else None
+        return JSONResponse({"error": {"message": f"injected {status}"}}, status_code=status, headers=headers)
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        stats.calls += 1
+        rng = _request_rng(config, stats, body)
+        if config.error_rate and rng.random() < config.error_rate:
+            return _error(rng.choice(config.error_statuses))
+
+        messages = body.get("messages") or []
+        prompt = messages[-1].get("content", "") if messages else ""
+        json_mode = bool(body.get("response_format"))
+        stats.json_mode_calls += int(json_mode)
+        if json_mode or ("JSON" in prompt and "마크다운" not in prompt):
+            content = _json_content(prompt, config, rng)
+        else:
+            content = _text_content(prompt, rng)
+
+        prompt_tokens = _approx_tokens("".join(m.get("content") or "" for m in messages))
+        completion_tokens = _approx_tokens(content)
+        stats.prompt_tokens += prompt_tokens
+        stats.completion_tokens += completion_tokens
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }
+        first_token = _first_token_delay(config, rng)
+        generation = completion_tokens / config.tokens_per_sec if config.tokens_per_sec > 0 else 0.0
+        model = body.get("model", "mock")
+
+        if body.get("stream"):
+            stats.stream_calls += 1
+
+            async def events():
+                stats.in_flight += 1
+                stats.max_in_flight = max(stats.max_in_flight, stats.in_flight)
+                try:
+                    await asyncio.sleep(first_token)
+                    step = max(1, config.stream_chunk_chars)
+                    pieces = [content[i : i + step] for i in range(0, len(content), step)]
+                    for piece in pieces:
+                        chunk = {
+                            "id": "bench",
+                            "object": "chat.completion.chunk",
+                            "created": int(time.time()),
+                            "model": model,
+                            "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}],
+                        }
+                        yield f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n"
+                        await asyncio.sleep(generation / len(pieces))
+                    last = {
+                        "id": "bench",
+                        "object": "chat.completion.chunk",
+                        "created": int(time.time()),
+                        "model": model,
+                        "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+                        "usage": usage,
+                    }
+                    yield f"data: {json.dumps(last)}\n\n"
+                    yield "data: [DONE]\n\n"
+                finally:
+                    stats.in_flight -= 1
+
+            return StreamingResponse(events(), media_type="text/event-stream")
+
+        stats.in_flight += 1
+        stats.max_in_flight = max(stats.max_in_flight, stats.in_flight)
+        try:
+            await asyncio.sleep(first_token + generation)
+        finally:
+            stats.in_flight -= 1
+        return {
+            "id": "bench",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": usage,
+        }
+
+    @app.get("/_stats")
+    async def get_stats():
+        return {"config": asdict(config), **stats.snapshot()}
+
+    @app.post("/_reset")
+    async def reset_stats():
+        stats.reset()
+        return {"ok": True}
+
+    return app
+
+
+def add_config_arguments(parser: argparse.ArgumentParser) -> None:
+    defaults = MockLLMConfig()
+    parser.add_argument("--latency", choices=LATENCY_DISTRIBUTIONS, default=defaults.latency)
+    parser.add_argument("--latency-ms", type=float, default=defaults.latency_ms)
+    parser.add_argument("--latency-jitter", type=float, default=defaults.latency_jitter)
+    parser.add_argument("--tokens-per-sec", type=float, default=defaults.tokens_per_sec)
+    parser.add_argument("--error-rate", type=float, default=defaults.error_rate)
+    parser.add_argument(
+        "--error-statuses",
+        default=",".join(str(s) for s in defaults.error_statuses),
+        help="쉼표로 구분한 주입 상태 코드",
+    )
+    parser.add_argument("--retry-after", type=float, default=defaults.retry_after)
+    parser.add_argument("--max-issues", type=int, default=defaults.max_issues)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+
+
+def config_from_args(args: argparse.Namespace) -> MockLLMConfig:
+    return MockLLMConfig(
+        latency=args.latency,
+        latency_ms=args.latency_ms,
+        latency_jitter=args.latency_jitter,
+        tokens_per_sec=args.tokens_per_sec,
+        error_rate=args.error_rate,
+        error_statuses=tuple(int(s) for s in args.error_statuses.split(",") if s.strip()),
+        retry_after=args.retry_after,
+        max_issues=args.max_issues,
+        seed=args.seed,
+    )
+
+
+def mock_cli_args(args: argparse.Namespace) -> List[str]:
+    """
+    add_config_arguments로 받은 옵션 -> 서브프로세스 실행 인자
+    """
+    return [
+        "--latency", args.latency,
+        "--latency-ms", str(args.latency_ms),
+        "--latency-jitter", str(args.latency_jitter),
+        "--tokens-per-sec", str(args.tokens_per_sec),
+        "--error-rate", str(args.error_rate),
+        "--error-statuses", args.error_statuses,
+        "--retry-after", str(args.retry_after),
+        "--max-issues", str(args.max_issues),
+        "--seed", str(args.seed),
+    ]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def http_json(url: str, method: str = "GET", timeout: float = 5) -> dict:
+    with urlopen(UrlRequest(url, method=method), timeout=timeout) as resp:
+        return json.loads(resp.read().decode("utf-8"))
+
+
+class MockServer:
+    """
+    스텁을 서브프로세스로 실행 (벤치 프로세스의 GIL/이벤트 루프와 분리)
+    """
+
+    def __init__(self, mock_args: List[str]):
+        self.port = free_port()
+        self.url = f"http://127.0.0.1:{self.port}"
+        self._args = mock_args
+        self._proc: subprocess.Popen | None = None
+
+    def __enter__(self) -> "MockServer":
+        self._proc = subprocess.Popen(
+            [sys.executable, "-m", "bench.mock_llm", "--port", str(self.port), *self._args],
+            cwd=BENCH_DIR.parent,
+        )
+        deadline = time.time() + 20
+        while time.time() < deadline:
+            if self._proc.poll() is not None:
+                raise RuntimeError("Mock LLM server exited during startup")
+            try:
+                self.stats()
+                return self
+            except OSError:
+                time.sleep(0.1)
+        self.__exit__(None, None, None)
+        raise RuntimeError("Mock LLM server did not start")
+
+    def __exit__(self, *exc) -> None:
+        if self._proc is not None:
+            self._proc.terminate()
+            try:
+                self._proc.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self._proc.kill()
+
+    def stats(self) -> dict:
+        return http_json(f"{self.url}/_stats")
+
+    def reset(self) -> None:
+        http_json(f"{self.url}/_reset", method="POST")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="OpenAI 호환 벤치마크용 LLM 스텁")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    add_config_arguments(parser)
+    args = parser.parse_args()
+    uvicorn.run(create_app(config_from_args(args)), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+"""
+오프라인 파이프라인 벤치마크 실행기
+
+1. bench.mock_llm 스텁을 별도 프로세스로 띄우고 UPSTAGE_BASE_URL을 스텁으로 돌린다
+   (앱 모듈은 환경 변수 설정 뒤에 import해야 설정이 반영된다)
+2. 합성 원고 크기별로 대상(analysis | stream | pipeline)을 --repeat회 실행
+3. 처리량(chars/s), 지연(p50/p95, 스트림 첫 이벤트), LLM 호출/토큰/대기(RunMetrics),
+   메모리(RSS 최고치, 선택적으로 tracemalloc 최고치)를 JSON 리포트로 저장
+4. --compare로 이전 리포트와 (대상, 크기)별 비율을 출력
+
+예:
+    python -m bench.run --sizes 1k,10k --targets analysis,stream --repeat 3 --out bench/results/base.json
+    python -m bench.run --sizes 10k --env FUSED_SURFACE_SCAN=true --compare bench/results/base.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List
+
+from bench.corpus import DEFAULT_SIZES, build_corpus
+from bench.mock_llm import MockServer, add_config_arguments, mock_cli_args
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+TARGETS = ("analysis", "stream", "pipeline")
+ISSUE_KEYS = ("tone", "logic", "trauma", "hate_bias", "genre_cliche", "spelling")
+
+# 스텁 대상 실행에서 결과에 영향을 주는 캐시/체크포인트는 끈다 (반복 실행이 캐시 히트가 되지 않도록)
+BENCH_ENV = {
+    "UPSTAGE_API_KEY": "bench",
+    "LLM_CACHE_ENABLED": "false",
+    "GRAPH_CHECKPOINT_ENABLED": "false",
+}
+
+
+def git_revision() -> Dict[str, Any]:
+    def git(*args: str) -> str:
+        try:
+            return subprocess.run(
+                ["git", *args], cwd=BACKEND_DIR, capture_output=True, text=True, timeout=30
+            ).stdout.strip()
+        except Exception:
+            return ""
+
+    return {"commit": git("rev-parse", "--short", "HEAD"), "dirty": bool(git("status", "--porcelain", "--", "app"))}
+
+
+def _rss_peak_mb() -> float:
+    # 리눅스 ru_maxrss 단위는 KB, macOS는 byte
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _issue_count(result: Dict[str, Any]) -> int:
+    total = 0
+    for key in ISSUE_KEYS:
+        section = result.get(key)
+        if isinstance(section, dict):
+            total += len(section.get("issues") or [])
+    return total
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def _run_analysis(text: str) -> Dict[str, Any]:
+    from app.services.analysis_runner import run_analysis_for_text
+
+    result = await run_analysis_for_text(text, run_id=uuid.uuid4().hex)
+    return {"result": result, "run_metrics": (result.get("debug") or {}).get("run_metrics")}
+
+
+async def _run_stream(text: str) -> Dict[str, Any]:
+    from app.services.analysis_runner import stream_analysis_for_text
+
+    started = time.perf_counter()
+    first_event = first_issue = None
+    events: Dict[str, int] = {}
+    result: Dict[str, Any] = {}
+    async for event in stream_analysis_for_text(text, run_id=uuid.uuid4().hex):
+        now = time.perf_counter() - started
+        first_event = first_event if first_event is not None else now
+        kind = event.get("type", "unknown")
+        events[kind] = events.get(kind, 0) + 1
+        if kind == "issue_found" and first_issue is None:
+            first_issue = now
+        elif kind == "final_result":
+            result = event.get("data") or {}
+    return {
+        "result": result,
+        "run_metrics": (result.get("debug") or {}).get("run_metrics"),
+        "first_event_s": round(first_event or 0.0, 4),
+        "first_issue_s": round(first_issue, 4) if first_issue is not None else None,
+        "events": events,
+    }
+
+
+async def _run_pipeline(text: str) -> Dict[str, Any]:
+    from app.observability.metrics import run_metrics_scope
+    from app.services.pipeline_runner import run_full_pipeline
+
+    def run() -> Dict[str, Any]:
+        with run_metrics_scope() as metrics:
+            result = run_full_pipeline(text)
+        return {"result": result, "run_metrics": metrics.snapshot()}
+
+    return await asyncio.to_thread(run)
+
+
+RUNNERS = {"analysis": _run_analysis, "stream": _run_stream, "pipeline": _run_pipeline}
+
+
+def _summarize_metrics(run_metrics: Dict[str, Any] | None) -> Dict[str, Any]:
+    if not run_metrics:
+        return {}
+    keys = ("llm_calls", "llm_failures", "retries", "queue_wait_ms", "llm_ms", "prompt_tokens", "completion_tokens", "chunks", "chunk_failures")
+    summary = {key: run_metrics.get(key) for key in keys}
+    # 가장 느린 노드 3개 (RunMetrics.nodes는 wall_ms 내림차순)
+    summary["slowest_nodes"] = {
+        name: stats.get("wall_ms") for name, stats in list((run_metrics.get("nodes") or {}).items())[:3]
+    }
+    return summary
+
+
+async def _bench_case(target: str, label: str, text: str, repeat: int, mock: MockServer, trace: bool) -> Dict[str, Any]:
+    runner = RUNNERS[target]
+    walls: List[float] = []
+    last: Dict[str, Any] = {}
+    mock.reset()
+    if trace:
+        tracemalloc.start()
+    try:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            last = await runner(text)
+            walls.append(time.perf_counter() - started)
+        traced_peak = tracemalloc.get_traced_memory()[1] if trace else None
+    finally:
+        if trace:
+            tracemalloc.stop()
+    mock_stats = mock.stats()
+
+    p50 = statistics.median(walls)
+    case = {
+        "target": target,
+        "size": label,
+        "chars": len(text),
+        "repeat": repeat,
+        "wall_s": {
+            "p50": round(p50, 4),
+            "p95": round(percentile(walls, 95), 4),
+            "min": round(min(walls), 4),
+            "max": round(max(walls), 4),
+        },
+        "chars_per_s": round(len(text) / p50, 1) if p50 else None,
+        "issues": _issue_count(last.get("result") or {}),
+        "run_metrics": _summarize_metrics(last.get("run_metrics")),
+        "mock": {key: mock_stats.get(key) for key in ("calls", "errors", "max_in_flight", "prompt_tokens", "completion_tokens")},
+        "rss_peak_mb": _rss_peak_mb(),
+    }
+    if traced_peak is not None:
+        case["traced_peak_mb"] = round(traced_peak / (1024 * 1024), 1)
+    for key in ("first_event_s", "first_issue_s", "events"):
+        if key in last:
+            case[key] = last[key]
+    return case
+
+
+def _print_case(case: Dict[str, Any]) -> None:
+    metrics = case.get("run_metrics") or {}
+    extra = f" first_event={case['first_event_s']}s first_issue={case.get('first_issue_s')}s" if "first_event_s" in case else ""
+    print(
+        f"{case['target']:<9} {case['size']:>6} ({case['chars']:>8} chars) "
+        f"p50={case['wall_s']['p50']:.3f}s p95={case['wall_s']['p95']:.3f}s "
+        f"{case['chars_per_s']} chars/s llm_calls={metrics.get('llm_calls')} "
+        f"queue_wait={metrics.get('queue_wait_ms')}ms rss_peak={case['rss_peak_mb']}MB{extra}"
+    )
+
+
+def compare_reports(current: Dict[str, Any], baseline: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    (대상, 크기)가 같은 케이스끼리 p50 지연/처리량/호출 수 비교. ratio < 1이면 현재가 더 빠름
+    """
+    base_cases = {(case["target"], case["size"]): case for case in baseline.get("results", [])}
+    rows = []
+    for case in current.get("results", []):
+        base = base_cases.get((case["target"], case["size"]))
+        if base is None:
+            continue
+        base_p50 = base["wall_s"]["p50"]
+        rows.append(
+            {
+                "target": case["target"],
+                "size": case["size"],
+                "p50_s": [base_p50, case["wall_s"]["p50"]],
+                "p50_ratio": round(case["wall_s"]["p50"] / base_p50, 3) if base_p50 else None,
+                "llm_calls": [
+                    (base.get("run_metrics") or {}).get("llm_calls"),
+                    (case.get("run_metrics") or {}).get("llm_calls"),
+                ],
+                "rss_peak_mb": [base.get("rss_peak_mb"), case.get("rss_peak_mb")],
+            }
+        )
+    return rows
+
+
+def parse_env_overrides(pairs: List[str]) -> Dict[str, str]:
+    overrides = {}
+    for pair in pairs:
+        key, sep, value = pair.partition("=")
+        if not sep:
+            raise SystemExit(f"--env expects KEY=VALUE, got {pair!r}")
+        overrides[key.strip()] = value
+    return overrides
+
+
+async def _run_all(args: argparse.Namespace, corpus: Dict[str, str], mock: MockServer) -> List[Dict[str, Any]]:
+    results = []
+    for target in args.targets:
+        for label, text in corpus.items():
+            case = await _bench_case(target, label, text, args.repeat, mock, args.tracemalloc)
+            _print_case(case)
+            results.append(case)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="오프라인 분석 파이프라인 벤치마크 (mock LLM)")
+    parser.add_argument("--sizes", default=",".join(DEFAULT_SIZES), help="예: 1k,10k,100k,1m")
+    parser.add_argument("--targets", default="analysis,stream,pipeline", help=f"{','.join(TARGETS)} 중 선택")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--corpus-seed", type=int, default=0)
+    parser.add_argument("--tracemalloc", action="store_true", help="파이썬 힙 최고치 측정 (느려짐)")
+    parser.add_argument("--env", action="append", default=[], help="앱 설정 덮어쓰기 KEY=VALUE (반복 가능)")
+    parser.add_argument("--out", help="JSON 리포트 저장 경로")
+    parser.add_argument("--compare", help="비교할 이전 리포트 경로")
+    add_config_arguments(parser)
+    args = parser.parse_args()
+    args.targets = [t.strip() for t in args.targets.split(",") if t.strip()]
+    unknown = [t for t in args.targets if t not in TARGETS]
+    if unknown:
+        parser.error(f"unknown targets: {unknown}")
+
+    env_overrides = parse_env_overrides(args.env)
+    corpus = build_corpus([s.strip() for s in args.sizes.split(",") if s.strip()], seed=args.corpus_seed)
+
+    with MockServer(mock_cli_args(args)) as mock:
+        os.environ.update({**BENCH_ENV, "UPSTAGE_BASE_URL": f"{mock.url}/v1", **env_overrides})
+        results = asyncio.run(_run_all(args, corpus, mock))
+        mock_config = mock.stats().get("config")
+
+    report = {
+        "meta": {
+            **git_revision(),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "corpus_seed": args.corpus_seed,
+            "mock": mock_config,
+            "env": env_overrides,
+        },
+        "results": results,
+    }
+    if args.out:
+        out = Path(args.out)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"report saved: {out}")
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        print(f"compare with {baseline.get('meta', {}).get('commit')} -> {report['meta']['commit']}")
+        for row in compare_reports(report, baseline):
+            print(json.dumps(row, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -14,6 +14,11 @@ from app.webapi.routes import router as api_router
 from app.core.settings import get_settings
 from app.core.db import init_db
 from app.core.logging import setup_logging
+from app.graph.checkpoint import close_checkpointer
+from app.llm.client import close_upstage_clients
+from app.llm.cache import get_response_cache, set_response_cache
+from app.llm.scheduler import get_llm_scheduler
+from app.services.job_queue import get_job_worker_pool
 from starlette.middleware.sessions import SessionMiddleware
 
 # Configure logging immediately
@@ -38,6 +43,7 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["X-Next-Cursor"],  # 목록 API 키셋 페이지네이션
     )
 
     # -------------------------
@@ -48,6 +54,14 @@ def create_app() -> FastAPI:
     @app.on_event("startup")
     async def _startup() -> None:
         await init_db()
+        await get_job_worker_pool().start()
+
+    @app.on_event("shutdown")
+    async def _shutdown() -> None:
+        await get_job_worker_pool().stop()
+        await close_checkpointer()
+        await close_upstage_clients()
+        set_response_cache(None)
 
     logger = logging.getLogger("app.request")
 
@@ -61,7 +75,12 @@ def create_app() -> FastAPI:
     # -------------------------
     @app.get("/health", tags=["health"])
     async def health():
-        return {"status": "ok"}
+        return {
+            "status": "ok",
+            "llm_cache": get_response_cache().stats(),
+            "llm_scheduler": get_llm_scheduler().stats(),
+            "analysis_jobs": get_job_worker_pool().stats(),
+        }
 
     return app
 
@@ -0,0 +1,30 @@
+CREATE TABLE IF NOT EXISTS analysis_jobs (
+    id TEXT PRIMARY KEY,
+    document_id TEXT NOT NULL REFERENCES documents(id),
+    user_id TEXT,
+    status TEXT DEFAULT 'queued',
+    mode TEXT DEFAULT 'full',
+    options_json TEXT DEFAULT '{}',
+    incremental BOOLEAN DEFAULT 1,
+    analysis_id TEXT,
+    error TEXT,
+    attempts INTEGER DEFAULT 0,
+    worker_id TEXT,
+    heartbeat_at DATETIME,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    started_at DATETIME,
+    finished_at DATETIME
+);
+
+CREATE INDEX IF NOT EXISTS ix_analysis_jobs_document_id ON analysis_jobs (document_id);
+CREATE INDEX IF NOT EXISTS ix_analysis_jobs_status ON analysis_jobs (status);
+
+CREATE TABLE IF NOT EXISTS analysis_job_events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id TEXT NOT NULL REFERENCES analysis_jobs(id) ON DELETE CASCADE,
+    seq INTEGER NOT NULL,
+    event_json TEXT NOT NULL,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS ix_analysis_job_events_job_id ON analysis_job_events (job_id);
@@ -0,0 +1,2 @@
+-- Add Analysis.metrics_json (per-node latency/token/cost metrics)
+ALTER TABLE analyses ADD COLUMN metrics_json TEXT DEFAULT '{}';
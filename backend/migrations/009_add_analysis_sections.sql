@@ -0,0 +1,10 @@
+ALTER TABLE analyses ADD COLUMN result_format TEXT DEFAULT 'json';
+
+CREATE TABLE IF NOT EXISTS analysis_sections (
+    analysis_id TEXT NOT NULL REFERENCES analyses(id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    codec TEXT DEFAULT 'none',
+    data BLOB NOT NULL,
+    raw_bytes INTEGER DEFAULT 0,
+    PRIMARY KEY (analysis_id, name)
+);
@@ -0,0 +1,2 @@
+CREATE INDEX IF NOT EXISTS ix_documents_user_id_created_at ON documents (user_id, created_at, id);
+CREATE INDEX IF NOT EXISTS ix_analyses_document_id_created_at ON analyses (document_id, created_at, id);
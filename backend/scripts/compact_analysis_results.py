@@ -0,0 +1,59 @@
+import asyncio
+import os
+import sys
+
+from sqlalchemy import select, text
+
+# Add backend to path
+sys.path.append(os.getcwd())
+
+from app.core import db
+from app.core.db import Analysis, get_session, init_db
+from app.core.serialization import loads
+from app.services.result_storage import LEGACY_RESULT_FORMAT, RESULT_FORMAT, build_sections
+
+BATCH_SIZE = 50
+
+
+async def main(vacuum: bool):
+    """
+    예전 형식(result_json 전체 TEXT) 분석 행을 섹션별 압축 저장(analysis_sections)으로 변환
+    먼저 migrations/009_add_analysis_sections.sql 을 적용해야 한다.
+    """
+    await init_db()
+    converted = saved = 0
+    while True:
+        async with get_session() as session:
+            res = await session.execute(
+                select(Analysis)
+                .where((Analysis.result_format == LEGACY_RESULT_FORMAT) | (Analysis.result_format.is_(None)))
+                .limit(BATCH_SIZE)
+            )
+            rows = res.scalars().all()
+            if not rows:
+                break
+            for analysis in rows:
+                before = len((analysis.result_json or "").encode("utf-8"))
+                result = loads(analysis.result_json) if analysis.result_json else {}
+                sections = build_sections(result)
+                for section in sections:
+                    section.analysis_id = analysis.id
+                session.add_all(sections)
+                analysis.result_format = RESULT_FORMAT
+                analysis.result_json = ""
+                saved += before - sum(len(section.data) for section in sections)
+                converted += 1
+            await session.commit()
+        print(f"converted {converted} analyses")
+
+    print(f"Done. {converted} analyses converted, ~{saved / (1024 * 1024):.1f} MB of result data saved.")
+    if vacuum:
+        # VACUUM은 트랜잭션 밖에서만 실행된다
+        async with db.engine.connect() as conn:
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            await conn.execute(text("VACUUM"))
+        print("VACUUM finished.")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(vacuum="--vacuum" in sys.argv))
@@ -0,0 +1,50 @@
+"""
+API 서버와 분리된 분석 작업 워커 프로세스
+
+    cd backend && python scripts/run_job_worker.py [--workers N]
+
+API 쪽은 ANALYSIS_JOB_WORKERS=0 으로 두고 이 스크립트를 원하는 만큼 띄우면
+API와 워커를 따로 확장할 수 있다.
+"""
+import argparse
+import asyncio
+import signal
+import sys
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_DIR))
+load_dotenv(dotenv_path=BACKEND_DIR / ".env")
+
+from app.core.db import init_db  # noqa: E402
+from app.core.logging import setup_logging  # noqa: E402
+from app.core.settings import get_settings  # noqa: E402
+from app.graph.checkpoint import close_checkpointer  # noqa: E402
+from app.llm.client import close_upstage_clients  # noqa: E402
+from app.services.job_queue import get_job_worker_pool  # noqa: E402
+
+
+async def main(workers: int) -> None:
+    await init_db()
+    pool = get_job_worker_pool(workers=workers)
+    await pool.start()
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    await stop.wait()
+
+    await pool.stop()
+    await close_checkpointer()
+    await close_upstage_clients()
+
+
+if __name__ == "__main__":
+    setup_logging()
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=max(1, get_settings().analysis_job_workers))
+    args = parser.parse_args()
+    asyncio.run(main(args.workers))
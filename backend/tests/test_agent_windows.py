@@ -0,0 +1,78 @@
+"""
+청크/윈도우 map 단계 회귀 테스트
+
+앞쪽에 예산보다 긴 문장이 있으면 여러 윈도우의 window_start가 같아질 수 있다.
+결과는 window_start가 아니라 각 윈도우(core 구간)에 정확히 붙어야 한다.
+
+    cd backend && python -m unittest discover -s tests
+"""
+import asyncio
+import unittest
+
+from app.agents.base import BaseAgent
+
+# 2000자 문장 3개(각각 예산 절반 이상) + 짧은 문장 20개
+SENTENCES = ["가" * 2000] * 3 + ["나" * 10] * 20
+TOKEN_BUDGET = 3250
+
+
+def _window_issues(chunk):
+    # 윈도우 로컬 인덱스로 문장마다 이슈 1개
+    return {"score": 90, "issues": [{"sentence_index": i, "quote": s[:3]} for i, s in enumerate(chunk)]}
+
+
+def _chunk_issues(chunk, start):
+    # 청크 에이전트는 전역 인덱스로 변환된 결과를 돌려준다
+    return {"score": 90, "issues": [{"sentence_index": start + i, "quote": s[:3]} for i, s in enumerate(chunk)]}
+
+
+class OversizedLeadingSentenceTest(unittest.TestCase):
+    def setUp(self):
+        self.agent = BaseAgent()
+        self.agent.token_budget = TOKEN_BUDGET
+        self.agent.window_overlap = 5
+        self.agent.chunk_overlap = 1
+
+    def _assert_each_sentence_once(self, results, units):
+        merged = self.agent._reduce_window_results(results, len(SENTENCES), len(units))
+        self.assertEqual([issue["sentence_index"] for issue in merged["issues"]], list(range(len(SENTENCES))))
+
+    def _assert_chunk_sentences_once(self, results):
+        indices = sorted(issue["sentence_index"] for res in results for issue in res["issues"])
+        self.assertEqual(indices, list(range(len(SENTENCES))))
+
+    def test_windows_share_window_start(self):
+        windows = self.agent._window_sentences(SENTENCES)
+        starts = [window[1] for window in windows]
+        self.assertLess(len(set(starts)), len(starts))
+
+    def test_map_windows(self):
+        windows = self.agent._window_sentences(SENTENCES)
+        self._assert_each_sentence_once(self.agent._map_windows(windows, _window_issues), windows)
+
+    def test_amap_windows(self):
+        windows = self.agent._window_sentences(SENTENCES)
+
+        async def analyze(chunk):
+            return _window_issues(chunk)
+
+        results = asyncio.run(self.agent._amap_windows(windows, analyze))
+        self._assert_each_sentence_once(results, windows)
+
+    def test_map_chunks(self):
+        chunks = self.agent._chunk_sentences(SENTENCES)
+        starts = [chunk[1] for chunk in chunks]
+        self.assertLess(len(set(starts)), len(starts))
+        self._assert_chunk_sentences_once(self.agent._map_chunks(chunks, _chunk_issues))
+
+    def test_amap_chunks(self):
+        chunks = self.agent._chunk_sentences(SENTENCES)
+
+        async def analyze(chunk, start):
+            return _chunk_issues(chunk, start)
+
+        self._assert_chunk_sentences_once(asyncio.run(self.agent._amap_chunks(chunks, analyze)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+"""
+증분 재분석 문장 대응(sentence_map) 테스트
+
+    cd backend && python -m unittest discover -s tests
+"""
+import time
+import unittest
+
+from app.services.incremental_analysis import (
+    build_incremental_base,
+    build_incremental_state,
+    build_sentence_map,
+)
+
+
+class SentenceMapTest(unittest.TestCase):
+    def test_edit_in_middle(self):
+        old = ["a", "b", "c", "d", "e"]
+        new = ["a", "b", "x", "d", "e"]
+        self.assertEqual(build_sentence_map(old, new), [0, 1, None, 3, 4])
+
+    def test_insert_and_delete(self):
+        old = ["a", "b", "c", "d"]
+        new = ["z", "a", "c", "d", "y"]
+        self.assertEqual(build_sentence_map(old, new), [None, 0, 2, 3, None])
+
+    def test_repeated_sentences_in_changed_region(self):
+        # 반복 문장이 섞인 구간도 최대한 많이, 순서대로 대응
+        old = ["a", "-", "-", "b", "-", "c"]
+        new = ["a", "-", "b", "-", "-", "c"]
+        mapped = build_sentence_map(old, new)
+        self.assertEqual(mapped[0], 0)
+        self.assertEqual(mapped[-1], 5)
+        self.assertEqual(sum(1 for idx in mapped if idx is not None), 5)
+        pairs = [(b, a) for b, a in enumerate(mapped) if a is not None]
+        # 대응은 양쪽 순서를 보존한다
+        self.assertEqual(sorted(pairs, key=lambda p: p[1]), pairs)
+
+    def test_moved_block_keeps_order(self):
+        old = ["a", "b", "c", "d", "e"]
+        new = ["d", "a", "b", "c", "e"]
+        mapped = build_sentence_map(old, new)
+        self.assertEqual(mapped, [None, 0, 1, 2, 4])
+
+    def test_long_manuscript_is_fast(self):
+        old = [f"s{i}" for i in range(60_000)]
+        new = list(old)
+        new[30_000] = "edited"
+        del new[10_000:10_010]
+        started = time.perf_counter()
+        mapped = build_sentence_map(old, new)
+        self.assertLess(time.perf_counter() - started, 2.0)
+        self.assertEqual(sum(1 for idx in mapped if idx is not None), len(new) - 1)
+
+
+class IncrementalBaseTest(unittest.TestCase):
+    def test_base_keeps_hashes_and_reusable_results_only(self):
+        previous = {
+            "split": {"split_sentences": ["하나.", "둘.", "셋."]},
+            "trauma": {"score": 90, "issues": []},
+            "tone": {"score": 80, "issues": []},
+        }
+        base = build_incremental_base(previous)
+        self.assertEqual(set(base), {"sentence_hashes", "results"})
+        self.assertEqual(set(base["results"]), {"trauma"})
+
+        incremental = build_incremental_state(base, ["하나.", "둘!", "셋."])
+        self.assertEqual(incremental["sentence_map"], [0, None, 2])
+        self.assertEqual(incremental["reused_sentences"], 2)
+
+    def test_no_reusable_results(self):
+        self.assertIsNone(build_incremental_base({"split_sentences": ["a"], "tone": {"issues": []}}))
+
+
+if __name__ == "__main__":
+    unittest.main()
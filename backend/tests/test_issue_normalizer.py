@@ -0,0 +1,101 @@
+"""
+인용문 -> 문서 위치 고정(normalize_issues, 근사 매칭) 테스트
+
+    cd backend && python -m unittest discover -s tests
+"""
+import random
+import unittest
+
+from app.services.issue_normalizer import _fuzzy_find, _myers_scan, normalize_issues
+from app.services.split_map import split_with_map
+
+TEXT = "그는 문을 열었다.  \n  \"왜?\" 그녀가 물었다. 대답은 없었다."
+
+
+def _locate(issue: dict, text: str = TEXT) -> dict | None:
+    sentences, split_map = split_with_map(text)
+    normalized, _ = normalize_issues(
+        {"tone": {"issues": [issue]}},
+        {"split_sentences": sentences, "split_map": split_map},
+    )
+    return normalized[0]["location"]
+
+
+class CrossSentenceQuoteTest(unittest.TestCase):
+    def test_quote_in_one_sentence(self):
+        location = _locate({"quote": "대답은"})
+        self.assertEqual(TEXT[location["doc_start"]:location["doc_end"]], "대답은")
+        self.assertEqual(location["confidence"], 1.0)
+
+    def test_quote_across_sentences_without_index(self):
+        # n-gram 색인(문장 단위)에서는 못 찾으므로 이어 붙인 문서 전체에서 찾는다
+        location = _locate({"quote": '문을 열었다. "왜?"'})
+        self.assertEqual(location["sentence_index"], 0)
+        self.assertEqual(TEXT[location["doc_start"]:location["doc_end"]], '문을 열었다.  \n  "왜?"')
+
+    def test_quote_across_sentences_with_hint(self):
+        # 인용문의 줄바꿈/공백은 문장 사이 공백과 같이 취급
+        location = _locate({"quote": '열었다.\n"왜?" 그녀가', "sentence_index": 0})
+        self.assertEqual(TEXT[location["doc_start"]:location["doc_end"]], '열었다.  \n  "왜?" 그녀가')
+        self.assertEqual(location["confidence"], 1.0)
+
+    def test_missing_quote(self):
+        self.assertIsNone(_locate({"quote": "원고에 없는 말"}))
+
+
+def _edit_distance_ending_at(pattern: str, text: str) -> list:
+    # 검증용 DP: text[j]에서 끝나는 부분 문자열과 pattern의 최소 편집 거리
+    prev = list(range(len(pattern) + 1))
+    scores = []
+    for ch in text:
+        cur = [0]
+        for i, p in enumerate(pattern, 1):
+            cur.append(min(prev[i] + 1, cur[i - 1] + 1, prev[i - 1] + (p != ch)))
+        scores.append(cur[-1])
+        prev = cur
+    return scores
+
+
+class MyersScanTest(unittest.TestCase):
+    def test_matches_dynamic_programming(self):
+        rng = random.Random(3)
+        for _ in range(300):
+            pattern = "".join(rng.choice("가나다ab") for _ in range(rng.randint(1, 70)))
+            text = "".join(rng.choice("가나다abc") for _ in range(rng.randint(1, 90)))
+            self.assertEqual(_myers_scan(pattern, text), _edit_distance_ending_at(pattern, text), (pattern, text))
+
+
+class FuzzyFindTest(unittest.TestCase):
+    SENTENCE = "그녀는 창밖을 바라보며 조용히 한숨을 쉬었다."
+
+    def test_exact(self):
+        start, end, confidence = _fuzzy_find("조용히 한숨을", self.SENTENCE)
+        self.assertEqual(self.SENTENCE[start:end], "조용히 한숨을")
+        self.assertEqual(confidence, 1.0)
+
+    def test_approximate(self):
+        # LLM이 띄어쓰기/글자 하나를 바꿔 인용
+        start, end, confidence = _fuzzy_find("조용히한숨을 쉬엇다", self.SENTENCE)
+        self.assertEqual(self.SENTENCE[start:end], "조용히 한숨을 쉬었다")
+        self.assertEqual(confidence, 0.8)
+
+    def test_too_different_or_short(self):
+        self.assertEqual(_fuzzy_find("전혀 다른 문장입니다", self.SENTENCE), (None, None, 0.0))
+        self.assertEqual(_fuzzy_find("창밖", self.SENTENCE), (None, None, 0.0))
+
+    def test_hint_breaks_ties(self):
+        sentence = "비가 온다. 그리고 또 비가 온다."
+        start, _, _ = _fuzzy_find("비가 온다", sentence, hint_start=12)
+        self.assertEqual(start, 13)
+        start, _, _ = _fuzzy_find("비가 온다", sentence)
+        self.assertEqual(start, 0)
+
+    def test_normalize_issues_uses_fuzzy_anchor(self):
+        text = "첫 문장이다. " + self.SENTENCE
+        location = _locate({"quote": "조용히한숨을 쉬엇다", "sentence_index": 1}, text)
+        self.assertEqual(text[location["doc_start"]:location["doc_end"]], "조용히 한숨을 쉬었다")
+        self.assertLess(location["confidence"], 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
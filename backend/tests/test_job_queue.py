@@ -0,0 +1,107 @@
+"""
+백그라운드 분석 작업 큐 claim/requeue 테스트 (임시 SQLite DB)
+
+    cd backend && python -m unittest discover -s tests
+"""
+import asyncio
+import os
+import tempfile
+import unittest
+from datetime import timedelta
+
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core import db
+from app.core.db import AnalysisJob, Base
+from app.services.job_queue import (
+    AnalysisJobWorkerPool,
+    _utcnow,
+    enqueue_analysis_job,
+    get_analysis_job,
+    retry_analysis_job,
+)
+
+
+def _pool(max_attempts: int = 3) -> AnalysisJobWorkerPool:
+    return AnalysisJobWorkerPool(workers=1, poll_interval=0.1, stale_seconds=30, max_attempts=max_attempts)
+
+
+class JobClaimTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self._saved = (db.engine, db.SessionLocal)
+        db.engine = create_async_engine(f"sqlite+aiosqlite:///{os.path.join(self._tmp.name, 'jobs.db')}")
+        db.SessionLocal = async_sessionmaker(db.engine, expire_on_commit=False)
+        async with db.engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    async def asyncTearDown(self):
+        await db.engine.dispose()
+        db.engine, db.SessionLocal = self._saved
+        self._tmp.cleanup()
+
+    async def _set(self, job_id: str, **values) -> None:
+        async with db.get_session() as session:
+            await session.execute(update(AnalysisJob).where(AnalysisJob.id == job_id).values(**values))
+            await session.commit()
+
+    async def _set_stale(self, job_id: str) -> None:
+        await self._set(job_id, heartbeat_at=_utcnow() - timedelta(seconds=120))
+
+    async def test_only_one_worker_claims_a_job(self):
+        job = await enqueue_analysis_job("doc-1", "full")
+        claimed = await asyncio.gather(*(_pool()._claim_next() for _ in range(4)))
+        self.assertEqual([job_id for job_id in claimed if job_id], [job.id])
+
+        stored = await get_analysis_job(job.id)
+        self.assertEqual(stored.status, "running")
+        self.assertEqual(stored.attempts, 1)
+        self.assertIsNotNone(stored.worker_id)
+
+    async def test_claims_oldest_first(self):
+        second = await enqueue_analysis_job("doc-2", "full")
+        first = await enqueue_analysis_job("doc-1", "full")
+        # created_at(server_default)은 초 단위라 명시적으로 앞당긴다
+        await self._set(first.id, created_at=_utcnow() - timedelta(minutes=1))
+        pool = _pool()
+        self.assertEqual(await pool._claim_next(), first.id)
+        self.assertEqual(await pool._claim_next(), second.id)
+        self.assertIsNone(await pool._claim_next())
+
+    async def test_stale_job_is_requeued_then_failed(self):
+        job = await enqueue_analysis_job("doc-1", "full")
+        pool = _pool(max_attempts=2)
+
+        await pool._claim_next()
+        await self._set_stale(job.id)
+        self.assertEqual(await pool.requeue_stale_jobs(), 1)
+        stored = await get_analysis_job(job.id)
+        self.assertEqual((stored.status, stored.worker_id), ("queued", None))
+
+        # 재시도 횟수를 다 쓰면 다시 대기열에 넣지 않고 실패로 마감
+        await pool._claim_next()
+        await self._set_stale(job.id)
+        self.assertEqual(await pool.requeue_stale_jobs(), 0)
+        stored = await get_analysis_job(job.id)
+        self.assertEqual((stored.status, stored.error, stored.attempts), ("failed", "Worker lost", 2))
+
+    async def test_live_job_is_not_requeued(self):
+        job = await enqueue_analysis_job("doc-1", "full")
+        pool = _pool()
+        await pool._claim_next()
+        self.assertEqual(await pool.requeue_stale_jobs(), 0)
+        self.assertEqual((await get_analysis_job(job.id)).status, "running")
+
+    async def test_retry_only_failed_jobs(self):
+        job = await enqueue_analysis_job("doc-1", "full")
+        self.assertFalse(await retry_analysis_job(job.id))
+
+        await _pool()._finish(job.id, "failed", None, "boom")
+        self.assertTrue(await retry_analysis_job(job.id))
+        stored = await get_analysis_job(job.id)
+        self.assertEqual((stored.status, stored.error), ("queued", None))
+
+
+if __name__ == "__main__":
+    unittest.main()
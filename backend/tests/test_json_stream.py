@@ -0,0 +1,94 @@
+"""
+증분 JSON 파서와 잘린 응답 이어받기(chat_json) 테스트
+
+    cd backend && python -m unittest discover -s tests
+"""
+import unittest
+from unittest import mock
+
+from app.llm import chat
+from app.llm.json_stream import IncrementalJSONParser, parse_json_text
+
+NESTED_CUT = '{"trauma":{"score":90,"issues":[{"a":1},{"b"'
+
+
+class IncrementalJSONParserTest(unittest.TestCase):
+    def test_chunked_feed_matches_whole(self):
+        text = '설명 [참고] {"score": 80, "issues": [{"q": "a,b"}, {"q": "c\\"}"}]} 끝'
+        parser = IncrementalJSONParser()
+        for i in range(0, len(text), 3):
+            parser.feed(text[i:i + 3])
+        self.assertTrue(parser.complete)
+        self.assertEqual(parser.result(), {"score": 80, "issues": [{"q": "a,b"}, {"q": 'c"}'}]})
+
+    def test_truncated_array_drops_partial_item(self):
+        value, complete, path = parse_json_text('{"score": 80, "issues": [{"q": "a"}, {"q": "b", "r')
+        self.assertFalse(complete)
+        self.assertEqual(value, {"score": 80, "issues": [{"q": "a"}]})
+        self.assertEqual(path, ["issues"])
+
+    def test_nested_truncated_path(self):
+        value, complete, path = parse_json_text(NESTED_CUT)
+        self.assertFalse(complete)
+        self.assertEqual(value, {"trauma": {"score": 90, "issues": [{"a": 1}]}})
+        self.assertEqual(path, ["trauma", "issues"])
+
+    def test_track_items(self):
+        parser = IncrementalJSONParser(track_items=True)
+        items = parser.feed('{"issues": [{"a": 1}, {"b": {"c": [1]}}')
+        self.assertEqual(items, [(["issues"], {"a": 1}), (["issues"], {"b": {"c": [1]}})])
+
+
+class _FakeCache:
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value):
+        self.data[key] = value
+
+
+class ChatJSONContinuationTest(unittest.TestCase):
+    def _run(self, responses, max_continuations=2):
+        replies = iter(responses)
+        cache = _FakeCache()
+        settings = mock.Mock(llm_json_max_continuations=max_continuations)
+        with mock.patch.object(chat, "_complete", side_effect=lambda *a, **k: next(replies)), \
+                mock.patch.object(chat, "_finish", side_effect=lambda res, messages: res), \
+                mock.patch.object(chat, "get_response_cache", return_value=cache), \
+                mock.patch.object(chat, "get_settings", return_value=settings):
+            result = chat.chat_json("prompt", system="system")
+        return result, cache
+
+    def test_nested_cut_stays_truncated_without_tail(self):
+        result, cache = self._run([NESTED_CUT, '{"items":[{"b":2}]}'], max_continuations=1)
+        self.assertEqual(result["trauma"]["issues"], [{"a": 1}, {"b": 2}])
+        self.assertTrue(result["_truncated"])
+        self.assertEqual(cache.data, {})
+
+    def test_nested_cut_requests_remaining_keys(self):
+        result, cache = self._run([
+            NESTED_CUT,
+            '{"items":[{"b":2}]}',
+            '{"trauma":{"reason":"r"},"hate_bias":{"issues":[{"c":3}]}}',
+        ])
+        self.assertNotIn("_truncated", result)
+        self.assertEqual(result["trauma"], {"score": 90, "issues": [{"a": 1}, {"b": 2}], "reason": "r"})
+        self.assertEqual(result["hate_bias"], {"issues": [{"c": 3}]})
+        self.assertEqual(len(cache.data), 1)
+
+    def test_top_level_cut_completes_after_items(self):
+        result, cache = self._run(['{"score":90,"issues":[{"a":1},{"b"', '{"items":[{"b":2}]}'])
+        self.assertEqual(result, {"score": 90, "issues": [{"a": 1}, {"b": 2}]})
+        self.assertEqual(len(cache.data), 1)
+
+    def test_truncated_tail_is_not_cached(self):
+        result, cache = self._run([NESTED_CUT, '{"items":[{"b":2}]}', '{"trauma":{"reason":"r'])
+        self.assertTrue(result["_truncated"])
+        self.assertEqual(cache.data, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+"""
+분석 결과 섹션 저장(result_storage) 왕복/필드 프로젝션 테스트
+
+    cd backend && python -m unittest discover -s tests
+"""
+import unittest
+
+from app.core.serialization import loads
+from app.services.result_storage import (
+    ALIAS_SECTION,
+    assemble_result,
+    assemble_result_json,
+    build_sections,
+    sections_for_fields,
+)
+
+
+def _result() -> dict:
+    report = {"summary": "요약 " * 100, "score": 80}
+    logic = {"score": 70, "issues": [{"quote": "문장", "reason": "이유"}]}
+    aggregate = {"decision": "ok"}
+    split = {
+        "split_sentences": ["첫 문장.", "둘째 문장."],
+        "split_map": [
+            {"sentence_index": 0, "doc_start": 0, "doc_end": 5, "text": "첫 문장."},
+            {"sentence_index": 1, "doc_start": 6, "doc_end": 12, "text": "둘째 문장."},
+        ],
+    }
+    return {
+        "split": split,
+        "report": report,
+        "final_report": report,
+        "decision": "ok",
+        "logic": logic,
+        "causality": logic,
+        "trauma": {"score": 90, "issues": []},
+        "aggregate": aggregate,
+        "aggregated": aggregate,
+        "tension_curve": {"points": list(range(100))},
+        "split_sentences": split["split_sentences"],
+        "split_map": split["split_map"],
+        "debug": {"mode": "langgraph_full"},
+    }
+
+
+def _blobs(result: dict, names: set | None = None) -> dict:
+    return {
+        row.name: (row.codec, row.data)
+        for row in build_sections(result)
+        if names is None or row.name in names
+    }
+
+
+class SectionRoundTripTest(unittest.TestCase):
+    def test_round_trip(self):
+        result = _result()
+        self.assertEqual(assemble_result(_blobs(result)), result)
+
+    def test_json_splice_matches_parse(self):
+        result = _result()
+        self.assertEqual(loads(assemble_result_json(_blobs(result))), result)
+
+    def test_aliases_are_stored_once(self):
+        rows = {row.name: row for row in build_sections(_result())}
+        self.assertIn(ALIAS_SECTION, rows)
+        aliases = loads(rows[ALIAS_SECTION].data)
+        self.assertEqual(set(aliases), {"final_report", "causality", "aggregated", "split_sentences", "split_map"})
+        # 큰 섹션은 zstd, 별칭 목록은 압축하지 않는다
+        self.assertEqual({row.codec for name, row in rows.items() if name != ALIAS_SECTION and row.raw_bytes >= 256}, {"zstd"})
+
+    def test_unknown_codec(self):
+        with self.assertRaises(ValueError):
+            assemble_result({"core": ("zlib", b"x")})
+
+
+class FieldProjectionTest(unittest.TestCase):
+    def test_projection_reads_only_needed_sections(self):
+        fields = ["decision", "final_report", "split_sentences"]
+        names = sections_for_fields(fields)
+        self.assertEqual(names, {ALIAS_SECTION, "core", "report", "split"})
+
+        result = _result()
+        projected = assemble_result(_blobs(result, names), fields)
+        self.assertEqual(projected, {field: result[field] for field in fields})
+
+    def test_missing_field_is_skipped(self):
+        projected = assemble_result(_blobs(_result(), sections_for_fields(["trauma", "nope"])), ["trauma", "nope"])
+        self.assertEqual(projected, {"trauma": {"score": 90, "issues": []}})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+"""
+문장 분리(split_map) 경계 규칙과 SplitPayload 뷰 테스트
+
+    cd backend && python -m unittest discover -s tests
+"""
+import copy
+import pickle
+import random
+import unittest
+
+from app.services.split_map import (
+    SplitPayload,
+    build_split_payload,
+    iter_sentence_spans,
+    materialize_split_payload,
+    split_with_map,
+)
+
+
+def _sentences(text: str) -> list:
+    return [sentence for sentence, _, _ in iter_sentence_spans(text)]
+
+
+class BoundaryRuleTest(unittest.TestCase):
+    def test_ellipsis(self):
+        self.assertEqual(_sentences("그게...아니야. 정말… 몰라."), ["그게...아니야.", "정말…", "몰라."])
+        self.assertEqual(_sentences("기다려…” 그가 말했다."), ["기다려…”", "그가 말했다."])
+
+    def test_closing_corner_bracket(self):
+        self.assertEqual(_sentences("「가자.」 그는 나섰다."), ["「가자.」", "그는 나섰다."])
+        self.assertEqual(_sentences("『끝이야!』그리고 울었다."), ["『끝이야!』", "그리고 울었다."])
+
+    def test_da_period_before_digit(self):
+        # 소수점은 잇지만 "~다." 뒤는 숫자가 와도 문장 끝
+        self.assertEqual(_sentences("값은 3.14였다.2번째 줄이다."), ["값은 3.14였다.", "2번째 줄이다."])
+
+    def test_quotative_after_closing_quote(self):
+        for text in ("“왜?”라고 물었다.", '"왜?"라고 물었다.', "“가자.”하며 나섰다.", "「싫어!」고 했다.", '"왜?!"라며 울었다.'):
+            with self.subTest(text=text):
+                self.assertEqual(_sentences(text), [text])
+        self.assertEqual(_sentences("“왜?”라고 물었다. 대답은 없었다."), ["“왜?”라고 물었다.", "대답은 없었다."])
+
+    def test_closing_quote_followed_by_other_word(self):
+        self.assertEqual(_sentences('"고양이."고양이가 왔다.'), ['"고양이."', "고양이가 왔다."])
+        self.assertEqual(_sentences('말했다."좋아."그리고 떠났다.'), ["말했다.", '"좋아."', "그리고 떠났다."])
+
+    def test_offsets_point_into_text(self):
+        text = "첫 문장이다.  \n“왜?”라고 물었다!  끝."
+        sentences, split_map = split_with_map(text)
+        self.assertEqual([text[m["doc_start"]:m["doc_end"]] for m in split_map], sentences)
+
+    def test_chunked_stream_matches_whole_text(self):
+        rng = random.Random(7)
+        text = "“왜?”라고 물었다. 그게...아니야. 말했다.\"좋아.\"그리고 3.14다.5개. 「가자.」하고\n나섰다! 끝…” " * 5
+        whole = list(iter_sentence_spans(text))
+        for _ in range(200):
+            cuts = sorted(rng.sample(range(1, len(text)), 8))
+            chunks = [text[a:b] for a, b in zip([0] + cuts, cuts + [len(text)])]
+            self.assertEqual(list(iter_sentence_spans(iter(chunks))), whole)
+
+
+class SplitPayloadTest(unittest.TestCase):
+    TEXT = "첫 문장이다. “왜?”라고 물었다!\n\n마지막 줄…"
+
+    def test_views_match_split_with_map(self):
+        sentences, split_map = split_with_map(self.TEXT)
+        payload = build_split_payload(self.TEXT)
+        self.assertEqual(list(payload["split_sentences"]), sentences)
+        self.assertEqual(list(payload["split_map"]), split_map)
+        self.assertEqual(payload.to_dict(), {"split_sentences": sentences, "split_map": split_map})
+
+    def test_sequence_access(self):
+        payload = build_split_payload(self.TEXT)
+        sentences = payload.get("split_sentences")
+        self.assertEqual(len(sentences), 3)
+        self.assertEqual(sentences[-1], "마지막 줄…")
+        self.assertEqual(sentences[1:], ["“왜?”라고 물었다!", "마지막 줄…"])
+        self.assertEqual(payload["split_map"][-1]["sentence_index"], 2)
+        with self.assertRaises(IndexError):
+            payload["split_map"][3]
+
+    def test_mapping_keys(self):
+        self.assertEqual(list(build_split_payload(self.TEXT)), ["split_sentences", "split_map"])
+        payload = build_split_payload(self.TEXT, embedding_dim=8)
+        self.assertEqual(payload["embedding_dim"], 8)
+        self.assertIsNone(build_split_payload(self.TEXT).get("embedding_dim"))
+
+    def test_serialization_round_trip(self):
+        payload = build_split_payload(self.TEXT, embedding_dim=8)
+        for restored in (pickle.loads(pickle.dumps(payload)), copy.deepcopy(payload), SplitPayload(**payload._asdict())):
+            self.assertEqual(restored.to_dict(), payload.to_dict())
+
+    def test_text_without_sentence_boundary(self):
+        payload = build_split_payload("  ...  ")
+        self.assertEqual(len(payload["split_sentences"]), 1)
+        self.assertEqual(list(build_split_payload("   ")["split_sentences"]), [])
+
+    def test_materialize(self):
+        payload = build_split_payload(self.TEXT)
+        self.assertEqual(materialize_split_payload(payload), payload.to_dict())
+        self.assertEqual(materialize_split_payload(self.TEXT), payload.to_dict())
+        self.assertEqual(materialize_split_payload(["a"]), {"split_sentences": ["a"], "split_map": []})
+        self.assertEqual(materialize_split_payload(None), {})
+
+
+if __name__ == "__main__":
+    unittest.main()